@@ -0,0 +1,121 @@
+"""Microbenchmark for roll and character embed construction.
+
+Compares building embeds with the rendering caches cleared before each
+embed (roughly the old, build-everything-from-scratch cost) against warm
+caches, in both emoji and text modes. Uses an in-memory database, since
+documents can't be created without one."""
+
+import asyncio
+import timeit
+from argparse import ArgumentParser
+from typing import cast
+from unittest.mock import Mock
+
+from beanie import init_beanie
+from mongomock_motor import AsyncMongoMockClient
+
+from botch.bot import AppCtx, BotchBot
+from botch.botchcord import roll as roll_cmd
+from botch.botchcord.character.display import build_embed, get_track_string
+from botch.core.characters import Damage, GameLine, Grounding
+from botch.core.characters.wod import Vampire, gen_virtues
+from botch.core.rolls import Roll
+from botch.db import DOCUMENT_MODELS
+
+EMOJI = [
+    *[f"{prefix}{n}" for prefix in ("f", "s", "ss") for n in range(1, 11)],
+    *["b1", "no_dmg", "bash", "leth", "agg"],
+]
+
+
+def make_bot() -> BotchBot:
+    """A bot whose emoji guild has every dice and track emoji."""
+    bot = BotchBot()
+    emojis = []
+    for name in EMOJI:
+        emoji = Mock()
+        emoji.name = name
+        emoji.__str__ = Mock(return_value=f"<:{name}:0>")
+        emojis.append(emoji)
+    bot.get_guild = Mock(return_value=Mock(emojis=emojis))
+    bot.get_user = Mock(return_value=Mock(display_name="Player", guild_avatar=None))
+    return bot
+
+
+def make_rolls() -> list[Roll]:
+    """A spread of WoD and CofD rolls, up to 30 dice."""
+    rolls = []
+    for num_dice in (3, 7, 12, 20, 30):
+        for line, target in ((GameLine.WOD, 6), (GameLine.COFD, 10)):
+            roll = Roll(line=line, guild=0, user=0, num_dice=num_dice, target=target).roll()
+            rolls.append(roll)
+    return rolls
+
+
+def clear_caches(bot: BotchBot):
+    roll_cmd.emoji_name.cache_clear()
+    roll_cmd.textify_die.cache_clear()
+    get_track_string.cache_clear()
+    bot.render_cache.clear()
+
+
+async def main():
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--number", type=int, default=500, help="Iterations per case")
+    args = parser.parse_args()
+
+    client = AsyncMongoMockClient()
+    await init_beanie(database=client.get_database("bench"), document_models=DOCUMENT_MODELS)
+
+    bot = make_bot()
+    ctx = cast(AppCtx, Mock(bot=bot, author=Mock(display_name="Player", guild_avatar=None)))
+    rolls = make_rolls()
+
+    character = Vampire(
+        name="Bench",
+        guild=0,
+        user=0,
+        health=Damage.NONE * 4 + Damage.BASHING * 2 + Damage.LETHAL,
+        willpower=Damage.NONE * 3 + Damage.BASHING * 3,
+        grounding=Grounding(path="Humanity", rating=7),
+        virtues=gen_virtues(dict(Conscience=3, SelfControl=3, Courage=3)),
+        generation=13,
+        max_bp=10,
+        blood_pool=7,
+    )
+
+    def roll_embeds(emojis: bool, cold: bool):
+        def run():
+            for roll in rolls:
+                if cold:
+                    clear_caches(bot)
+                roll_cmd.build_embed(ctx, roll, None, None, emojis)
+
+        return run
+
+    def sheet_embeds(emojis: bool, cold: bool):
+        def run():
+            if cold:
+                clear_caches(bot)
+            build_embed(bot, character, emojis)
+
+        return run
+
+    cases = [
+        ("rolls, emoji, cold", roll_embeds(True, True), len(rolls)),
+        ("rolls, emoji, warm", roll_embeds(True, False), len(rolls)),
+        ("rolls, text, cold", roll_embeds(False, True), len(rolls)),
+        ("rolls, text, warm", roll_embeds(False, False), len(rolls)),
+        ("sheet, emoji, cold", sheet_embeds(True, True), 1),
+        ("sheet, emoji, warm", sheet_embeds(True, False), 1),
+        ("sheet, text, cold", sheet_embeds(False, True), 1),
+        ("sheet, text, warm", sheet_embeds(False, False), 1),
+    ]
+    for label, func, per_run in cases:
+        seconds = min(timeit.repeat(func, number=args.number, repeat=3))
+        rate = args.number * per_run / seconds
+        print(f"{label:<24} {rate:>12,.0f} embeds/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
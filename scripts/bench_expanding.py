@@ -0,0 +1,94 @@
+"""Stress benchmark for Trait.expanding() on a trait with 50 specialties.
+
+Compares the original expansion (a full product over the specialty groups,
+deduplicated afterward) against the pruned expansion, both cold (memo
+cleared before each call) and warm (repeated identifiers served from the
+memo)."""
+
+import timeit
+from argparse import ArgumentParser
+from itertools import product
+
+from botch.core.characters import Trait
+
+SPECIALTIES = 50
+
+# Multi-dot queries, from narrow to as broad as possible
+IDENTIFIERS = [
+    "brawl.kindred",
+    "brawl.k.t.g",
+    "brawl.spec0.spec1.spec2",
+    "brawl.s.s",
+    "brawl.s.s.s",
+]
+
+
+def make_trait() -> Trait:
+    """A trait whose specialties all share a prefix, plus a few that don't."""
+    trait = Trait(
+        name="Brawl",
+        rating=5,
+        category=Trait.Category.ABILITY,
+        subcategory=Trait.Subcategory.TALENTS,
+    )
+    named = ["Kindred", "Kine", "Throws", "Grappling", "Knives", "Tackles", "Garou"]
+    trait.add_subtraits(named + [f"Spec{i:02}" for i in range(SPECIALTIES - len(named))])
+    return trait
+
+
+def expand_product(trait: Trait, identifier: str) -> list[str]:
+    """Expand the way Trait used to: a full product, filtered afterward."""
+    tokens = identifier.lower().split(".")
+    spec_groups = trait._get_matching_spec_groups(tokens[1:], trait._starting_comp)
+
+    seen = set()
+    matches = []
+    for group in product(*spec_groups):
+        if len(set(group)) < len(group):
+            continue
+        if (frozen := frozenset(group)) not in seen:
+            seen.add(frozen)
+            matches.append(".".join([trait.name] + sorted(group)))
+    return matches
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--number", type=int, default=5, help="Iterations per case")
+    args = parser.parse_args()
+
+    trait = make_trait()
+    for identifier in IDENTIFIERS:
+        expected = expand_product(trait, identifier)
+        assert trait.expanding(identifier, False) == expected, identifier
+        print(f"{identifier:<26} {len(expected):>8,} expansion(s)")
+    print()
+
+    def run_product():
+        for identifier in IDENTIFIERS:
+            expand_product(trait, identifier)
+
+    def run_cold():
+        for identifier in IDENTIFIERS:
+            trait._expansions.clear()
+            trait.expanding(identifier, False)
+
+    def run_warm():
+        for identifier in IDENTIFIERS:
+            trait.expanding(identifier, False)
+
+    cases = [
+        ("before: product, then dedupe", run_product),
+        ("after: pruned, cold memo", run_cold),
+        ("after: pruned, warm memo", run_warm),
+    ]
+    baseline = None
+    for label, func in cases:
+        seconds = min(timeit.repeat(func, number=args.number, repeat=3))
+        rate = args.number * len(IDENTIFIERS) / seconds
+        baseline = baseline or rate
+        print(f"{label:<40} {rate:>12,.1f} expansions/s  ({rate / baseline:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""Throughput benchmark and fairness check for the roll engine.
+
+Measures rolls per second for WoD and CofD pools of 1 to 40 dice, then
+checks d10 faces, roll results, and CofD explosion chains against their
+expected distributions with chi-square tests. Writes the results as JSON
+and exits with status 1 if any fairness check fails, so it can gate a
+deploy. Uses an in-memory database, since documents can't be created
+without one."""
+
+import asyncio
+import json
+import platform
+import sys
+import time
+import timeit
+from argparse import ArgumentParser
+from collections import Counter
+from datetime import UTC, datetime
+
+import numpy as np
+from beanie import init_beanie
+from mongomock_motor import AsyncMongoMockClient
+
+from botch.config import VERSION
+from botch.core.characters import GameLine
+from botch.core.rolls import roll as roll_module
+from botch.core.rolls.odds import chi_square, chi_square_critical, odds
+from botch.core.rolls.roll import Roll, d10
+from botch.db import DOCUMENT_MODELS
+
+POOL_SIZES = range(1, 41)
+
+# (line, target, Roll options) for each fairness case
+CASES = [
+    (GameLine.WOD, 6, {}),
+    (GameLine.WOD, 8, {"specialties": ["Spec"]}),
+    (GameLine.WOD, 4, {"wp": True, "autos": 1}),
+    (GameLine.WOD, 10, {}),
+    (GameLine.COFD, 10, {}),
+    (GameLine.COFD, 9, {}),
+    (GameLine.COFD, 8, {}),
+    (GameLine.COFD, 10, {"rote": True}),
+    (GameLine.COFD, 8, {"rote": True, "wp": True}),
+    (GameLine.COFD, 10, {"specialties": ["Spec"], "autos": 2}),
+    (GameLine.COFD, 10, {"blessed": True}),
+    (GameLine.COFD, 10, {"blighted": True}),
+]
+
+
+def throughput(line: GameLine, dice: int, number: int) -> float:
+    """Rolls per second, including creating the Roll and counting successes."""
+    target = 6 if line == GameLine.WOD else 10
+
+    def run():
+        Roll(line=line, guild=0, user=0, num_dice=dice, target=target).roll().successes
+
+    return number / min(timeit.repeat(run, number=number, repeat=3))
+
+
+def check(name: str, observed: Counter[int], expected: dict[int, float], alpha: float) -> dict:
+    """A chi-square goodness-of-fit result."""
+    statistic, df = chi_square(observed, expected)
+    critical = chi_square_critical(df, alpha)
+    return {
+        "case": name,
+        "samples": sum(observed.values()),
+        "statistic": round(statistic, 3),
+        "df": df,
+        "critical": round(critical, 3),
+        "passed": statistic < critical,
+    }
+
+
+def fairness(samples: int, alpha: float) -> list[dict]:
+    """Run every fairness check."""
+    results = [
+        check("d10 faces", Counter(d10(samples * 10)), {n: 0.1 for n in range(1, 11)}, alpha)
+    ]
+
+    for line, target, options in CASES:
+        observed = Counter(
+            Roll(line=line, guild=0, user=0, num_dice=5, target=target, **options).roll().successes
+            for _ in range(samples)
+        )
+        expected = odds(
+            line,
+            5,
+            target,
+            specialty=bool(options.get("specialties")),
+            wp=options.get("wp", False),
+            autos=options.get("autos", 0),
+            rote=options.get("rote", False),
+            blessed=options.get("blessed", False),
+            blighted=options.get("blighted", False),
+        )
+        flags = ",".join(f"{k}={v}" for k, v in options.items())
+        name = f"{line.value} 5 dice, target {target}" + (f" ({flags})" if flags else "")
+        results.append(check(name, observed, expected.distribution, alpha))
+
+    for again in (10, 9, 8):
+        explodes = (11 - again) / 10
+        observed = Counter(
+            len(Roll(line=GameLine.COFD, guild=0, user=0, num_dice=1, target=again).roll().dice)
+            for _ in range(samples)
+        )
+        expected = {n: explodes ** (n - 1) * (1 - explodes) for n in range(1, 40)}
+        results.append(check(f"cofd {again}-again chain length", observed, expected, alpha))
+
+    return results
+
+
+async def main():
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--number", type=int, default=1000, help="Rolls per timing")
+    parser.add_argument("-s", "--samples", type=int, default=10_000, help="Rolls per check")
+    parser.add_argument("-a", "--alpha", type=float, default=0.001, help="Significance level")
+    parser.add_argument("--seed", type=int, help="Seed the roll RNG for reproducible checks")
+    parser.add_argument("-o", "--output", help="Write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    client = AsyncMongoMockClient()
+    await init_beanie(database=client.get_database("bench"), document_models=DOCUMENT_MODELS)
+
+    if args.seed is not None:
+        roll_module._rng = np.random.default_rng(args.seed)
+
+    started = time.perf_counter()
+    speed = [
+        {
+            "line": line.value,
+            "dice": dice,
+            "rolls_per_second": round(throughput(line, dice, args.number)),
+        }
+        for line in GameLine
+        for dice in POOL_SIZES
+    ]
+    checks = fairness(args.samples, args.alpha)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(UTC).isoformat(),
+            "version": VERSION,
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "seed": args.seed,
+            "alpha": args.alpha,
+            "seconds": round(time.perf_counter() - started, 2),
+        },
+        "throughput": speed,
+        "fairness": checks,
+        "passed": all(c["passed"] for c in checks),
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    if not report["passed"]:
+        failed = ", ".join(c["case"] for c in checks if not c["passed"])
+        print(f"Fairness checks failed: {failed}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
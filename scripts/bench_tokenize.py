@@ -0,0 +1,73 @@
+"""Microbenchmark for roll syntax tokenization.
+
+Compares the original approach (building the pyparsing grammar on every call)
+against the module-level grammar, both cold (cache cleared before each parse)
+and warm (repeated pools served from the memo)."""
+
+import timeit
+from argparse import ArgumentParser
+
+from pyparsing import Combine, Opt, Word, ZeroOrMore, nums, one_of
+
+from botch.core.rolls.parse import RollParser, tokenize
+from botch.core.utils.parsing import TRAIT
+
+POOLS = [
+    "Dexterity + Brawl",
+    "Strength + Brawl.Kindred + 2",
+    "Wits + Investigation - 1",
+    "Manipulation + Subterfuge + WP",
+    "Blood Potency + 3",
+    "Intelligence + Occult.Rituals.Thaumaturgy",
+    "7",
+]
+
+
+def rebuild_grammar(syntax: str) -> list[str | int]:
+    """Tokenize the way RollParser used to: a new grammar on every call."""
+    trait = Combine(Opt(TRAIT) + ZeroOrMore("." + Opt(TRAIT)))
+    operand = Word(nums) | trait
+    expr = operand + ZeroOrMore(one_of("+ -") + operand)
+
+    return [
+        int(token) if token.isdigit() else token
+        for token in expr.parse_string(syntax, parse_all=True)
+    ]
+
+
+def run_cold():
+    for pool in POOLS:
+        tokenize.cache_clear()
+        RollParser(pool, None).tokenize()
+
+
+def run_warm():
+    for pool in POOLS:
+        RollParser(pool, None).tokenize()
+
+
+def run_rebuild():
+    for pool in POOLS:
+        rebuild_grammar(pool)
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--number", type=int, default=2000, help="Iterations per case")
+    args = parser.parse_args()
+
+    cases = [
+        ("before: grammar rebuilt per call", run_rebuild),
+        ("after: compiled grammar, cold cache", run_cold),
+        ("after: compiled grammar, warm cache", run_warm),
+    ]
+    baseline = None
+    for label, func in cases:
+        seconds = min(timeit.repeat(func, number=args.number, repeat=3))
+        rate = args.number * len(POOLS) / seconds
+        baseline = baseline or rate
+        print(f"{label:<40} {rate:>12,.0f} pools/s  ({rate / baseline:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
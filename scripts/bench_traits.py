@@ -0,0 +1,140 @@
+"""Microbenchmark for trait access on a 60-trait character.
+
+Compares handing out deep copies of traits (the original behavior) against
+read-only TraitViews for lookups and mutators, then times the display and
+roll paths that read the same character. Uses an in-memory database, since
+documents can't be created without one."""
+
+import asyncio
+import timeit
+from argparse import ArgumentParser
+from copy import deepcopy
+from typing import cast
+from unittest.mock import Mock
+
+from beanie import init_beanie
+from mongomock_motor import AsyncMongoMockClient
+
+from botch.bot import BotchBot
+from botch.botchcord.character.traits.display import build_embed
+from botch.core.characters import Damage, Grounding, Trait
+from botch.core.characters.wod import Vampire, gen_virtues
+from botch.core.rolls.parse import RollParser
+from botch.db import DOCUMENT_MODELS
+
+TRAITS = 60
+SEARCHES = ["st", "brawl", "dex", "lorea", "w"]
+POOLS = ["Dexterity + Brawl", "Strength + Brawl.Kindred + 2", "Wits + LoreBc + WP"]
+
+
+def make_character() -> Vampire:
+    """A vampire with 60 traits, a few of them specialized."""
+    character = Vampire(
+        name="Bench",
+        guild=0,
+        user=0,
+        health=Damage.NONE * 7,
+        willpower=Damage.NONE * 6,
+        grounding=Grounding(path="Humanity", rating=7),
+        virtues=gen_virtues(dict(Conscience=3, SelfControl=3, Courage=3)),
+        generation=13,
+        max_bp=10,
+        blood_pool=7,
+    )
+    Cat, Sub = Trait.Category, Trait.Subcategory
+    named = [
+        ("Strength", Cat.ATTRIBUTE, Sub.PHYSICAL),
+        ("Dexterity", Cat.ATTRIBUTE, Sub.PHYSICAL),
+        ("Stamina", Cat.ATTRIBUTE, Sub.PHYSICAL),
+        ("Wits", Cat.ATTRIBUTE, Sub.MENTAL),
+        ("Brawl", Cat.ABILITY, Sub.TALENTS),
+        ("Streetwise", Cat.ABILITY, Sub.TALENTS),
+    ]
+    for name, category, subcategory in named:
+        character.add_trait(name, 3, category, subcategory)
+    for i in range(TRAITS - len(named)):
+        # Roll syntax doesn't allow digits in trait names
+        character.add_trait(f"Lore{chr(65 + i // 8)}{chr(97 + i % 8)}", i % 5 + 1)
+
+    character.add_subtraits("Brawl", ["Kindred", "Kine", "Throws"])
+    character.add_subtraits("Streetwise", ["Drugs", "Gangs"])
+    return character
+
+
+def make_bot() -> BotchBot:
+    bot = BotchBot()
+    bot.get_user = Mock(return_value=Mock(display_name="Player", guild_avatar=None))
+    return bot
+
+
+def find_copies(character: Vampire, search: str) -> list[Trait]:
+    """Find traits the way Character used to: deep copies of each match."""
+    return [deepcopy(trait) for trait in character.traits if trait.matches(search)]
+
+
+def all_copies(character: Vampire) -> list[Trait]:
+    """Gather rollable traits the way Character used to."""
+    innates = [character._innate_trait(n, r) for n, r in character._innate_ratings()]
+    return deepcopy(character.traits) + innates + deepcopy(character._extra_traits())
+
+
+async def main():
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--number", type=int, default=2000, help="Iterations per case")
+    args = parser.parse_args()
+
+    client = AsyncMongoMockClient()
+    await init_beanie(database=client.get_database("bench"), document_models=DOCUMENT_MODELS)
+
+    character = make_character()
+    bot = make_bot()
+
+    def lookups(copies: bool):
+        def run():
+            for search in SEARCHES:
+                if copies:
+                    find_copies(character, search)
+                else:
+                    character.find_traits(search)
+
+        return run
+
+    def all_traits(copies: bool):
+        return lambda: all_copies(character) if copies else character._all_traits()
+
+    def mutators(copies: bool):
+        def run():
+            updated = character.update_trait("Brawl", 3)
+            added, _ = character.add_subtraits("Streetwise", "Gangs")
+            if copies:
+                # The old return values: a deep copy of each changed trait
+                deepcopy(updated._trait)
+                deepcopy(added._trait)
+
+        return run
+
+    def display():
+        build_embed(cast(BotchBot, bot), character)
+
+    def rolls():
+        for pool in POOLS:
+            RollParser(pool, character).parse()
+
+    cases = [
+        ("find_traits, copies", lookups(True), len(SEARCHES)),
+        ("find_traits, views", lookups(False), len(SEARCHES)),
+        ("all traits, copies", all_traits(True), 1),
+        ("all traits, views", all_traits(False), 1),
+        ("mutators, copies", mutators(True), 2),
+        ("mutators, views", mutators(False), 2),
+        ("display embed", display, 1),
+        ("roll parse", rolls, len(POOLS)),
+    ]
+    for label, func, per_run in cases:
+        seconds = min(timeit.repeat(func, number=args.number, repeat=3))
+        rate = args.number * per_run / seconds
+        print(f"{label:<24} {rate:>12,.0f} calls/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -15,17 +15,44 @@ import aiohttp
 import async_timeout
 
 from botch import core, errors
-from botch.config import FC_BUCKET
+from botch.config import API_POOL_SIZE, BOTCH_API_URL, FC_BUCKET
 
 dumps = partial(json.dumps, default=str)
 
 # An argument can be made that these should simply live with their appropriate
 # command counterparts, but I see a value in keeping them together.
 
-BASE_API = "https://api.botch.lol/"
+BASE_API = BOTCH_API_URL.rstrip("/") + "/"
 
 logger = logging.getLogger("API")
 
+# A single, long-lived session lets requests reuse pooled keep-alive
+# connections instead of paying a TCP and TLS handshake every time.
+_session: aiohttp.ClientSession | None = None
+
+
+async def open_session() -> aiohttp.ClientSession:
+    """Open the shared API session, if it isn't already open."""
+    global _session
+    if _session is None or _session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=API_POOL_SIZE,
+            ttl_dns_cache=300,
+            keepalive_timeout=60,
+        )
+        _session = aiohttp.ClientSession(connector=connector)
+        logger.info("Opened API session (pool size %s)", API_POOL_SIZE)
+    return _session
+
+
+async def close_session():
+    """Close the shared API session."""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+        logger.info("Closed API session")
+    _session = None
+
 
 def measure(func):
     """A decorator that measures API response time."""
@@ -118,14 +145,14 @@ async def _post(*, path: str, data: dict[str, Any] | str) -> str:
     logger.debug("POST to %s with %s", path, str(data))
     url = BASE_API + path.lstrip("/")
 
+    session = await open_session()
     async with async_timeout.timeout(60):
-        async with aiohttp.ClientSession(headers=headers()) as session:
-            async with session.post(url, data=data) as response:
-                json = await response.json()
+        async with session.post(url, data=data, headers=headers()) as response:
+            json = await response.json()
 
-                if not response.ok:
-                    raise errors.ApiError(str(json))
-                return json
+            if not response.ok:
+                raise errors.ApiError(str(json))
+            return json
 
 
 @measure
@@ -134,11 +161,11 @@ async def _delete(*, path: str) -> str:
     logger.debug("DELETE to %s", path)
     url = BASE_API + path.lstrip("/")
 
+    session = await open_session()
     async with async_timeout.timeout(60):
-        async with aiohttp.ClientSession(headers=headers()) as session:
-            async with session.delete(url) as response:
-                json = await response.json()
+        async with session.delete(url, headers=headers()) as response:
+            json = await response.json()
 
-                if not response.ok:
-                    raise errors.ApiError(str(json))
-                return json
+            if not response.ok:
+                raise errors.ApiError(str(json))
+            return json
@@ -3,14 +3,18 @@
 import logging
 import os
 from pathlib import Path
-from typing import cast, overload
+from typing import Hashable, Sequence, cast, overload
 
 import discord
+from cachetools import LRUCache
 
-from botch import config, db, errors, tasks
+from botch import api, config, db, errors, tasks
 from botch.config import DEBUG_GUILDS, EMOJI_GUILD, SUPPORTER_GUILD, SUPPORTER_ROLE
+from botch.core.rolls import roll_sink
+from botch.core.writer import writer
 from botch.errors import BotchError, NoCharacterSelected, NotPremium
-from botch.models import GuildCache
+from botch.interface.models import command_sink
+from botch.models import GuildCache, SettingsCache
 from botch.models.user import cache as user_store
 
 __all__ = ("AppCtx", "BotchBot")
@@ -54,6 +58,12 @@ class BotchBot(discord.Bot):
         )
         self.guild_cache = GuildCache()
         self.user_store = user_store  # Singleton instance
+        self.settings_cache = SettingsCache()
+        self._emojis: dict[str, str] | None = None  # Built by _build_emoji_table()
+
+        # Emoji renderings (e.g. of damage tracks), keyed by their input. Must be
+        # cleared whenever the emoji table changes.
+        self.render_cache: LRUCache[Hashable, str] = LRUCache(maxsize=4096)
 
         self.accept_commands = False
         self.welcomed = False
@@ -62,6 +72,7 @@ class BotchBot(discord.Bot):
 
     async def on_connect(self):
         logger.info("Connected")
+        await api.open_session()
         await db.init()
         await self.sync_commands()
         self.accept_commands = True
@@ -72,10 +83,26 @@ class BotchBot(discord.Bot):
         config.set_bot_id(self.user.id)
         logger.info("Ready!")
 
+        await self.guild_cache.warm(self.guilds)
+        self._build_emoji_table()
+
         tasks.premium.purge.start()
         logger.info("Tasks scheduled")
         await self._set_presence()
 
+    async def close(self):
+        """Write any pending character changes, rolls, and command records
+        before shutting down."""
+        logger.info("Flushing %s pending character save(s)", len(writer))
+        steps = [writer.close, roll_sink.close, command_sink.close, api.close_session]
+        for step in steps:
+            try:
+                await step()
+            except Exception:
+                # Don't let one failure keep the rest from shutting down
+                logger.exception("Error during shutdown")
+        await super().close()
+
     def load_cogs(self, directories: list[str]) -> None:
         """Load cogs from specified directories relative to this script."""
         logger = logging.getLogger("COGS")
@@ -103,16 +130,39 @@ class BotchBot(discord.Bot):
 
     def find_emoji(self, emoji_name: str, count=1) -> str | list[str]:
         """Get an emoji from the emoji guild."""
-        if guild := self.get_guild(EMOJI_GUILD):
-            try:
-                emoji = next(e for e in guild.emojis if e.name == emoji_name)
-                emoji_str = str(emoji) + "\u200b"  # Add zero-width space to fix Discord embed bug
-                if count > 1:
-                    return [emoji_str] * count
-                return emoji_str
-            except StopIteration:
-                pass
-        raise errors.EmojiNotFound
+        emojis = self._emojis if self._emojis is not None else self._build_emoji_table()
+        if emojis is None or (emoji_str := emojis.get(emoji_name)) is None:
+            raise errors.EmojiNotFound
+
+        if count > 1:
+            return [emoji_str] * count
+        return emoji_str
+
+    def _build_emoji_table(self) -> dict[str, str] | None:
+        """Map the emoji guild's emoji names to their rendered strings. Returns
+        None (and builds nothing) if the emoji guild isn't available yet."""
+        if (guild := self.get_guild(EMOJI_GUILD)) is None:
+            return None
+
+        emojis: dict[str, str] = {}
+        for emoji in guild.emojis:
+            # Add zero-width space to fix Discord embed bug
+            emojis.setdefault(emoji.name, str(emoji) + "\u200b")
+
+        self._emojis = emojis
+        self.render_cache.clear()
+        logger.info("Loaded %s emoji", len(emojis))
+        return emojis
+
+    async def on_guild_emojis_update(
+        self,
+        guild: discord.Guild,
+        before: Sequence[discord.Emoji],
+        after: Sequence[discord.Emoji],
+    ):
+        """Rebuild the emoji table if the emoji guild changed."""
+        if guild.id == EMOJI_GUILD:
+            self._build_emoji_table()
 
     async def get_application_context(self, interaction: discord.Interaction, cls=AppCtx) -> AppCtx:
         """Make all contexts AppCtx instances."""
@@ -172,10 +222,29 @@ class BotchBot(discord.Bot):
 
     async def on_guild_update(self, before: discord.Guild, after: discord.Guild):
         """Rename the guild."""
+        self.settings_cache.invalidate(guild=after.id)
         if before.name != after.name:
             logger.info("Guild: %s renamed to %s (ID: %s)", before.name, after.name, after.id)
             await self.guild_cache.rename(after, after.name)
 
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role):
+        """Emoji availability depends on @everyone's permissions."""
+        if after.is_default():
+            self.settings_cache.invalidate(guild=after.guild.id)
+
+    async def on_guild_channel_update(
+        self,
+        before: discord.abc.GuildChannel,
+        after: discord.abc.GuildChannel,
+    ):
+        """Channel overwrites can also change emoji availability. Channels
+        synced to a category inherit its overwrites, so a category change
+        invalidates the whole guild."""
+        if isinstance(after, discord.CategoryChannel):
+            self.settings_cache.invalidate(guild=after.guild.id)
+        else:
+            self.settings_cache.invalidate(guild=after.guild.id, channel=after.id)
+
     async def on_member_update(self, before: discord.Member, after: discord.Member):
         """Check for supporter status changes."""
         if before.guild.id != SUPPORTER_GUILD:
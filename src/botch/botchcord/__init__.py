@@ -2,7 +2,7 @@
 
 import discord
 
-from botch.botchcord import changelog, character, haven, macro, roll, settings
+from botch.botchcord import changelog, character, haven, macro, odds, roll, settings
 from botch.botchcord.mroll import mroll
 
 __all__ = (
@@ -11,6 +11,7 @@ __all__ = (
     "haven",
     "macro",
     "mroll",
+    "odds",
     "roll",
     "settings",
     "get_avatar",
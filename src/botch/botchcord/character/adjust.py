@@ -13,6 +13,7 @@ from botch.botchcord import settings
 from botch.botchcord.character.display import DisplayField, build_embed
 from botch.botchcord.haven import haven
 from botch.core.characters import Character, Damage, GameLine, Tracker, cofd, wod
+from botch.core.writer import writer
 from botch.utils import normalize_text
 
 __all__ = (
@@ -109,7 +110,7 @@ class Toggler(View):
         """Update the character display and the view."""
         await self.update_display()
         await interaction.response.edit_message(view=self)
-        await self.character.save()
+        writer.schedule(self.character)
 
     async def display(self):
         """Display the character stats adjuster."""
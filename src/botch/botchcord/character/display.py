@@ -2,6 +2,7 @@
 
 import logging
 from enum import StrEnum
+from functools import lru_cache
 
 import discord
 
@@ -200,9 +201,14 @@ def get_field_value(
 
 def emojify_track(bot: bot.BotchBot, track: str) -> str:
     """Convert a track to emoji."""
-    return " ".join(map(lambda e: bot.find_emoji(Damage.emoji_name(e)), reversed(track)))
+    key = ("track", track)
+    if (rendered := bot.render_cache.get(key)) is None:
+        rendered = " ".join(map(lambda e: bot.find_emoji(Damage.emoji_name(e)), reversed(track)))
+        bot.render_cache[key] = rendered
+    return rendered
 
 
+@lru_cache(maxsize=1024)
 def get_track_string(track: str) -> str:
     """Get a track's description."""
     counts = []
@@ -17,8 +17,7 @@ async def rename(ctx: AppCtx, character: Character, new_name: str):
     await validate_name(character.guild, character.user, character.line, new_name)
 
     old_name = character.name
-    character.name = new_name
-    await character.save()
+    await cache.rename(character, new_name)
 
     await ctx.respond(f"Renamed {b(old_name)} to {b(new_name)}.", ephemeral=True)
 
@@ -6,8 +6,9 @@ from botch import bot, errors
 from botch.botchcord.haven import haven
 from botch.botchcord.utils import CEmbed
 from botch.botchcord.utils.text import m
-from botch.core.characters import Character, Trait
+from botch.core.characters import Character, Trait, TraitView
 from botch.core.utils.parsing import TRAIT
+from botch.core.writer import writer
 
 
 @haven()
@@ -17,14 +18,14 @@ async def assign(ctx: bot.AppCtx, character: Character, user_input: str):
     traits = assign_traits(character, parsed, subcategory=Trait.Subcategory.CUSTOM)
     embed = build_embed(ctx.bot, character, traits)
 
-    await character.save()
+    writer.schedule(character)
     await ctx.respond(embed=embed, ephemeral=True)
 
 
 def build_embed(
     bot: bot.BotchBot,
     char: Character,
-    assignments: list[Trait],
+    assignments: list[TraitView],
 ) -> CEmbed:
     """Build the embed describing the trait assignments."""
     embed = CEmbed(
@@ -36,7 +37,7 @@ def build_embed(
     return embed
 
 
-def describe_assignments(traits: list[Trait]) -> str:
+def describe_assignments(traits: list[Trait] | list[TraitView]) -> str:
     """Create the embed description for the trait assignments."""
     return "\n".join(map(lambda t: f"{t.name}: {m(t.rating)}", traits))
 
@@ -46,7 +47,7 @@ def assign_traits(
     assignments: dict[str, int],
     category=Trait.Category.CUSTOM,
     subcategory=Trait.Subcategory.BLANK,
-) -> list[Trait]:
+) -> list[TraitView]:
     """Assigns the new/updated traits and returns the traits in their canonical
     form; e.g. predefined traits become capitalized: brawl -> Brawl."""
     assigned = []
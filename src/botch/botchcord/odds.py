@@ -0,0 +1,118 @@
+"""Roll odds command implementation."""
+
+import asyncio
+
+import discord
+
+from botch import bot, botchcord
+from botch.config import GAME_LINE
+from botch.core.characters import GameLine
+from botch.core.rolls.odds import Odds, odds
+
+MAX_DICE = 50
+AT_LEAST = 6  # Rows in the "at least N successes" table
+
+
+async def show_odds(
+    ctx: bot.AppCtx,
+    dice: int,
+    target: int,
+    specialty: bool,
+    wp: bool,
+    autos: int,
+    *,
+    rote=False,
+    blessed=False,
+    blighted=False,
+):
+    """Calculate and display the odds of a roll."""
+    line = GameLine(GAME_LINE)
+    # Simulated odds take a moment; don't stall the event loop
+    result = await asyncio.to_thread(
+        odds,
+        line,
+        dice,
+        target,
+        specialty=specialty,
+        wp=wp,
+        autos=autos,
+        rote=rote,
+        blessed=blessed,
+        blighted=blighted,
+    )
+    embed = build_embed(
+        ctx,
+        result,
+        dice,
+        target,
+        specialty,
+        wp,
+        autos,
+        rote=rote,
+        blessed=blessed,
+        blighted=blighted,
+    )
+    await ctx.respond(embed=embed, ephemeral=True)
+
+
+def build_embed(
+    ctx: bot.AppCtx,
+    result: Odds,
+    dice: int,
+    target: int,
+    specialty: bool,
+    wp: bool,
+    autos: int,
+    *,
+    rote=False,
+    blessed=False,
+    blighted=False,
+) -> discord.Embed:
+    """Build the odds embed."""
+    title = f"{dice} {'die' if dice == 1 else 'dice'}"
+    if result.line == GameLine.WOD:
+        title += f" at difficulty {target}"
+    elif target < 10:
+        title += f", {target}-again"
+
+    modifiers = []
+    if specialty:
+        modifiers.append("Specialty")
+    if wp:
+        modifiers.append("WP")
+    if autos:
+        modifiers.append(f"+{autos} {'auto' if autos == 1 else 'autos'}")
+    if blessed:
+        modifiers.append("Blessed")
+    elif blighted:
+        modifiers.append("Blighted")
+    if rote:
+        modifiers.append("Rote")
+    if modifiers:
+        title += " • " + " • ".join(modifiers)
+
+    rows = [f"**{n}+:** {percent(result.at_least(n))}" for n in range(1, AT_LEAST + 1)]
+    embed = discord.Embed(title=title, description="\n".join(rows))
+    embed.add_field(name="Success", value=percent(result.success))
+    if result.line == GameLine.WOD:
+        embed.add_field(name="Botch", value=percent(result.botch))
+    embed.add_field(name="Exceptional", value=percent(result.exceptional))
+    embed.add_field(name="Average", value=f"{result.mean:.2f} successes")
+
+    embed.set_author(name=ctx.author.display_name, icon_url=botchcord.get_avatar(ctx.author))
+    if result.trials:
+        embed.set_footer(text=f"Estimated from {result.trials:,} simulated rolls.")
+    else:
+        embed.set_footer(text="Exact odds.")
+
+    return embed
+
+
+def percent(chance: float) -> str:
+    """Format a probability as a percentage, without rounding a possible
+    outcome to 0% or an uncertain one to 100%."""
+    if 0 < chance < 0.001:
+        return "<0.1%"
+    if 0.999 < chance < 1:
+        return ">99.9%"
+    return f"{chance:.1%}"
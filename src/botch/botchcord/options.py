@@ -1,14 +1,20 @@
 """Commonly used slash command options and helpers."""
 
+import asyncio
 import logging
 from typing import cast
 
 import discord
 from discord.commands import Option, OptionChoice
 
-from botch import core
+from botch import core, errors
 from botch.config import GAME_LINE
-from botch.core.characters.base import GameLine
+from botch.core.characters.base import Character, GameLine
+from botch.core.rolls.parse import complete_pool
+from botch.core.utils.prefix import search_names
+
+MAX_CHOICES = 25  # Discord's autocomplete limit
+AUTOCOMPLETE_TIMEOUT = 2.5  # Seconds; Discord drops responses after 3
 
 
 def promoted_choice(
@@ -63,6 +69,21 @@ def character(
     return decorator
 
 
+def pool(description: str, param="pool"):
+    """A command decorator for roll syntax, with trait autocomplete."""
+
+    def decorator(func):
+        func.__annotations__[param] = Option(
+            str,
+            description,
+            name=param,
+            autocomplete=_pool_completions,
+        )
+        return func
+
+    return decorator
+
+
 def owner(param="owner", description="The character's owner (admin only)"):
     """A command decorator letting users choose character owned by another."""
 
@@ -105,8 +126,6 @@ async def _available_characters(
     user = cast(discord.Member, ctx.interaction.user)
 
     # Check if they're looking up a player and have lookup permissions
-    spcs = []
-
     # The discord.Member value becomes a string here instead of an int, for
     # some reason, so we have to cast it.
     owner_id = cast(
@@ -123,24 +142,61 @@ async def _available_characters(
         # Non-admin tried to look up another user's character
         return [OptionChoice("You do not have admin permissions", "")]
 
+    # Only names are needed, so these are served from indexes built from
+    # character summaries rather than from full characters
+    line = GameLine(GAME_LINE)
     if user.guild_permissions.administrator:
         # Add SPCs
-        spcs = await core.cache.fetchnames(guild.id, bot_user.id, GameLine(GAME_LINE))
+        indexes = await asyncio.gather(
+            core.cache.name_index(guild.id, owner_id, line),
+            core.cache.name_index(guild.id, bot_user.id, line),
+        )
         logger.info(
             "%s: admin %s fetched %s SPCs",
             guild.name,
             user.name,
-            len(spcs),
+            len(indexes[1]),
         )
+    else:
+        indexes = [await core.cache.name_index(guild.id, owner_id, line)]
 
-    chars = await core.cache.fetchnames(guild.id, owner_id, GameLine(GAME_LINE))
-    chars.extend(spcs)
+    # Discord shows at most 25 choices, so send the best ones
+    return search_names(indexes, ctx.value or "", limit=MAX_CHOICES)
+
+
+async def _pool_completions(ctx: discord.AutocompleteContext) -> list[str]:
+    """Complete the pool's last trait from the selected character, or from
+    all of the user's characters if none is selected."""
+    if (guild := ctx.interaction.guild) is None or not ctx.value:
+        return []
+
+    user = cast(discord.Member, ctx.interaction.user)
+    owner_id = int(ctx.options.get("owner") or user.id)
+    if owner_id != user.id and not user.guild_permissions.administrator:
+        return []
+
+    line = GameLine(GAME_LINE)
+    try:
+        async with asyncio.timeout(AUTOCOMPLETE_TIMEOUT):
+            if name := ctx.options.get("character"):
+                owners = [owner_id]
+                if user.guild_permissions.administrator:
+                    owners.append(cast(discord.ClientUser, ctx.bot.user).id)  # SPCs
+                chars = await _fetch_named(guild.id, owners, name, line)
+            else:
+                chars = await core.cache.fetchall(guild.id, owner_id, line=line)
+    except TimeoutError:
+        logging.getLogger("POOL_OPTION").warning("Timed out loading characters")
+        return []
 
-    name_search = ctx.value.casefold()
+    return complete_pool(ctx.value, chars, MAX_CHOICES)
 
-    found_chars = [name for name in chars if name.casefold().startswith(name_search or "")]
 
-    if len(found_chars) > 25:
-        instructions = "Keep typing ..." if ctx.value else "Start typing a name."
-        return [OptionChoice(f"Too many characters to display. {instructions}", "")]
-    return found_chars
+async def _fetch_named(guild: int, owners: list[int], name: str, line: GameLine) -> list[Character]:
+    """The first of the owners' characters with the given name, if any."""
+    for owner_id in owners:
+        try:
+            return [await core.cache.fetchone(guild, owner_id, name, line=line)]
+        except errors.CharacterNotFound:
+            continue
+    return []
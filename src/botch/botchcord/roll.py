@@ -2,6 +2,7 @@
 
 import re
 from enum import IntEnum
+from functools import lru_cache
 from typing import Optional
 
 import discord
@@ -11,8 +12,9 @@ from botch.botchcord.character.display import DisplayField, add_display_field
 from botch.botchcord.haven import Haven
 from botch.config import GAME_LINE
 from botch.core.characters import Character, Damage, GameLine, Tracker
-from botch.core.rolls import Roll, d10
+from botch.core.rolls import Roll, d10, roll_sink
 from botch.core.rolls.parse import RollParser
+from botch.core.writer import writer
 
 DICE_CAP = 40
 DICE_CAP_MESSAGE = "***Too many to show.***"
@@ -98,12 +100,13 @@ async def roll(
 
     if roll.wp and character:
         character.increment_damage(Tracker.WILLPOWER, Damage.BASHING)
+        writer.schedule(character)
 
     emojis = await botchcord.settings.use_emojis(ctx)
     embed = build_embed(ctx, roll, extra_specs, comment, emojis)
 
     await ctx.respond(embed=embed)
-    await roll.save()
+    await roll_sink.put(roll)
 
 
 async def chance(ctx: bot.AppCtx):
@@ -221,6 +224,7 @@ def emojify_dice(ctx: bot.AppCtx, roll: Roll) -> str:
     return " ".join(emojis)
 
 
+@lru_cache(maxsize=None)
 def emoji_name(die: int, success: int, special: int, botchable: bool) -> str:
     """Generate the emoji name for a die.
 
@@ -246,26 +250,30 @@ def textify_dice(roll: Roll) -> str:
     if len(roll.dice) > DICE_CAP:
         return DICE_CAP_MESSAGE
 
+    spec = bool(roll.specialties)
+    return ", ".join(textify_die(d, roll.difficulty, roll.again, roll.wod, spec) for d in roll.dice)
+
+
+@lru_cache(maxsize=None)
+def textify_die(die: int, difficulty: int, again: int, wod: bool, spec: bool) -> str:
+    """Format a single die. There are only a few hundred possible inputs, so
+    each fragment is only ever built once."""
     #   * Failures: strikethrough
     #   * Ones: Bold-italic (WoD)
     #   * Tens (spec): Bold
     #   * Explosions: Bold
-    text = []
-    for die in roll.dice:
-        d = str(die)
-        if die < roll.difficulty:
-            d = f"~~{d}~~"
-        if roll.wod:
-            if die == 1:
-                d = f"***{d}***"
-            if die == 10 and roll.specialties:
-                d = f"**{d}**"
-        elif die >= roll.again:
+    d = str(die)
+    if die < difficulty:
+        d = f"~~{d}~~"
+    if wod:
+        if die == 1:
+            d = f"***{d}***"
+        if die == 10 and spec:
             d = f"**{d}**"
+    elif die >= again:
+        d = f"**{d}**"
 
-        text.append(d)
-
-    return ", ".join(text)
+    return d
 
 
 def embed_color(roll: Roll) -> int:
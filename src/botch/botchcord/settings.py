@@ -28,6 +28,18 @@ def can_use_external_emoji(ctx: AppCtx) -> bool:
 
 async def accessibility(ctx: AppCtx) -> bool:
     """Whether to use accessibility mode for the current operation."""
+    guild_id = ctx.guild.id if ctx.guild else None
+    key = (guild_id, ctx.channel_id, ctx.author.id)
+    if (cached := ctx.bot.settings_cache.get(key)) is not None:
+        return cached
+
+    a11y = await _resolve_accessibility(ctx)
+    ctx.bot.settings_cache.set(key, a11y)
+    return a11y
+
+
+async def _resolve_accessibility(ctx: AppCtx) -> bool:
+    """Work out accessibility from permissions, guild, and user settings."""
     if not can_use_external_emoji(ctx):
         return True
 
@@ -120,6 +132,7 @@ class SettingsView(View):
         user = await self._user()
         user.settings.accessibility = not user.settings.accessibility
         await user.save()
+        self.ctx.bot.settings_cache.invalidate(user=user.user)
 
         await self._populate_buttons()
         await interaction.response.edit_message(view=self)
@@ -129,6 +142,7 @@ class SettingsView(View):
         guild = await self._guild()
         guild.settings.accessibility = not guild.settings.accessibility
         await guild.save()
+        self.ctx.bot.settings_cache.invalidate(guild=guild.guild)
 
         await self._populate_buttons()
         await interaction.response.edit_message(view=self)
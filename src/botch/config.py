@@ -19,12 +19,50 @@ GAME_LINE = os.getenv("GAME_LINE", "wod")
 BOTCH_URL = os.getenv("BOTCH_URL", "http://localhost:5173")
 DOCS_URL = os.getenv("DOCS_URL", "https://docs.botch.lol")
 
+# Botch API (faceclaims, logs). Point BOTCH_API_URL at a local server to test.
+BOTCH_API_URL = os.getenv("BOTCH_API_URL") or "https://api.botch.lol/"
+API_POOL_SIZE = int(os.getenv("API_POOL_SIZE") or 20)  # Max concurrent connections
+
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE") or 10_000)
+
+# Premium image purges: concurrent deletions, API calls per second, and
+# attempts per character before giving up until the next run
+PURGE_CONCURRENCY = int(os.getenv("PURGE_CONCURRENCY") or 8)
+PURGE_RATE = float(os.getenv("PURGE_RATE") or 10)
+PURGE_ATTEMPTS = int(os.getenv("PURGE_ATTEMPTS") or 3)
+
+# Rolls simulated when /odds can't compute a distribution exactly
+ODDS_TRIALS = int(os.getenv("ODDS_TRIALS") or 100_000)
+
 # Bucket for storing character images
 FC_BUCKET = "pcs-dev.botch.lol" if "TESTING" in os.environ else "pcs.botch.lol"
 
 MAX_NAME_LEN = 37  # Because of modal length restrictions
 VERSION = os.getenv("VERSION_TAG", "local")
 
+# Character cache limits. Entries are weighted by their approximate size;
+# see UserCharacters.weight for the units.
+CHAR_CACHE_MAX_WEIGHT = int(os.getenv("CHAR_CACHE_MAX_WEIGHT") or 100_000)
+CHAR_CACHE_TTL = int(os.getenv("CHAR_CACHE_TTL") or 1800)  # Seconds
+CHAR_SUMMARY_CACHE_SIZE = int(os.getenv("CHAR_SUMMARY_CACHE_SIZE") or 10_000)  # Users
+
+# How long character edits may wait before being written to the database
+CHAR_SAVE_DELAY = float(os.getenv("CHAR_SAVE_DELAY") or 2)  # Seconds
+
+# Rolls are inserted in batches of up to ROLL_BATCH_SIZE, at least every
+# ROLL_BATCH_INTERVAL seconds. Once ROLL_MAX_PENDING are queued, new rolls
+# wait up to ROLL_MAX_WAIT seconds for a flush before being dropped.
+ROLL_BATCH_SIZE = int(os.getenv("ROLL_BATCH_SIZE") or 100)
+ROLL_BATCH_INTERVAL = float(os.getenv("ROLL_BATCH_INTERVAL") or 5)  # Seconds
+ROLL_MAX_PENDING = int(os.getenv("ROLL_MAX_PENDING") or 1000)
+ROLL_MAX_WAIT = float(os.getenv("ROLL_MAX_WAIT") or 2)  # Seconds
+
+# Command records are batched the same way, except that once
+# COMMAND_LOG_MAX_PENDING are queued, the oldest are dropped.
+COMMAND_LOG_BATCH_SIZE = int(os.getenv("COMMAND_LOG_BATCH_SIZE") or 250)
+COMMAND_LOG_INTERVAL = float(os.getenv("COMMAND_LOG_INTERVAL") or 15)  # Seconds
+COMMAND_LOG_MAX_PENDING = int(os.getenv("COMMAND_LOG_MAX_PENDING") or 5000)
+
 
 def set_bot_id(bot_id: int):
     """Set the bot's user ID."""
@@ -2,5 +2,6 @@
 
 from botch.core import characters, rolls
 from botch.core.cache import cache
+from botch.core.writer import writer
 
-__all__ = ("rolls", "characters", "cache")
+__all__ = ("rolls", "characters", "cache", "writer")
@@ -1,32 +1,245 @@
 """Character cache."""
 
+import asyncio
 import bisect
+import heapq
+import logging
+from collections import defaultdict
 
 from cachetools import TTLCache
+from pydantic import BaseModel
 
 from botch import errors
-from botch.core.characters import Character, GameLine, Splat
+from botch.config import CHAR_CACHE_MAX_WEIGHT, CHAR_CACHE_TTL, CHAR_SUMMARY_CACHE_SIZE
+from botch.core.characters import Character, CharacterSummary, GameLine, Splat
+from botch.core.utils.prefix import NameIndex
+from botch.core.writer import writer
 from botch.utils import normalize_text
 
+BucketKey = tuple[int, GameLine, Splat]
+NameIndexKey = tuple[int, int, GameLine | None]  # Guild, user, line
+
+
+def _sort_key(character: Character) -> str:
+    """Characters are kept sorted by casefolded name."""
+    return character.name.casefold()
+
+
+def character_weight(character: Character) -> int:
+    """A cheap estimate of a character's memory footprint: one unit for the
+    character itself, plus one for each trait, subtrait, macro, and image.
+    Serializing the character would be more precise, but it would cost about
+    as much as loading it in the first place."""
+    return (
+        1
+        + len(character.traits)
+        + sum(len(trait.subtraits) for trait in character.traits)
+        + len(character.macros)
+        + len(character.profile.images)
+    )
+
+
+class UserCharacters:
+    """All of a user's characters, plus lookup tables so that filtering by
+    guild, line, and splat, or finding a character by name, doesn't require
+    scanning the whole list. The lookup tables are kept in sync by add() and
+    remove(); characters should not be added or removed any other way."""
+
+    def __init__(self, characters: list[Character]):
+        self.characters = sorted(characters, key=_sort_key)
+        self.buckets: defaultdict[BucketKey, list[Character]] = defaultdict(list)
+        self.names: defaultdict[tuple[int, str], list[Character]] = defaultdict(list)
+        self.weight = 1  # An empty entry still occupies a slot
+
+        for character in self.characters:
+            self.buckets[self._bucket_key(character)].append(character)
+            self.names[self._name_key(character)].append(character)
+            self.weight += character_weight(character)
+
+    def __len__(self) -> int:
+        return len(self.characters)
+
+    @staticmethod
+    def _bucket_key(character: Character) -> BucketKey:
+        return (character.guild, character.line, character.splat)
+
+    @staticmethod
+    def _name_key(character: Character) -> tuple[int, str]:
+        return (character.guild, character.name.casefold())
+
+    def add(self, character: Character):
+        """Add a character, keeping everything sorted."""
+        bisect.insort(self.characters, character, key=_sort_key)
+        bisect.insort(self.buckets[self._bucket_key(character)], character, key=_sort_key)
+        self.names[self._name_key(character)].append(character)
+        self.weight += character_weight(character)
+
+    def remove(self, character: Character):
+        """Remove a character.
+
+        Raises ValueError if the character isn't present."""
+        index = self.characters.index(character)
+        found = self.characters.pop(index)
+        self.weight = max(1, self.weight - character_weight(found))
+
+        for table, key in (
+            (self.buckets, self._bucket_key(found)),
+            (self.names, self._name_key(found)),
+        ):
+            entries = table[key]
+            del entries[next(i for i, c in enumerate(entries) if c is found)]
+            if not entries:
+                del table[key]
+
+    def filter(
+        self, guild: int | None, line: GameLine | None, splat: Splat | None
+    ) -> list[Character]:
+        """The characters matching the given criteria, sorted by name."""
+        if guild is None and line is None and splat is None:
+            return list(self.characters)
+        if guild is not None and line is not None and splat is not None:
+            return list(self.buckets.get((guild, line, splat), []))
+
+        matched = [
+            bucket
+            for (bucket_guild, bucket_line, bucket_splat), bucket in self.buckets.items()
+            if (guild is None or bucket_guild == guild)
+            and (line is None or bucket_line == line)
+            and (splat is None or bucket_splat == splat)
+        ]
+        if len(matched) == 1:
+            return list(matched[0])
+        return list(heapq.merge(*matched, key=_sort_key))
+
+    def named(self, guild: int, name: str) -> list[Character]:
+        """The characters in the guild with the given (case-insensitive) name."""
+        return self.names.get((guild, name.casefold()), [])
+
+
+class CacheStats(BaseModel):
+    """Character cache counters."""
+
+    hits: int = 0
+    misses: int = 0
+    loads: int = 0  # Database queries issued
+    coalesced: int = 0  # Misses that joined a load already in flight
+    evictions: int = 0  # Entries dropped to make room
+    expirations: int = 0  # Entries dropped for exceeding the TTL
+    oversized: int = 0  # Entries too heavy to cache at all
+    summary_loads: int = 0  # Projection queries for character summaries
+
+
+class WeightedTTLCache(TTLCache[int, UserCharacters]):
+    """An LRU/TTL cache whose capacity is measured in UserCharacters weight
+    rather than number of users, and which counts what it drops."""
+
+    def __init__(self, maxsize: int, ttl: float, stats: CacheStats):
+        super().__init__(maxsize, ttl, getsizeof=lambda entry: entry.weight)
+        self.stats = stats
+
+    def popitem(self):
+        item = super().popitem()
+        self.stats.evictions += 1
+        return item
+
+    def expire(self, time=None):
+        expired = super().expire(time)
+        self.stats.expirations += len(expired)
+        return expired
+
 
 class CharCache:
     """The character cache simply manages characters based on user,
-    name, and guild. It does not perform any access control."""
+    name, and guild. It does not perform any access control.
+
+    Capacity is measured in approximate size (see character_weight()), so a
+    GM with dozens of characters counts for more than a player with one.
 
-    def __init__(self):
-        self._cache: TTLCache[int, list[Character]] = TTLCache(maxsize=100, ttl=1800)
+    Listing characters (e.g. for autocomplete) doesn't need full documents,
+    so users who aren't fully cached have their characters summarized
+    instead. Summaries are kept separately and are dropped whenever the
+    user's characters are loaded, added, renamed, or removed."""
 
-    async def __fetch(self, user: int) -> list[Character]:
-        """Fill the cache."""
-        if user not in self._cache:
+    def __init__(
+        self,
+        max_weight=CHAR_CACHE_MAX_WEIGHT,
+        ttl=CHAR_CACHE_TTL,
+        summary_size=CHAR_SUMMARY_CACHE_SIZE,
+    ):
+        self.stats = CacheStats()
+        self._cache = WeightedTTLCache(max_weight, ttl, self.stats)
+        self._summaries: TTLCache[int, list[CharacterSummary]] = TTLCache(summary_size, ttl)
+        self._name_indexes: TTLCache[NameIndexKey, NameIndex] = TTLCache(summary_size, ttl)
+        self._loading: dict[int, asyncio.Task[UserCharacters]] = {}
+        self.logger = logging.getLogger("CHAR CACHE")
+
+    @property
+    def users(self) -> int:
+        """The number of users currently cached."""
+        return len(self._cache)
+
+    @property
+    def weight(self) -> int:
+        """The total weight currently cached."""
+        return int(self._cache.currsize)
+
+    def _store(self, user: int, entry: UserCharacters):
+        """(Re-)insert an entry, which also updates its weight. Entries that
+        could never fit aren't cached; they're simply reloaded when needed."""
+        # When a key grows, cachetools makes room for its full new weight on
+        # top of the old, evicting more than it needs to, so drop it first.
+        self._cache.pop(user, None)
+        if entry.weight > self._cache.maxsize:
+            self.stats.oversized += 1
+            self.logger.warning("Not caching user %s (weight %s)", user, entry.weight)
+        else:
+            self._cache[user] = entry
+
+    async def __fetch(self, user: int) -> UserCharacters:
+        """Fill the cache. Concurrent misses for the same user share a single
+        database query rather than each issuing their own."""
+        if (chars := self._cache.get(user)) is not None:
+            self.stats.hits += 1
+            return chars
+
+        self.stats.misses += 1
+        if (load := self._loading.get(user)) is not None:
+            self.stats.coalesced += 1
+            self.logger.debug("Joining in-flight load for %s", user)
+        else:
+            load = asyncio.create_task(self.__load(user))
+            self._loading[user] = load
+
+        # Shielded so that one cancelled caller doesn't cancel everyone's load
+        return await asyncio.shield(load)
+
+    async def __load(self, user: int) -> UserCharacters:
+        """Load the user's characters from the database into the cache."""
+        try:
+            self.stats.loads += 1
             chars = await Character.find(
                 Character.user == user,
                 with_children=True,
             ).to_list()
 
-            self._cache[user] = sorted(chars, key=lambda c: c.name.casefold())
+            entry = UserCharacters(chars)
+            self._store(user, entry)
+            self._summaries.pop(user, None)  # The full entry supersedes them
+            return entry
+        finally:
+            del self._loading[user]
 
-        return self._cache[user]
+    def reconcile(self, characters: list[Character]) -> list[Character]:
+        """Swap freshly queried characters for any live instances in the
+        cache, so that changes made to them aren't lost or overwritten. Users
+        who aren't cached are left alone rather than loaded."""
+        reconciled = []
+        for character in characters:
+            entry = self._cache.get(character.user)
+            if entry is not None:
+                character = next((c for c in entry.characters if c.id == character.id), character)
+            reconciled.append(character)
+        return reconciled
 
     async def count(
         self, guild: int, user: int, line: GameLine | None = None, splat: Splat | None = None
@@ -40,15 +253,40 @@ class CharCache:
     ) -> list[Character]:
         """Fetch the user's characters."""
         chars = await self.__fetch(user)
+        return chars.filter(guild, line, splat)
 
-        if line is not None:
-            chars = [char for char in chars if char.line == line]
-        if splat is not None:
-            chars = [char for char in chars if char.splat == splat]
-        if guild is not None:
-            chars = [char for char in chars if char.guild == guild]
+    async def fetchsummaries(
+        self,
+        guild: int | None,
+        user: int,
+        line: GameLine | None = None,
+        splat: Splat | None = None,
+    ) -> list[CharacterSummary]:
+        """Fetch summaries of the user's characters, sorted by name. These
+        come from the full characters if they're cached; otherwise, only the
+        summary fields are loaded."""
+        if (entry := self._cache.get(user)) is not None:
+            self.stats.hits += 1
+            return [CharacterSummary.of(char) for char in entry.filter(guild, line, splat)]
 
-        return chars
+        summaries = self._summaries.get(user)
+        if summaries is None:
+            self.stats.summary_loads += 1
+            summaries = (
+                await Character.find(Character.user == user, with_children=True)
+                .project(CharacterSummary)
+                .to_list()
+            )
+            summaries.sort(key=lambda summary: summary.name.casefold())
+            self._summaries[user] = summaries
+
+        return [
+            summary
+            for summary in summaries
+            if (guild is None or summary.guild == guild)
+            and (line is None or summary.line == line)
+            and (splat is None or summary.splat == splat)
+        ]
 
     async def fetchnames(
         self,
@@ -58,8 +296,27 @@ class CharCache:
         splat: Splat | None = None,
     ) -> list[str]:
         """Fetch just the characters' names."""
-        chars = await self.fetchall(guild, user, line=line, splat=splat)
-        return [char.name for char in chars]
+        summaries = await self.fetchsummaries(guild, user, line=line, splat=splat)
+        return [summary.name for summary in summaries]
+
+    async def name_index(self, guild: int, user: int, line: GameLine | None = None) -> NameIndex:
+        """The user's character names in the guild, indexed for autocomplete.
+        Indexes are built from summaries, then kept up to date as characters
+        are registered, renamed, and removed."""
+        key = (guild, user, line)
+        if (index := self._name_indexes.get(key)) is None:
+            index = NameIndex(await self.fetchnames(guild, user, line))
+            self._name_indexes[key] = index
+        return index
+
+    def _index_names(self, character: Character, *, add: str | None, remove: str | None):
+        """Update any name indexes covering the character."""
+        for line in (None, character.line):
+            if index := self._name_indexes.get((character.guild, character.user, line)):
+                if remove is not None:
+                    index.remove(remove)
+                if add is not None:
+                    index.add(add)
 
     async def fetchone(
         self,
@@ -70,12 +327,11 @@ class CharCache:
         splat: Splat | None = None,
     ) -> Character:
         """Fetch a single character by name."""
-        name = name.casefold()
-        chars = await self.fetchall(guild, user, line=line, splat=splat)
-        for char in chars:
-            if char.name.casefold() == name.casefold():
+        chars = await self.__fetch(user)
+        for char in chars.named(guild, name):
+            if (line is None or char.line == line) and (splat is None or char.splat == splat):
                 return char
-        raise errors.CharacterNotFound(f"**{name}** not found.")
+        raise errors.CharacterNotFound(f"**{name.casefold()}** not found.")
 
     async def has_character(self, guild: int, user: int, name: str) -> bool:
         """Whether the user has a character by the given name.
@@ -88,13 +344,14 @@ class CharCache:
         Returns:
             True if the user already has a character by that name.
         """
-        chars = await self.fetchall(guild, user)
-        name = normalize_text(name).casefold()
-        for char in chars:
-            if char.name.casefold() == name:
-                return True
+        chars = await self.__fetch(user)
+        return bool(chars.named(guild, normalize_text(name)))
 
-        return False
+    def clear(self):
+        """Drop everything cached."""
+        self._cache.clear()
+        self._summaries.clear()
+        self._name_indexes.clear()
 
     async def register(self, character: Character):
         """Insert the character and register it in the cache."""
@@ -103,13 +360,42 @@ class CharCache:
         # been used for this user.
         chars = await self.__fetch(character.user)
         await character.save()
-        bisect.insort(chars, character, key=lambda c: c.name.casefold())
+        chars.add(character)
+        self._store(character.user, chars)
+        self._summaries.pop(character.user, None)
+        self._index_names(character, add=character.name, remove=None)
+
+    async def rename(self, character: Character, new_name: str):
+        """Rename the character, save it, and update the cache's lookups."""
+        chars = await self.__fetch(character.user)
+        old_name = character.name
+        try:
+            # Lookups are keyed by name, so take it out under the old one
+            chars.remove(character)
+            cached = True
+        except ValueError:
+            cached = False  # Not cached, so there's nothing to re-key
+
+        try:
+            character.name = new_name  # Raises if invalid, leaving it unchanged
+        finally:
+            if cached:
+                chars.add(character)
+        self._index_names(character, add=character.name, remove=old_name)
+
+        writer.discard(character)  # The full save covers any pending changes
+        self._summaries.pop(character.user, None)
+        await character.save()
 
     async def remove(self, character: Character):
         """Delete the character from the database and remove from the cache."""
         chars = await self.__fetch(character.user)
         try:
             chars.remove(character)
+            self._store(character.user, chars)
+            self._summaries.pop(character.user, None)
+            self._index_names(character, add=None, remove=character.name)
+            await writer.forget(character)
             await character.delete()
         except ValueError:
             raise errors.CharacterNotFound(
@@ -3,6 +3,7 @@
 from botch.core.characters import cofd, wod
 from botch.core.characters.base import (
     Character,
+    CharacterSummary,
     Damage,
     Experience,
     GameLine,
@@ -11,12 +12,14 @@ from botch.core.characters.base import (
     Splat,
     Tracker,
     Trait,
+    TraitView,
 )
 
 __all__ = (
     "cofd",
     "wod",
     "Character",
+    "CharacterSummary",
     "Damage",
     "Experience",
     "GameLine",
@@ -25,4 +28,5 @@ __all__ = (
     "Splat",
     "Tracker",
     "Trait",
+    "TraitView",
 )
@@ -2,19 +2,17 @@
 subclasses."""
 
 import bisect
-import copy
 from collections import Counter
-from copy import deepcopy
 from enum import StrEnum
-from itertools import product
 from typing import Annotated, Collection, Literal, Optional, overload
 
 import pymongo
-from beanie import Delete, Document, before_event
-from pydantic import BaseModel, Field, HttpUrl, StringConstraints
+from beanie import Delete, Document, PydanticObjectId, before_event
+from pydantic import BaseModel, Field, HttpUrl, PrivateAttr, StringConstraints
 
 from botch import api, errors
 from botch.config import MAX_NAME_LEN
+from botch.core.utils.prefix import PrefixIndex
 
 
 class GameLine(StrEnum):
@@ -124,6 +122,9 @@ class Macro(BaseModel):
         return " ".join(map(str, self.keys))
 
 
+MAX_EXPANSIONS = 64  # Memoized expansions per trait
+
+
 class Trait(BaseModel, validate_assignment=True):
     """A trait represents an Attribute, Ability, Discipline, etc."""
 
@@ -170,6 +171,13 @@ class Trait(BaseModel, validate_assignment=True):
         Annotated[str, StringConstraints(strip_whitespace=True, min_length=1, max_length=20)]
     ] = Field(default_factory=list)
 
+    # Expansions are memoized per (version, name, identifier, exact). The
+    # version is bumped whenever the subtraits change.
+    _version: int = PrivateAttr(default=0)
+    _expansions: dict[
+        tuple[int, str, str, bool], tuple[tuple[tuple[str, ...], ...], tuple[str, ...]]
+    ] = PrivateAttr(default_factory=dict)
+
     def add_subtraits(self, subtraits: str | Collection[str]):
         """Add subtraits to the trait."""
         if isinstance(subtraits, str):
@@ -184,6 +192,8 @@ class Trait(BaseModel, validate_assignment=True):
                 self.subtraits.append(subtrait)
 
         self.subtraits.sort()
+        self._version += 1
+        self._expansions.clear()
 
     def remove_subtraits(self, subtraits: str | list[str] | set[str]):
         """Remove subtraits from the trait."""
@@ -200,6 +210,14 @@ class Trait(BaseModel, validate_assignment=True):
             except ValueError:
                 continue
 
+        self._version += 1
+        self._expansions.clear()
+
+    @property
+    def keys(self) -> list[str]:
+        """The trait's name, plus the "Trait.Subtrait" key for each subtrait."""
+        return [self.name] + [self._DELIMITER.join((self.name, sub)) for sub in self.subtraits]
+
     def matches(self, search: str) -> bool:
         """Return true if the trait name starts with the search string."""
         return self.name.casefold().startswith(search.casefold())
@@ -229,11 +247,26 @@ class Trait(BaseModel, validate_assignment=True):
 
     def expanding(self, identifier: str, exact: bool, join=True) -> list[str] | list[list[str]]:
         """Expand the user's input to full skill:spec names."""
-        tokens = identifier.lower().split(self._DELIMITER)
+        normalized = identifier.lower()
+        key = (self._version, self.name, normalized, exact)
+        if (expansions := self._expansions.get(key)) is None:
+            if len(self._expansions) >= MAX_EXPANSIONS:
+                self._expansions.clear()
+            groups = self._expand(normalized, exact)
+            joined = tuple(self._DELIMITER.join(group) for group in groups)
+            expansions = self._expansions[key] = (groups, joined)
+
+        groups, joined = expansions
+        if join:
+            return list(joined)
+        return [list(group) for group in groups]
+
+    def _expand(self, identifier: str, exact: bool) -> tuple[tuple[str, ...], ...]:
+        tokens = identifier.split(self._DELIMITER)
         comp = self._exact_comp if exact else self._starting_comp
 
         if not comp(tokens[0], self.name):
-            return []
+            return ()
 
         spec_groups = self._get_matching_spec_groups(tokens[1:], comp)
 
@@ -242,7 +275,7 @@ class Trait(BaseModel, validate_assignment=True):
         else:
             matches = self._generate_unique_matches(spec_groups)
 
-        return [self._DELIMITER.join(match) for match in matches] if join else matches
+        return tuple(tuple(match) for match in matches)
 
     def _normalize_identifier(self, identifier: str) -> str:
         tokens = identifier.split(self._DELIMITER)
@@ -268,21 +301,38 @@ class Trait(BaseModel, validate_assignment=True):
         ]
 
     def _generate_unique_matches(self, spec_groups: list[list[str]]) -> list[list[str]]:
+        """Choose a distinct subtrait from each group, yielding each set of
+        subtraits once, in the order a product() over the groups would first
+        reach it.
+
+        Rather than taking the whole product and discarding repeats, this
+        builds the choices one group at a time and prunes as it goes: a
+        subtrait already chosen is skipped, and once a set of choices has
+        been explored, any reordering of it is skipped too, since every
+        completion of it has already been found."""
         if len(spec_groups) == 1:
             return [[self.name, spec] for spec in spec_groups[0]]
 
-        combinations = product(*spec_groups)
-        seen_groups = set()
         matches = []
-
-        for group in combinations:
-            if len(set(group)) < len(group):
-                continue
-            frozen_group = frozenset(group)
-            if frozen_group not in seen_groups:
-                seen_groups.add(frozen_group)
-                matches.append([self.name] + sorted(group))
-
+        seen: set[frozenset[str]] = set()  # Chosen sets already explored
+        chosen: list[str] = []
+
+        def choose(depth: int):
+            if depth == len(spec_groups):
+                matches.append([self.name] + sorted(chosen))
+                return
+
+            for spec in spec_groups[depth]:
+                if spec in chosen:
+                    continue
+                chosen.append(spec)
+                frozen = frozenset(chosen)
+                if frozen not in seen:
+                    seen.add(frozen)
+                    choose(depth + 1)
+                chosen.pop()
+
+        choose(0)
         return matches
 
     @staticmethod
@@ -294,6 +344,67 @@ class Trait(BaseModel, validate_assignment=True):
         return i.lower().startswith(t)
 
 
+class TraitView:
+    """A read-only view of a character's Trait, handed out instead of a copy.
+    Reads come from the live Trait, so the view always reflects the current
+    state; changes must go through the Character's trait methods."""
+
+    __slots__ = ("_trait",)
+
+    def __init__(self, trait: Trait):
+        object.__setattr__(self, "_trait", trait)
+
+    def __setattr__(self, name: str, value):
+        raise AttributeError(f"Can't set `{name}` on a read-only trait.")
+
+    def __delattr__(self, name: str):
+        raise AttributeError(f"Can't delete `{name}` from a read-only trait.")
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, TraitView):
+            other = other._trait
+        return self._trait == other
+
+    __hash__ = None  # type: ignore
+
+    def __repr__(self) -> str:
+        return f"TraitView({self._trait!r})"
+
+    @property
+    def name(self) -> str:
+        return self._trait.name
+
+    @property
+    def rating(self) -> int:
+        return self._trait.rating
+
+    @property
+    def category(self) -> Trait.Category:
+        return self._trait.category
+
+    @property
+    def subcategory(self) -> Trait.Subcategory:
+        return self._trait.subcategory
+
+    @property
+    def subtraits(self) -> list[str]:
+        """The subtraits. A new list, so changing it has no effect."""
+        return list(self._trait.subtraits)
+
+    @property
+    def keys(self) -> list[str]:
+        return self._trait.keys
+
+    def matches(self, search: str) -> bool:
+        return self._trait.matches(search)
+
+    def matching(self, identifier: str, exact: bool) -> list[Trait.Selection]:
+        return self._trait.matching(identifier, exact)
+
+    def expanding(self, identifier: str, exact: bool, join=True) -> list[str] | list[list[str]]:
+        return self._trait.expanding(identifier, exact, join)
+
+
 class Character(Document, validate_assignment=True):
     """The character class contains all the standard fields for any character.
 
@@ -317,6 +428,13 @@ class Character(Document, validate_assignment=True):
     traits: list[Trait] = Field(default_factory=list)
     macros: list[Macro] = Field(default_factory=list)
 
+    # The trait indexes hold the traits list they were built from and its
+    # length, so they also rebuild if the list is replaced or appended to
+    # directly. Holding the list itself (rather than its id()) means a new
+    # list can never be mistaken for it.
+    _trait_index: Optional[tuple[list[Trait], int, PrefixIndex[int]]] = PrivateAttr(default=None)
+    _key_index: Optional[tuple[list[Trait], int, PrefixIndex[str]]] = PrivateAttr(default=None)
+
     @property
     def display_traits(self) -> list[Trait]:
         """All the character's traits."""
@@ -327,25 +445,34 @@ class Character(Document, validate_assignment=True):
         """Whether the character is a vampire or a ghoul."""
         return self.splat in (Splat.GHOUL, Splat.VAMPIRE)
 
-    def _all_traits(self) -> list[Trait]:
-        """A copy of all the character's rollable traits, including innates."""
-        innate = Trait.Category.INNATE
-        blank = Trait.Subcategory.BLANK
-        innates = [
-            Trait(
-                name="Willpower",
-                rating=len(self.willpower),
-                category=innate,
-                subcategory=blank,
-            ),
-            Trait(
-                name=self.grounding.path,
-                rating=self.grounding.rating,
-                category=innate,
-                subcategory=blank,
-            ),
+    def _all_traits(self) -> list[TraitView]:
+        """Read-only views of all the character's rollable traits, including
+        innates."""
+        innates = [self._innate_trait(name, rating) for name, rating in self._innate_ratings()]
+        return [TraitView(t) for t in self.traits + innates + self._extra_traits()]
+
+    def _innate_ratings(self) -> list[tuple[str, int]]:
+        """The names and ratings of the rollable traits derived from other
+        fields, such as Willpower. Subclasses should extend this."""
+        return [
+            ("Willpower", len(self.willpower)),
+            (self.grounding.path, self.grounding.rating),
         ]
-        return deepcopy(self.traits) + innates
+
+    def _extra_traits(self) -> list[Trait]:
+        """Rollable traits stored outside of the traits list, such as Virtues.
+        Unlike the traits list, these aren't indexed."""
+        return []
+
+    @staticmethod
+    def _innate_trait(name: str, rating: int) -> Trait:
+        """Create an innate trait."""
+        return Trait(
+            name=name,
+            rating=rating,
+            category=Trait.Category.INNATE,
+            subcategory=Trait.Subcategory.BLANK,
+        )
 
     @before_event(Delete)
     async def prep_delete(self):
@@ -412,21 +539,61 @@ class Character(Document, validate_assignment=True):
                 return True
         return False
 
-    def find_traits(self, search: str) -> list[Trait]:
-        """Get copies of all traits starting with the search key."""
-        traits = []
-        for trait in self.traits:
-            if trait.matches(search):
-                traits.append(copy.deepcopy(trait))
-        return traits
+    def find_traits(self, search: str) -> list[TraitView]:
+        """Get read-only views of all traits starting with the search key."""
+        return [TraitView(trait) for trait in self.traits if trait.matches(search)]
 
     def match_traits(self, search: str, exact=False) -> list[Trait.Selection]:
         """Match traits to user input. Used in rolls."""
         matches = []
-        for trait in self._all_traits():
+        for trait in self._trait_candidates(search.split(".", 1)[0]):
             matches.extend(trait.matching(search, exact))
         return matches
 
+    def _trait_candidates(self, prefix: str) -> list[Trait]:
+        """All rollable traits whose names start with the prefix, in the same
+        order as _all_traits(). These are NOT views, so they must not be
+        handed out to callers."""
+        cached = self._trait_index
+        if cached is None or cached[0] is not self.traits or cached[1] != len(self.traits):
+            index = PrefixIndex((t.name, i) for i, t in enumerate(self.traits))
+            cached = self._trait_index = (self.traits, len(self.traits), index)
+
+        positions = sorted(cached[2].search(prefix))
+        candidates = [self.traits[i] for i in positions]
+
+        # Innates are only built when they could match
+        folded = prefix.casefold()
+        for name, rating in self._innate_ratings():
+            if name.casefold().startswith(folded):
+                candidates.append(self._innate_trait(name, rating))
+
+        candidates.extend(t for t in self._extra_traits() if t.matches(prefix))
+        return candidates
+
+    def complete_trait(self, prefix: str) -> list[str]:
+        """Trait keys ("Brawl", "Brawl.Throws") starting with the prefix, for
+        autocomplete. Like the trait index, the keys of the traits list are
+        indexed; innates and extra traits are few enough to check directly."""
+        cached = self._key_index
+        if cached is None or cached[0] is not self.traits or cached[1] != len(self.traits):
+            index = PrefixIndex((key, key) for trait in self.traits for key in trait.keys)
+            cached = self._key_index = (self.traits, len(self.traits), index)
+
+        completions = cached[2].search(prefix)
+
+        folded = prefix.casefold()
+        others = [self._innate_trait(name, rating) for name, rating in self._innate_ratings()]
+        for trait in others + self._extra_traits():
+            completions.extend(key for key in trait.keys if key.casefold().startswith(folded))
+
+        return completions
+
+    def _invalidate_traits(self):
+        """Mark the trait indexes as stale. Called by every trait mutator."""
+        self._trait_index = None
+        self._key_index = None
+
     @staticmethod
     def _trait_sort_key(t: Trait) -> str:
         """The key used for insorting traits. A default is provided so tests
@@ -439,7 +606,7 @@ class Character(Document, validate_assignment=True):
         rating: int,
         category=Trait.Category.CUSTOM,
         subcategory=Trait.Subcategory.BLANK,
-    ) -> Trait:
+    ) -> TraitView:
         """Add a new trait.
         Args:
             name (str): The new trait's name
@@ -448,30 +615,32 @@ class Character(Document, validate_assignment=True):
 
         The traits list is automatically kept sorted.
 
-        Returns a copy of the new trait, if created.
+        Returns a read-only view of the new trait, if created.
         Raises TraitAlreadyExists if a trait by that name already exists."""
         if self.has_trait(name):
             raise errors.TraitAlreadyExists(f"**{self.name}** already has a trait called `{name}`.")
 
         new_trait = Trait(name=name, rating=rating, category=category, subcategory=subcategory)
         bisect.insort(self.traits, new_trait, key=self._trait_sort_key)
+        self._invalidate_traits()
 
-        return copy.deepcopy(new_trait)
+        return TraitView(new_trait)
 
-    def update_trait(self, name: str, new_rating: int) -> Trait:
+    def update_trait(self, name: str, new_rating: int) -> TraitView:
         """Update a trait.
         Args:
             name (str): The name of the Trait to update
             new_rating (int): The Trait's new rating
 
-        Returns a copy of the updated Trait.
+        Returns a read-only view of the updated Trait.
         Raises TraitNotFound.
         """
         trait_name = name.casefold()
         for trait in self.traits:
             if trait.name.casefold() == trait_name:
                 trait.rating = new_rating
-                return copy.deepcopy(trait)
+                self._invalidate_traits()
+                return TraitView(trait)
         raise errors.TraitNotFound(self, name)
 
     def remove_trait(self, name: str) -> str:
@@ -490,10 +659,11 @@ class Character(Document, validate_assignment=True):
                 else:
                     # Set core traits to 0 rather than remove them
                     trait.rating = 0
+                self._invalidate_traits()
                 return trait.name
         raise errors.TraitNotFound(self, name)
 
-    def add_subtraits(self, name: str, subtraits: list[str] | str) -> tuple[Trait, list[str]]:
+    def add_subtraits(self, name: str, subtraits: list[str] | str) -> tuple[TraitView, list[str]]:
         """Add subtraits to a trait.
         Args:
             name (str): The exact name of the trait to add to
@@ -502,7 +672,7 @@ class Character(Document, validate_assignment=True):
         Subtraits may not be added to innates. If this is a CofD character,
         attributes may not accept subtraits.
 
-        Returns: A copy of the trait with the subtraits added, and the set of
+        Returns: A read-only view of the trait with the subtraits added, and the set of
             the added subtraits.
         Raises: TraitNotFound if the character has no trait by that name."""
         trait_name = name.casefold()
@@ -513,24 +683,28 @@ class Character(Document, validate_assignment=True):
 
                 before = set(trait.subtraits)
                 trait.add_subtraits(subtraits)
+                self._invalidate_traits()
                 after = set(trait.subtraits)
                 delta = sorted(after.symmetric_difference(before))
 
-                return copy.deepcopy(trait), delta
+                return TraitView(trait), delta
 
         raise errors.TraitNotFound(self, name)
 
-    def remove_subtraits(self, name: str, subtraits: list[str] | str) -> tuple[Trait, list[str]]:
+    def remove_subtraits(
+        self, name: str, subtraits: list[str] | str
+    ) -> tuple[TraitView, list[str]]:
         """Remove subtraits from a trait."""
         trait_name = name.casefold()
         for trait in self.traits:
             if trait.name.casefold() == trait_name:
                 before = set(trait.subtraits)
                 trait.remove_subtraits(subtraits)
+                self._invalidate_traits()
                 after = set(trait.subtraits)
                 delta = sorted(after.symmetric_difference(before))
 
-                return copy.deepcopy(trait), delta
+                return TraitView(trait), delta
 
         raise errors.TraitNotFound(self, name)
 
@@ -597,8 +771,35 @@ class Character(Document, validate_assignment=True):
             [
                 ("guild", pymongo.ASCENDING),
                 ("user", pymongo.ASCENDING),
-            ]
+            ],
+            # Cache loads and premium purges query by user alone
+            [("user", pymongo.ASCENDING)],
         ]
         is_root = True
         use_state_management = True
         validate_on_save = True
+
+
+class CharacterSummary(BaseModel):
+    """Just enough of a character to list or choose it. Summaries are loaded
+    with a projection, so none of the character's traits, macros, or profile
+    are fetched or deserialized."""
+
+    id: PydanticObjectId = Field(alias="_id")
+    name: str
+    guild: int
+    line: GameLine
+    splat: Splat
+    user: int
+
+    @classmethod
+    def of(cls, character: Character) -> "CharacterSummary":
+        """Summarize an already-loaded character."""
+        return cls(
+            _id=character.id,
+            name=character.name,
+            guild=character.guild,
+            line=character.line,
+            splat=character.splat,
+            user=character.user,
+        )
@@ -1,17 +1,14 @@
 """Base WoD character attributes."""
 
 from enum import StrEnum
-from functools import partial
 from typing import ClassVar, Self
 
 from pydantic import BaseModel, Field, model_validator
 
-from botch.core.characters.base import Character, GameLine, Splat, Trait
+from botch.core.characters.base import Character, GameLine, Splat, Trait, TraitView
 from botch.errors import TraitAlreadyExists
 from botch.utils import max_vtr_vitae
 
-INNATE_FACTORY = partial(Trait, category=Trait.Category.INNATE, subcategory=Trait.Subcategory.BLANK)
-
 
 class CofD(Character):
     """Abstract class for CofD characters. Used primarily for inheritance tree
@@ -108,14 +105,13 @@ class Vampire(Mortal):
             self.max_vitae = max_vtr_vitae(self.blood_potency)
             self.vitae = min(self.vitae, self.max_vitae)
 
-    def _all_traits(self) -> list[Trait]:
-        """A copy of the vampire's traits, including innates."""
-        traits = super()._all_traits()
+    def _innate_ratings(self) -> list[tuple[str, int]]:
+        """The vampire's innate traits, including Blood Potency."""
         potency = [
-            INNATE_FACTORY(name="Blood Potency", rating=self.blood_potency),
-            INNATE_FACTORY(name="Potency", rating=self.blood_potency),
+            ("Blood Potency", self.blood_potency),
+            ("Potency", self.blood_potency),
         ]
-        return traits + potency
+        return super()._innate_ratings() + potency
 
 
 class Pillar(BaseModel):
@@ -194,7 +190,7 @@ class Mummy(Mortal):
         rating: int,
         category=Trait.Category.CUSTOM,
         subcategory=Trait.Subcategory.BLANK,
-    ) -> Trait:
+    ) -> TraitView:
         """Add a new trait.
         Args:
             name (str): The new Trait's name
@@ -203,7 +199,7 @@ class Mummy(Mortal):
 
         The Traits list is automatically kept sorted.
 
-        Returns a copy of the new Trait, if created.
+        Returns a read-only view of the new Trait, if created.
         Raises TraitAlreadyExists if a Trait by that name already exists.
         Raises TraitAlreadyExists if the Trait is a Pillar."""
         titled = name.title()
@@ -212,9 +208,9 @@ class Mummy(Mortal):
 
         return super().add_trait(name, rating, category, subcategory)
 
-    def _all_traits(self) -> list[Trait]:
-        traits = super()._all_traits()
-        pillars = [INNATE_FACTORY(name=p.name, rating=p.rating) for p in self.pillars]
-        sekhem = [INNATE_FACTORY(name="Sekhem", rating=self.sekhem)]
+    def _innate_ratings(self) -> list[tuple[str, int]]:
+        """The Mummy's innate traits, including Pillars and Sekhem."""
+        pillars = [(p.name, p.rating) for p in self.pillars]
+        sekhem = [("Sekhem", self.sekhem)]
 
-        return traits + pillars + sekhem
+        return super()._innate_ratings() + pillars + sekhem
@@ -1,6 +1,5 @@
 """Mortal character templates."""
 
-from copy import deepcopy
 from enum import StrEnum
 
 from pydantic import field_validator
@@ -48,10 +47,9 @@ class Mortal(WoD):
         """The character's traits, plus Virtues."""
         return self.traits + self.virtues
 
-    def _all_traits(self) -> list[Trait]:
-        """A copy of the character's rollable traits."""
-        traits = super()._all_traits()
-        return traits + deepcopy(self.virtues)
+    def _extra_traits(self) -> list[Trait]:
+        """The character's Virtues."""
+        return self.virtues
 
 
 class Ghoul(Mortal):
@@ -2,5 +2,7 @@
 
 from botch.core.rolls import parse
 from botch.core.rolls.roll import Roll, d10
+from botch.core.rolls.sink import roll_sink
+from botch.core.rolls.stats import RollStats
 
-__all__ = ("parse", "Roll", "d10")
+__all__ = ("parse", "Roll", "RollStats", "d10", "roll_sink")
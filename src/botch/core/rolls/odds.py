@@ -0,0 +1,313 @@
+"""Roll probabilities. WoD rolls and most CofD rolls have exact
+distributions; Blessed and Blighted actions are estimated by simulation.
+
+The rules themselves come from the roll module (wod_successes(),
+cofd_dice_count(), and keep_first()), so the odds can't drift from what
+Roll actually does."""
+
+from collections import Counter
+from functools import lru_cache
+from math import log
+from statistics import NormalDist
+
+import numpy as np
+from numpy.random import Generator
+from numpy.typing import NDArray
+from pydantic import BaseModel, ConfigDict
+
+from botch.config import ODDS_TRIALS
+from botch.core.characters import GameLine
+from botch.core.rolls import roll
+from botch.core.rolls.roll import (
+    COFD_TARGET,
+    EXCEPTIONAL,
+    cofd_dice_count,
+    keep_first,
+    wod_successes,
+)
+
+MAX_EXPLOSIONS = 60  # Per die; the chance of exceeding this is negligible
+NEGLIGIBLE = 1e-12
+MIN_EXPECTED = 5  # Chi-square bins expecting fewer observations are pooled
+
+
+class Odds(BaseModel):
+    """A roll's distribution of successes. Negative successes are botches."""
+
+    model_config = ConfigDict(frozen=True)
+
+    line: GameLine
+    distribution: dict[int, float]  # Successes -> probability
+    trials: int | None = None  # None if exact
+
+    @property
+    def exact(self) -> bool:
+        """Whether the distribution was computed rather than sampled."""
+        return self.trials is None
+
+    def at_least(self, successes: int) -> float:
+        """The chance of rolling at least this many successes."""
+        return sum(p for k, p in self.distribution.items() if k >= successes)
+
+    @property
+    def success(self) -> float:
+        """The chance of at least one success."""
+        return self.at_least(1)
+
+    @property
+    def botch(self) -> float:
+        """The chance of a botch."""
+        return sum(p for k, p in self.distribution.items() if k < 0)
+
+    @property
+    def failure(self) -> float:
+        """The chance of zero successes without botching."""
+        return self.distribution.get(0, 0.0)
+
+    @property
+    def exceptional(self) -> float:
+        """The chance of an exceptional success."""
+        return self.at_least(EXCEPTIONAL[self.line])
+
+    @property
+    def mean(self) -> float:
+        """The average number of successes."""
+        return sum(k * p for k, p in self.distribution.items())
+
+
+def odds(
+    line: GameLine,
+    num_dice: int,
+    target: int,
+    *,
+    specialty=False,
+    wp=False,
+    autos=0,
+    rote=False,
+    blessed=False,
+    blighted=False,
+) -> Odds:
+    """Get the odds for a roll. `target` is the difficulty for WoD rolls and
+    the "again" number for CofD. Results are cached, so don't modify them."""
+    if num_dice < 1:
+        raise ValueError("Odds require at least one die")
+
+    if line == GameLine.WOD:
+        # These don't exist in WoD; ignoring them keeps the cache small
+        rote = blessed = blighted = False
+    return _odds(line, num_dice, target, specialty, wp, autos, rote, blessed, blighted)
+
+
+@lru_cache(maxsize=1024)
+def _odds(
+    line: GameLine,
+    num_dice: int,
+    target: int,
+    specialty: bool,
+    wp: bool,
+    autos: int,
+    rote: bool,
+    blessed: bool,
+    blighted: bool,
+) -> Odds:
+    if line == GameLine.WOD:
+        pmf, offset = _wod_exact(num_dice, target, specialty, wp, autos)
+        return _make_odds(line, pmf, offset)
+
+    if blessed or blighted:
+        return sample(
+            line,
+            num_dice,
+            target,
+            ODDS_TRIALS,
+            specialty=specialty,
+            wp=wp,
+            autos=autos,
+            rote=rote,
+            blessed=blessed,
+            blighted=blighted,
+        )
+
+    dice_count = cofd_dice_count(num_dice, wp, specialty)
+    pmf = _cofd_die_pmf(target, rote)
+    pool = np.ones(1)
+    for _ in range(dice_count):
+        pool = np.convolve(pool, pmf)
+    return _make_odds(line, pool, autos)
+
+
+def sample(
+    line: GameLine,
+    num_dice: int,
+    target: int,
+    trials: int,
+    *,
+    specialty=False,
+    wp=False,
+    autos=0,
+    rote=False,
+    blessed=False,
+    blighted=False,
+    rng: Generator | None = None,
+) -> Odds:
+    """Estimate the odds by simulating `trials` rolls at once. Unlike odds(),
+    this is never cached. Uses the roll generator unless given another."""
+    if rng is None:
+        # Looked up now, not at import, so reseeding the roll module applies
+        rng = roll._rng
+
+    if line == GameLine.WOD:
+        dice = rng.integers(1, 11, (trials, num_dice), dtype=np.int8)
+        successes = wod_successes(
+            (dice >= target).sum(axis=1),
+            (dice == 10).sum(axis=1),
+            (dice == 1).sum(axis=1),
+            autos,
+            specialty,
+            wp,
+        )
+    else:
+        dice_count = cofd_dice_count(num_dice, wp, specialty)
+        counts = np.full(trials, dice_count)
+        successes, failures, length = _sample_cofd(counts, target, rng)
+
+        if blessed or blighted:
+            other, other_failures, other_length = _sample_cofd(counts, target, rng)
+            first = keep_first(successes, length, other, other_length, blessed)
+            successes = np.where(first, successes, other)
+            failures = np.where(first, failures, other_failures)
+
+        if rote:
+            successes = successes + _sample_cofd(failures, target, rng)[0]
+        successes = successes + autos
+
+    offset = int(successes.min())
+    pmf = np.bincount(successes - offset) / trials
+    return _make_odds(line, pmf, offset, trials)
+
+
+def chi_square(observed: Counter[int], expected: dict[int, float]) -> tuple[float, int]:
+    """Pearson's goodness-of-fit statistic for observed outcome counts against
+    expected probabilities. Outcomes expected too rarely to test on their own
+    are pooled, and observing an impossible outcome is an infinitely bad fit.
+
+    Returns the statistic and its degrees of freedom."""
+    if any(outcome not in expected for outcome in observed):
+        return float("inf"), 1
+
+    total = sum(observed.values())
+    bins: list[tuple[int, float]] = []
+    pooled_observed, pooled_expected = 0, 0.0
+
+    for outcome, p in sorted(expected.items()):
+        if p * total >= MIN_EXPECTED:
+            bins.append((observed[outcome], p * total))
+        else:
+            pooled_observed += observed[outcome]
+            pooled_expected += p * total
+
+    if pooled_expected >= MIN_EXPECTED or not bins:
+        bins.append((pooled_observed, pooled_expected))
+    elif pooled_expected > 0:
+        # Still too sparse, so fold it into the least likely bin
+        smallest = min(range(len(bins)), key=lambda i: bins[i][1])
+        n, e = bins[smallest]
+        bins[smallest] = (n + pooled_observed, e + pooled_expected)
+
+    statistic = sum((n - e) ** 2 / e for n, e in bins)
+    return statistic, max(len(bins) - 1, 1)
+
+
+def chi_square_critical(df: int, alpha=0.001) -> float:
+    """The chi-square statistic above which we reject a fit at the given
+    significance level, using the Wilson-Hilferty approximation."""
+    z = NormalDist().inv_cdf(1 - alpha)
+    return df * (1 - 2 / (9 * df) + z * (2 / (9 * df)) ** 0.5) ** 3
+
+
+def _make_odds(line: GameLine, pmf: NDArray[np.float64], offset: int, trials=None) -> Odds:
+    """Convert a probability array, whose first element is `offset`
+    successes, to Odds."""
+    distribution = {int(k) + offset: float(p) for k, p in enumerate(pmf) if p > NEGLIGIBLE}
+    return Odds(line=line, distribution=distribution, trials=trials)
+
+
+def _wod_exact(
+    num_dice: int,
+    difficulty: int,
+    specialty: bool,
+    wp: bool,
+    autos: int,
+) -> tuple[NDArray[np.float64], int]:
+    """Enumerate every combination of 1s, 10s, other successes, and other
+    failures, weighting each by its multinomial probability.
+
+    Returns the probability array and the successes of its first element."""
+    # Each die is a 1, a 10, another success, or another failure
+    faces = np.array([1, 1, 10 - difficulty, difficulty - 2]) / 10
+
+    counts = np.arange(num_dice + 1)
+    ones, tens, others = (a.ravel() for a in np.meshgrid(counts, counts, counts, indexing="ij"))
+    valid = ones + tens + others <= num_dice
+    ones, tens, others = ones[valid], tens[valid], others[valid]
+    failures = num_dice - ones - tens - others
+
+    log_factorial = np.concatenate(([0.0], np.cumsum(np.log(np.arange(1, num_dice + 1)))))
+    log_p = log_factorial[num_dice] - sum(log_factorial[c] for c in (ones, tens, others, failures))
+    for c, p in zip((ones, tens, others, failures), faces):
+        if p > 0:
+            log_p = log_p + c * log(p)
+        else:
+            # Impossible faces (e.g. other successes at difficulty 10)
+            log_p = np.where(c > 0, -np.inf, log_p)
+
+    successes = wod_successes(others + tens, tens, ones, autos, specialty, wp)
+    offset = int(successes.min())
+    pmf = np.bincount(successes - offset, weights=np.exp(log_p))
+    return pmf, offset
+
+
+def _cofd_die_pmf(again: int, rote: bool) -> NDArray[np.float64]:
+    """The distribution of successes from one CofD die and its explosions."""
+    explodes = max(11 - again, 0) / 10
+    succeeds = (11 - COFD_TARGET) / 10 - explodes  # Without exploding
+    fails = (COFD_TARGET - 1) / 10
+
+    # A die's chain of explosions ends in either a failure or a success
+    chain = explodes ** np.arange(MAX_EXPLOSIONS)
+    ends_failing = chain * fails
+    ends_succeeding = np.concatenate(([0.0], chain[:-1] * succeeds))
+
+    if not rote:
+        return ends_failing + ends_succeeding
+
+    # Rote re-rolls the failure that ended the chain, once
+    rerolled = np.convolve(ends_failing, ends_failing + ends_succeeding)[:MAX_EXPLOSIONS]
+    return rerolled + ends_succeeding
+
+
+def _sample_cofd(
+    counts: NDArray[np.int64],
+    again: int,
+    rng: Generator,
+) -> tuple[NDArray[np.int64], NDArray[np.int64], NDArray[np.int64]]:
+    """Roll `counts[i]` exploding dice for each trial i, in waves like
+    Roll._roll_cofd().
+
+    Returns each trial's successes, failed dice, and total dice rolled."""
+    successes = np.zeros(len(counts), dtype=np.int64)
+    failures = np.zeros(len(counts), dtype=np.int64)
+    length = np.zeros(len(counts), dtype=np.int64)
+
+    pending = counts
+    while pending.any():
+        width = int(pending.max())
+        dice = rng.integers(1, 11, (len(pending), width), dtype=np.int8)
+        rolled = np.arange(width) < pending[:, None]
+
+        successes += ((dice >= COFD_TARGET) & rolled).sum(axis=1)
+        failures += ((dice < COFD_TARGET) & rolled).sum(axis=1)
+        length += pending
+        pending = ((dice >= again) & rolled).sum(axis=1)
+
+    return successes, failures, length
@@ -2,13 +2,33 @@
 
 import ast
 import re
-from typing import cast
-
-from pyparsing import Combine, Opt, ParseException, Word, ZeroOrMore, nums, one_of
+from functools import lru_cache
+from typing import Iterable, cast
+
+from pyparsing import (
+    Combine,
+    Opt,
+    ParseException,
+    ParserElement,
+    Word,
+    ZeroOrMore,
+    nums,
+    one_of,
+)
 
 from botch import errors
 from botch.core.characters import Character
 from botch.core.utils.parsing import TRAIT
+from botch.utils import normalize_text
+
+ParserElement.enable_packrat()
+
+# The grammar is built once, at import
+_TRAIT_TOKEN = Combine(Opt(TRAIT) + ZeroOrMore("." + Opt(TRAIT)))
+_OPERAND = Word(nums) | _TRAIT_TOKEN
+POOL = _OPERAND + ZeroOrMore(one_of("+ -") + _OPERAND)
+
+_OPERATOR = re.compile(r"\s*([+-])\s*")
 
 
 class RollParser:
@@ -42,16 +62,7 @@ class RollParser:
     def tokenize(self) -> list[str | int]:
         """Validate the syntax and return the tokenized list."""
         try:
-            trait = Combine(Opt(TRAIT) + ZeroOrMore("." + Opt(TRAIT)))
-            operand = Word(nums) | trait
-
-            expr = operand + ZeroOrMore(one_of("+ -") + operand)
-
-            return [
-                int(token) if token.isdigit() else token
-                for token in expr.parse_string(self.raw_syntax, parse_all=True)
-            ]
-
+            return list(tokenize(normalize_text(self.raw_syntax)))
         except ParseException as err:
             raise errors.InvalidSyntax(f"Invalid syntax at column {err.loc}") from err
 
@@ -121,6 +132,58 @@ class RollParser:
             return True
 
 
+@lru_cache(maxsize=2048)
+def tokenize(syntax: str) -> tuple[str | int, ...]:
+    """Tokenize roll syntax. Successful parses are memoized, so the syntax
+    should be normalized first to maximize cache hits. Because the result is
+    shared between callers, it is returned as a tuple.
+
+    Raises ParseException if the syntax is invalid."""
+    return tuple(
+        int(token) if token.isdigit() else token
+        for token in POOL.parse_string(syntax, parse_all=True)
+    )
+
+
+def complete_pool(syntax: str, characters: Iterable[Character], limit=25) -> list[str]:
+    """Suggest completions for partially typed roll syntax: the syntax so
+    far, with its last operand completed from the characters' traits. For
+    instance, "Strength + bra" might become "Strength + Brawl" and
+    "Strength + Brawl.Throws".
+
+    Returns nothing if the syntax before the last operand is invalid, or if
+    the last operand isn't the start of a trait."""
+    *head, partial = _OPERATOR.split(normalize_text(syntax))
+    if head:
+        try:
+            # Everything but the trailing operator must already be valid
+            tokenize(" ".join(head[:-1]))
+        except ParseException:
+            return []
+
+    if not partial or partial.isdigit():
+        return []
+
+    completions: dict[str, None] = {}  # Ordered and deduplicated
+    if "wp".startswith(partial.casefold()):
+        completions["WP"] = None
+
+    for character in characters:
+        if "." in partial:
+            # Specialties may be abbreviated ("bra.th"), which the key index
+            # can't match, so expand them like a roll would
+            keys = [selection.key for selection in character.match_traits(partial)]
+        else:
+            keys = character.complete_trait(partial)
+        completions.update(dict.fromkeys(keys))
+
+    # A leading operator leaves an empty first element
+    prefix = " ".join(filter(None, head))
+    if prefix:
+        prefix += " "
+    return [prefix + completion for completion in list(completions)[:limit]]
+
+
 def evaluate(expr: str) -> int:
     """Safely evaluate a mathematical expression (+/- only)."""
 
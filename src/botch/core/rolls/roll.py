@@ -3,9 +3,12 @@
 import re
 from typing import TYPE_CHECKING, Optional, Self, TypeAlias, TypeVar, overload
 
+import numpy as np
+import pymongo
 from beanie import Document, Insert, before_event
 from beanie import Link as BeanieLink
 from numpy.random import default_rng
+from numpy.typing import NDArray
 from pydantic import Field
 
 from botch import errors
@@ -22,6 +25,12 @@ else:
 COFD_TARGET = 8
 _rng = default_rng()  # numpy's default RNG is PCG64 (superior to builtin)
 
+# The minimum successes for an exceptional result, per game line
+EXCEPTIONAL = {GameLine.WOD: 4, GameLine.COFD: 5}
+
+# Die counts, for one roll or for many at once
+Counts: TypeAlias = int | NDArray[np.int64]
+
 
 @overload
 def d10() -> int: ...
@@ -39,7 +48,75 @@ def d10(count: int | None = None) -> int | list[int]:
     """Roll many d10s."""
     if count is None:
         return int(_rng.integers(1, 11))
-    return list(map(int, _rng.integers(1, 11, count)))
+    return d10_array(count).tolist()
+
+
+def d10_array(count: int) -> NDArray[np.int64]:
+    """Roll many d10s, leaving them as a numpy array for batch operations."""
+    return _rng.integers(1, 11, count)
+
+
+def wod_successes(
+    hits: Counts,
+    tens: Counts,
+    ones: Counts,
+    autos: int,
+    specialty: bool,
+    wp: bool,
+) -> NDArray[np.int64]:
+    """Apply the WoD rules to die counts: dice at or above the difficulty
+    (`hits`), 10s, and 1s. The counts may be ints or numpy arrays holding
+    many rolls' counts, which lets the odds engine share these rules.
+
+    A negative result is a botch."""
+    # WoD rolls have successes canceled by 1s
+    successes = hits + autos
+    if specialty:
+        successes = successes + tens
+
+    # A botch occurs if successes == 0 and ones > 0. If ones simply outnumber
+    # successes, then we want to record 0 successes instead of slipping into
+    # negatives. A negative number indicates a botch. We record the magnitude
+    # of the botch for fun; RAW, a botch is a botch.
+    successes = np.where((successes > 0) & (ones > successes), 0, successes - ones)
+
+    if wp:
+        # WP creates an uncancelable success
+        successes = np.maximum(successes + 1, 1)
+
+    return successes
+
+
+def cofd_dice_count(num_dice: int, wp: bool, specialty: bool) -> int:
+    """The number of dice in a CofD pool, pre-explosions."""
+    dice_count = num_dice
+    if wp:
+        dice_count += 3
+    if specialty:
+        dice_count += 1
+
+    return dice_count
+
+
+def keep_first(
+    successes_1: Counts, len_1: Counts, successes_2: Counts, len_2: Counts, blessed: bool
+) -> NDArray[np.bool_]:
+    """Whether a Blessed/Blighted action keeps its first roll. Like
+    wod_successes(), this works on ints or numpy arrays."""
+    # If the rolls are equal, then the user gets to choose. There's no need
+    # to actually make them choose, however, as the user will always opt for
+    # the most advantageous pick.
+    #
+    # Normally, the choice is meaningless, as the rolls will typically have
+    # the same number of successes and failures. If one roll exploded and
+    # the other didn't, however, it benefits the user to keep that roll. This
+    # holds for both blessed and blighted rolls.
+    tie = successes_1 == successes_2
+    if blessed:
+        better = successes_1 > successes_2
+    else:
+        better = successes_1 < successes_2
+    return np.where(tie, len_1 > len_2, better)
 
 
 class Roll(Document):
@@ -108,31 +185,19 @@ class Roll(Document):
     def successes(self) -> int:
         """The number of successes rolled."""
         if self.line == GameLine.COFD:
-            return self._cofd_successes(self.dice) + self.autos
-
-        # WoD rolls have successes canceled by 1s
+            # CofD rolls can't botch, but we still store the count for stats
+            self.num_successes = self._cofd_successes(self.dice) + self.autos
+            self.botched = False
+            return self.num_successes
 
         # Yes, this isn't very efficient, but we're dealing with tiny amounts
         # of data, and this is more readable.
-        successes = sum(d >= self.target for d in self.dice) + self.autos
-        if self.specialties:
-            tens = sum(d == 10 for d in self.dice)
-            successes += tens
-
+        hits = sum(d >= self.target for d in self.dice)
+        tens = sum(d == 10 for d in self.dice)
         ones = sum(d == 1 for d in self.dice)
-        if successes > 0 and ones > successes:
-            # A botch occurs if successes == 0 and ones > 0. If ones simply
-            # outnumber successes, then we want to record 0 successes instead
-            # of slipping into negatives.
-            successes = 0
-        else:
-            # A negative number indicates a botch. We record the magnitude of
-            # the botch for fun; RAW, a botch is a botch.
-            successes -= ones
-
-        if self.wp:
-            # WP creates an uncancelable success
-            successes = max(successes + 1, 1)
+        successes = int(
+            wod_successes(hits, tens, ones, self.autos, bool(self.specialties), self.wp)
+        )
 
         # Computing successes as a stored property is surprisingly complex
         # and breaks many, many unit tests, so we store it in num_successes,
@@ -145,6 +210,11 @@ class Roll(Document):
         self.botched = successes < 0
         return successes
 
+    @property
+    def exceptional(self) -> bool:
+        """Whether the roll is an exceptional success (or better)."""
+        return self.successes >= EXCEPTIONAL[self.line]
+
     @property
     def success_str(self) -> str:
         """The success string, such as "Exceptional Success"."""
@@ -292,45 +362,44 @@ class Roll(Document):
         roll_2 = self._roll_cofd(dice_count)
         suxx_2 = self._cofd_successes(roll_2)
 
-        if suxx_1 == suxx_2:
-            # If the rolls are equal, then the user gets to choose.
-            # There's no need to actually make them choose, however,
-            # as the user will always opt for the most advantageous
-            # pick.
-            #
-            # Normally, the choice is meaningless, as the rolls will
-            # typically have the same number of successes and failures.
-            # If one roll exploded and the other didn't, however, it
-            # benefits the user to keep that roll. This holds for both
-            # blessed and blighted rolls.
-            dice = roll_1 if len(roll_1) > len(roll_2) else roll_2
-        elif self.blessed:
-            dice = roll_1 if suxx_1 > suxx_2 else roll_2
-        else:  # blighted
-            dice = roll_1 if suxx_1 < suxx_2 else roll_2
+        if keep_first(suxx_1, len(roll_1), suxx_2, len(roll_2), self.blessed):
+            dice = roll_1
+        else:
+            dice = roll_2
 
         return dice
 
     def _calculate_cofd_dice_count(self) -> int:
         """Calculate the actual number of dice being rolled, pre-explosions,
         for CofD rolls."""
-        dice_count = self.num_dice
-        if self.wp:
-            dice_count += 3
-        if self.specialties:
-            dice_count += 1
-
-        return dice_count
+        return cofd_dice_count(self.num_dice, self.wp, bool(self.specialties))
 
     def _roll_cofd(self, count: int) -> list[int]:
-        """Roll dice, exploding if they meet or exceed self.target."""
-        dice = []
-        for _ in range(count):
-            dice.append(d10())
-            while dice[-1] >= self.target:
-                dice.append(d10())
+        """Roll dice, exploding if they meet or exceed self.target.
 
-        return dice
+        Rather than rolling one die at a time, the dice are rolled in waves:
+        the first wave is the whole pool, and each subsequent wave holds one
+        new die for every die that exploded in the wave before it. Afterward,
+        each die's explosions are moved directly behind it, so the result reads
+        the same as if the dice had been rolled one by one."""
+        if count <= 0:
+            return []
+
+        waves = [d10_array(count)]
+        owners = [np.arange(count)]
+        exploded = waves[0] >= self.target
+
+        while exploded.any():
+            owners.append(owners[-1][exploded])
+            waves.append(d10_array(len(owners[-1])))
+            exploded = waves[-1] >= self.target
+
+        if len(waves) == 1:
+            return waves[0].tolist()
+
+        # A stable sort keeps each chain of explosions in the order rolled
+        order = np.argsort(np.concatenate(owners), kind="stable")
+        return np.concatenate(waves)[order].tolist()
 
     def add_specs(self, specs: list[str]):
         """Add a specialty."""
@@ -343,3 +412,13 @@ class Roll(Document):
 
     class Settings:
         name = "rolls"
+        indexes = [
+            # Serves the RollStats backfill's $match
+            [
+                ("guild", pymongo.ASCENDING),
+                ("user", pymongo.ASCENDING),
+                ("use_in_stats", pymongo.ASCENDING),
+                ("line", pymongo.ASCENDING),
+                ("num_successes", pymongo.ASCENDING),
+            ]
+        ]
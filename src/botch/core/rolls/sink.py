@@ -0,0 +1,39 @@
+"""Buffered roll storage."""
+
+from botch.config import ROLL_BATCH_INTERVAL, ROLL_BATCH_SIZE, ROLL_MAX_PENDING, ROLL_MAX_WAIT
+from botch.core.rolls.roll import Roll
+from botch.core.rolls.stats import RollStats
+from botch.core.utils.batch import BatchInserter
+
+
+class RollSink(BatchInserter[Roll]):
+    """Rolls are our highest-volume write, so rather than inserting each one
+    as it's made, we queue them and insert them in batches."""
+
+    def __init__(
+        self,
+        batch_size=ROLL_BATCH_SIZE,
+        interval=ROLL_BATCH_INTERVAL,
+        max_pending=ROLL_MAX_PENDING,
+        max_wait=ROLL_MAX_WAIT,
+    ):
+        super().__init__(Roll, batch_size, interval, max_pending, max_wait=max_wait)
+
+    def prepare(self, document: Roll):
+        # insert_many() skips the Insert event
+        document.reset_specialties()
+
+    async def inserted(self, batch: list[Roll]):
+        try:
+            await RollStats.record(batch)
+        except Exception as err:
+            # The rolls themselves are safe, so have the next fetch rebuild
+            # the counters from them
+            self.logger.error("Unable to update roll stats: %s", err)
+            try:
+                await RollStats.invalidate((roll.guild, roll.user) for roll in batch)
+            except Exception as err:
+                self.logger.error("Unable to invalidate roll stats: %s", err)
+
+
+roll_sink = RollSink()
@@ -0,0 +1,208 @@
+"""Precomputed roll statistics."""
+
+import asyncio
+from collections import defaultdict
+from typing import Iterable, Self
+
+import pymongo
+from beanie import Document, PydanticObjectId
+from pymongo.errors import DuplicateKeyError
+
+from botch.core.characters import GameLine
+from botch.core.rolls.roll import COFD_TARGET, EXCEPTIONAL, Roll
+
+
+class RollStats(Document):
+    """Per-(guild, user) roll counters. These are incremented as rolls are
+    inserted, so reading them never requires scanning the rolls collection.
+
+    Counters created by record() only cover rolls made since they were
+    created. The first fetch() rebuilds them from the rolls collection and
+    stores the highest roll id it counted as the watermark; record() skips
+    rolls at or below it, so a roll is never counted by both. Every write
+    bumps the version, and a rebuild only lands if nothing was recorded
+    while it ran. Roll ids are assigned when rolls are queued, so a roll
+    that's retried after a later one lands can slip under the watermark.
+
+    Rolls marked use_in_stats=False are excluded."""
+
+    guild: int
+    user: int
+    rolls: int = 0
+    successes: int = 0
+    botches: int = 0
+    exceptional: int = 0
+    backfilled: bool = False
+    watermark: PydanticObjectId | None = None
+    version: int = 0
+
+    @staticmethod
+    def _increments(roll: Roll) -> dict[str, int]:
+        successes = roll.successes
+        return {
+            "rolls": 1,
+            "successes": max(successes, 0),
+            "botches": int(successes < 0),
+            "exceptional": int(roll.exceptional),
+        }
+
+    @staticmethod
+    def _filter(pairs: Iterable[tuple[int, int]]) -> dict:
+        return {"$or": [{"guild": guild, "user": user} for guild, user in pairs]}
+
+    @classmethod
+    async def record(cls, rolls: Iterable[Roll]):
+        """Increment the counters for the given rolls, with one upsert per
+        (guild, user) in the batch rather than one per roll."""
+        grouped: defaultdict[tuple[int, int], list[Roll]] = defaultdict(list)
+        for roll in rolls:
+            if roll.use_in_stats:
+                grouped[(roll.guild, roll.user)].append(roll)
+
+        if not grouped:
+            return
+
+        cursor = cls.get_motor_collection().find(
+            cls._filter(grouped), {"guild": 1, "user": 1, "watermark": 1}
+        )
+        watermarks = {(doc["guild"], doc["user"]): doc.get("watermark") async for doc in cursor}
+        await asyncio.gather(
+            *(
+                cls._record_user(guild, user, batch, watermarks.get((guild, user)))
+                for (guild, user), batch in grouped.items()
+            )
+        )
+
+    @classmethod
+    async def _record_user(
+        cls,
+        guild: int,
+        user: int,
+        rolls: list[Roll],
+        watermark: PydanticObjectId | None,
+    ):
+        """Add the rolls above the watermark. The update is conditioned on
+        the watermark, so if a rebuild moves it first, we re-read and retry."""
+        collection = cls.get_motor_collection()
+        while True:
+            counters: defaultdict[str, int] = defaultdict(int)
+            for roll in rolls:
+                if watermark is None or roll.id is None or roll.id > watermark:
+                    for field, amount in cls._increments(roll).items():
+                        counters[field] += amount
+            if not counters:
+                return
+
+            try:
+                await collection.update_one(
+                    {"guild": guild, "user": user, "watermark": watermark},
+                    {
+                        "$inc": {**counters, "version": 1},
+                        "$setOnInsert": {"backfilled": False},
+                    },
+                    upsert=True,
+                )
+                return
+            except DuplicateKeyError:
+                # The document exists with a different watermark
+                doc = await collection.find_one({"guild": guild, "user": user})
+                watermark = doc.get("watermark") if doc else None
+
+    @classmethod
+    async def invalidate(cls, pairs: Iterable[tuple[int, int]]):
+        """Force a rebuild on the next fetch for each (guild, user)."""
+        pairs = set(pairs)
+        if pairs:
+            await cls.get_motor_collection().update_many(
+                cls._filter(pairs), {"$set": {"backfilled": False}}
+            )
+
+    @classmethod
+    async def _aggregate(cls, guild: int, user: int) -> tuple[dict, PydanticObjectId | None]:
+        """Count the user's rolls. CofD rolls made before num_successes was
+        stored for them have it as 0, so their successes are recounted from
+        the dice."""
+        cofd = {"$eq": ["$line", GameLine.COFD.value]}
+        hits = {"$filter": {"input": "$dice", "cond": {"$gte": ["$$this", COFD_TARGET]}}}
+        successes = {
+            "$cond": [
+                cofd,
+                {"$add": [{"$size": hits}, {"$ifNull": ["$autos", 0]}]},
+                "$num_successes",
+            ]
+        }
+        exceptional = {
+            "$cond": [
+                cofd,
+                {"$gte": ["$successes", EXCEPTIONAL[GameLine.COFD]]},
+                {"$gte": ["$successes", EXCEPTIONAL[GameLine.WOD]]},
+            ]
+        }
+        pipeline = [
+            {"$match": {"guild": guild, "user": user, "use_in_stats": True}},
+            {"$project": {"_id": 1, "line": 1, "successes": successes}},
+            {
+                "$group": {
+                    "_id": None,
+                    "rolls": {"$sum": 1},
+                    "successes": {"$sum": {"$max": ["$successes", 0]}},
+                    "botches": {"$sum": {"$cond": [{"$lt": ["$successes", 0]}, 1, 0]}},
+                    "exceptional": {"$sum": {"$cond": [exceptional, 1, 0]}},
+                    "watermark": {"$max": "$_id"},
+                }
+            },
+        ]
+        results = await Roll.get_motor_collection().aggregate(pipeline).to_list(length=1)
+        counters = {"rolls": 0, "successes": 0, "botches": 0, "exceptional": 0}
+        if not results:
+            return counters, None
+        return {key: results[0][key] for key in counters}, results[0]["watermark"]
+
+    @classmethod
+    async def rebuild(cls, guild: int, user: int) -> Self:
+        """Recompute the user's counters from the rolls collection. If rolls
+        are recorded while the aggregation runs, it's discarded and re-run."""
+        collection = cls.get_motor_collection()
+        key = {"guild": guild, "user": user}
+        while True:
+            doc = await collection.find_one(key)
+            if doc is not None and doc.get("backfilled"):
+                # A concurrent rebuild beat us to it
+                return cls.model_validate(doc)
+
+            counters, watermark = await cls._aggregate(guild, user)
+            fields = {**counters, "watermark": watermark, "backfilled": True}
+            if doc is None:
+                try:
+                    await collection.insert_one({**key, **fields, "version": 1})
+                except DuplicateKeyError:
+                    continue
+                version = 1
+            else:
+                version = doc.get("version", 0)
+                result = await collection.update_one(
+                    {**key, "version": doc.get("version")},
+                    {"$set": fields, "$inc": {"version": 1}},
+                )
+                if not result.matched_count:
+                    continue
+                version += 1
+
+            return cls(**key, **fields, version=version)
+
+    @classmethod
+    async def fetch(cls, guild: int, user: int) -> Self:
+        """Get the user's counters, backfilling them if necessary."""
+        stats = await cls.find_one(cls.guild == guild, cls.user == user)
+        if stats is None or not stats.backfilled:
+            return await cls.rebuild(guild, user)
+        return stats
+
+    class Settings:
+        name = "roll_stats"
+        indexes = [
+            pymongo.IndexModel(
+                [("guild", pymongo.ASCENDING), ("user", pymongo.ASCENDING)],
+                unique=True,
+            )
+        ]
@@ -1,5 +1,5 @@
 """Core utils."""
 
-from botch.core.utils import parsing
+from botch.core.utils import batch, parsing, prefix, ratelimit
 
-__all__ = ("parsing",)
+__all__ = ("batch", "parsing", "prefix", "ratelimit")
@@ -0,0 +1,203 @@
+"""Buffered bulk insertion of documents."""
+
+import asyncio
+import logging
+from collections import deque
+from typing import Generic, TypeVar
+
+from beanie import Document, PydanticObjectId
+from pydantic import BaseModel
+from pymongo.errors import BulkWriteError
+
+D = TypeVar("D", bound=Document)
+
+DUPLICATE_KEY = 11000  # MongoDB's error code
+
+
+class SinkStats(BaseModel):
+    """Batch inserter counters."""
+
+    queued: int = 0
+    inserted: int = 0
+    batches: int = 0
+    failures: int = 0  # Batches that failed, in whole or part, and were re-queued
+    dropped: int = 0  # Documents discarded because the queue was full
+    stalls: int = 0  # Times a caller had to wait for room
+
+
+class BatchInserter(Generic[D]):
+    """Queues documents and writes them with insert_many(), either once
+    `batch_size` documents are waiting or `interval` seconds after the first
+    one arrives, whichever comes first.
+
+    At most `max_pending` documents are held. When the queue is full, put()
+    either waits up to `max_wait` seconds for a flush to make room
+    (backpressure), dropping the new document if none comes, or, if
+    `drop_oldest` is set, discards the oldest queued document. In the latter
+    mode, put() never suspends the caller; inserts always happen in
+    background tasks. Call close() on shutdown to write everything still
+    pending.
+
+    Documents are given ids when queued, and batches are inserted unordered,
+    so only the documents that failed are retried. A retry that finds a
+    document already inserted counts it as inserted rather than writing a
+    duplicate.
+
+    insert_many() bypasses Beanie's event hooks, so subclasses that rely on
+    them should apply them in prepare()."""
+
+    def __init__(
+        self,
+        model: type[D],
+        batch_size: int,
+        interval: float,
+        max_pending: int,
+        drop_oldest=False,
+        max_wait: float = 5,
+    ):
+        self.model = model
+        self.batch_size = batch_size
+        self.interval = interval
+        self.max_pending = max(max_pending, batch_size)
+        self.drop_oldest = drop_oldest
+        self.max_wait = max_wait
+
+        self._queue: deque[D] = deque()
+        self._lock = asyncio.Lock()
+        self._timer: asyncio.Task | None = None
+        self._flushing: asyncio.Task | None = None
+        self.stats = SinkStats()
+        self.logger = logging.getLogger(f"{model.__name__.upper()} SINK")
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    @property
+    def depth(self) -> int:
+        """The number of documents waiting to be inserted."""
+        return len(self._queue)
+
+    def prepare(self, document: D):
+        """Called on each document before it's queued."""
+
+    async def inserted(self, batch: list[D]):
+        """Called after each batch is successfully inserted."""
+
+    async def put(self, document: D):
+        """Queue a document for insertion."""
+        if len(self._queue) >= self.max_pending:
+            if self.drop_oldest:
+                self._queue.popleft()
+                self.stats.dropped += 1
+                if self.stats.dropped % 100 == 1:
+                    self.logger.warning(
+                        "Queue full (depth %s); %s dropped so far",
+                        self.depth,
+                        self.stats.dropped,
+                    )
+            else:
+                self.stats.stalls += 1
+                try:
+                    async with asyncio.timeout(self.max_wait):
+                        await self._wait_for_room()
+                except TimeoutError:
+                    # Better to lose the document than to hang the caller
+                    self.stats.dropped += 1
+                    self.logger.warning(
+                        "Queue still full after %ss (depth %s); %s dropped so far",
+                        self.max_wait,
+                        self.depth,
+                        self.stats.dropped,
+                    )
+                    return
+
+        if document.id is None:
+            # A known id lets a retry recognize a document that already landed
+            document.id = PydanticObjectId()
+        self.prepare(document)
+        self._queue.append(document)
+        self.stats.queued += 1
+
+        if len(self._queue) >= self.batch_size:
+            if self._flushing is None or self._flushing.done():
+                self._flushing = asyncio.create_task(self.flush())
+        elif self._timer is None or self._timer.done():
+            self._timer = asyncio.create_task(self._flush_later())
+
+    async def _wait_for_room(self):
+        """Flush until the queue has room. The flush is shielded, so a caller
+        that gives up can't interrupt a batch mid-insert."""
+        while len(self._queue) >= self.max_pending:
+            if self._flushing is None or self._flushing.done():
+                self._flushing = asyncio.create_task(self.flush())
+            await asyncio.shield(self._flushing)
+            if len(self._queue) >= self.max_pending:
+                # The database is struggling; don't hammer it
+                await asyncio.sleep(self.interval)
+
+    def _trim(self):
+        """Drop the oldest documents until the queue fits."""
+        while len(self._queue) > self.max_pending:
+            self._queue.popleft()
+            self.stats.dropped += 1
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.interval)
+        self._timer = None
+        await self.flush()
+
+    async def flush(self):
+        """Insert everything currently queued, one batch at a time."""
+        async with self._lock:
+            while self._queue:
+                count = min(self.batch_size, len(self._queue))
+                batch = [self._queue.popleft() for _ in range(count)]
+                try:
+                    await self.model.insert_many(batch, ordered=False)
+                    landed, failed = batch, []
+                except BulkWriteError as err:
+                    landed, failed = self._partition(batch, err)
+                    self.logger.error("Unable to insert %s documents: %s", len(failed), err)
+                except Exception as err:
+                    landed, failed = [], batch
+                    self.logger.error("Unable to insert %s documents: %s", count, err)
+
+                if failed:
+                    # Put the failures back at the front so order is
+                    # preserved; the next flush will try again.
+                    self.stats.failures += 1
+                    self._queue.extendleft(reversed(failed))
+                    if self.drop_oldest:
+                        self._trim()
+                    if self._timer is None or self._timer.done():
+                        self._timer = asyncio.create_task(self._flush_later())
+
+                if landed:
+                    self.stats.inserted += len(landed)
+                    self.stats.batches += 1
+                    self.logger.debug("Inserted %s (depth %s)", len(landed), self.depth)
+                    await self.inserted(landed)
+
+                if failed:
+                    return
+
+    @staticmethod
+    def _partition(batch: list[D], err: BulkWriteError) -> tuple[list[D], list[D]]:
+        """Split a batch into the documents that are in the database and
+        those that need to be retried. Duplicate keys mean an earlier attempt
+        inserted the document, so it counts as landed."""
+        failed = {
+            error["index"]
+            for error in err.details.get("writeErrors", [])
+            if error.get("code") != DUPLICATE_KEY
+        }
+        landed = [doc for i, doc in enumerate(batch) if i not in failed]
+        return landed, [doc for i, doc in enumerate(batch) if i in failed]
+
+    async def close(self):
+        """Cancel the timer and write everything still pending."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self.logger.info("Flushing %s queued document(s)", len(self._queue))
+        await self.flush()
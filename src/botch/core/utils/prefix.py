@@ -0,0 +1,141 @@
+"""Case-insensitive prefix search."""
+
+from bisect import bisect_left, insort
+from typing import Generic, Iterable, TypeVar
+
+T = TypeVar("T")
+
+
+class PrefixIndex(Generic[T]):
+    """An immutable, sorted-array index for finding values by the casefolded
+    prefix of their key. Lookups are O(log n + k), where k is the number of
+    matches. Values sharing a key are returned in insertion order."""
+
+    def __init__(self, entries: Iterable[tuple[str, T]]):
+        folded = sorted(
+            ((key.casefold(), i, value) for i, (key, value) in enumerate(entries)),
+            key=lambda e: (e[0], e[1]),
+        )
+        self._keys = [key for key, _, _ in folded]
+        self._values = [value for _, _, value in folded]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def search(self, prefix: str) -> list[T]:
+        """All values whose keys start with the prefix, ordered by key."""
+        prefix = prefix.casefold()
+        start = bisect_left(self._keys, prefix)
+
+        end = start
+        while end < len(self._keys) and self._keys[end].startswith(prefix):
+            end += 1
+
+        return self._values[start:end]
+
+
+class NameIndex:
+    """A mutable index of names for ranked autocomplete. Matches are ranked:
+
+    1. Names starting with the query
+    2. Names with a later word starting with the query
+    3. Names containing the query's characters in order (fuzzy)
+
+    Names are kept in sorted arrays of casefolded keys, one for whole names
+    and one for each later word, so add() and remove() update the index in
+    place and the first two tiers are binary searches. Only the fuzzy tier
+    scans, and only when the others don't fill the limit."""
+
+    def __init__(self, names: Iterable[str] = ()):
+        self._names: list[tuple[str, str]] = []  # (Folded name, name)
+        self._words: list[tuple[str, str]] = []  # (Folded word onward, name)
+        for name in names:
+            self.add(name)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, name: str) -> bool:
+        entry = (name.casefold(), name)
+        i = bisect_left(self._names, entry)
+        return i < len(self._names) and self._names[i] == entry
+
+    @staticmethod
+    def _word_keys(name: str) -> list[str]:
+        """The casefolded name from the start of each word after the first."""
+        folded = name.casefold()
+        return [folded[i + 1 :] for i, c in enumerate(folded) if c == " " and folded[i + 1 :]]
+
+    def add(self, name: str):
+        """Add a name."""
+        insort(self._names, (name.casefold(), name))
+        for key in self._word_keys(name):
+            insort(self._words, (key, name))
+
+    def remove(self, name: str):
+        """Remove a name. Does nothing if it isn't present."""
+        for entries, key in [(self._names, name.casefold())] + [
+            (self._words, key) for key in self._word_keys(name)
+        ]:
+            i = bisect_left(entries, (key, name))
+            if i < len(entries) and entries[i] == (key, name):
+                del entries[i]
+
+    @staticmethod
+    def _prefixed(entries: list[tuple[str, str]], prefix: str) -> list[str]:
+        start = bisect_left(entries, (prefix, ""))
+        matches = []
+        for key, name in entries[start:]:
+            if not key.startswith(prefix):
+                break
+            matches.append(name)
+        return matches
+
+    def ranked(self, query: str, limit: int) -> list[tuple[tuple[int, int, str], str]]:
+        """Up to `limit` matches, each with a sort key for merging the results
+        of several indexes."""
+        query = query.casefold()
+        matched: dict[str, tuple[int, int, str]] = {}
+
+        for tier, entries in enumerate((self._names, self._words)):
+            for name in self._prefixed(entries, query):
+                if len(matched) >= limit:
+                    break
+                matched.setdefault(name, (tier, 0, name.casefold()))
+
+        if len(matched) < limit and query:
+            fuzzy = []
+            for folded, name in self._names:
+                if name not in matched and (span := _subsequence_span(query, folded)):
+                    # Tighter matches rank higher
+                    fuzzy.append(((2, span, folded), name))
+            fuzzy.sort()
+            matched.update((name, key) for key, name in fuzzy[: limit - len(matched)])
+
+        return sorted(((key, name) for name, key in matched.items()))
+
+    def search(self, query: str, limit=25) -> list[str]:
+        """Up to `limit` names matching the query, best first."""
+        return [name for _, name in self.ranked(query, limit)]
+
+
+def search_names(indexes: Iterable[NameIndex], query: str, limit=25) -> list[str]:
+    """Search several indexes at once, ranking their matches together."""
+    ranked = [match for index in indexes for match in index.ranked(query, limit)]
+    return [name for _, name in sorted(ranked)[:limit]]
+
+
+def _subsequence_span(query: str, text: str) -> int:
+    """The length of the span of `text`, matched greedily from the first
+    occurrence of the query's first character, that contains the query's
+    characters in order. 0 if there's no such span."""
+    start = text.find(query[0])
+    if start < 0:
+        return 0
+
+    position = start
+    for c in query[1:]:
+        position = text.find(c, position + 1)
+        if position < 0:
+            return 0
+    return position - start + 1
@@ -0,0 +1,31 @@
+"""Rate limiting."""
+
+import asyncio
+from time import monotonic
+
+
+class TokenBucket:
+    """Limits an operation to `rate` calls per second on average, while
+    allowing bursts of up to `capacity` calls. Callers await acquire() before
+    each call; waiters are served in order."""
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self.tokens = self.capacity
+        self.updated = monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        """Wait for and consume a token."""
+        async with self._lock:
+            self._refill()
+            while self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1
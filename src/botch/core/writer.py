@@ -0,0 +1,143 @@
+"""Write-behind character saves."""
+
+import asyncio
+import logging
+
+from beanie import PydanticObjectId
+
+from botch.config import CHAR_SAVE_DELAY
+from botch.core.characters import Character
+
+MAX_ATTEMPTS = 5  # Failed saves before a character's changes are abandoned
+
+
+class CharacterWriter:
+    """Coalesces character saves. Handlers that modify a character many times
+    in quick succession (e.g. a user mashing the health adjuster) schedule()
+    the character instead of saving it. After a short delay, every scheduled
+    character is written once, with only its changed fields.
+
+    Because characters are served from the cache, reads always see the latest
+    in-memory state; only the database lags, by at most the delay. Call
+    close() on shutdown to write anything still pending.
+
+    Failed saves are retried on the next flush, up to MAX_ATTEMPTS times.
+    Characters passed to forget() are never written again, so a late save
+    can't resurrect a deleted character."""
+
+    def __init__(self, delay: float = CHAR_SAVE_DELAY):
+        self.delay = delay
+        self._dirty: dict[int, Character] = {}
+        self._timer: asyncio.Task | None = None
+        self._writing: dict[int, asyncio.Task] = {}
+        self._attempts: dict[int, int] = {}
+        self._deleted: set[PydanticObjectId] = set()
+        self.writes = 0
+        self.coalesced = 0
+        self.logger = logging.getLogger("CHAR WRITER")
+
+    def __len__(self) -> int:
+        return len(self._dirty)
+
+    def __contains__(self, character: Character) -> bool:
+        return id(character) in self._dirty
+
+    def schedule(self, character: Character):
+        """Mark the character dirty. It will be saved after the delay."""
+        if character.id in self._deleted:
+            return
+        if id(character) in self._dirty:
+            self.coalesced += 1
+        else:
+            self._dirty[id(character)] = character
+
+        if self._timer is None or self._timer.done():
+            self._timer = asyncio.create_task(self._flush_later())
+
+    def discard(self, character: Character):
+        """Drop any pending save, e.g. because the character is about to be
+        saved in full."""
+        self._dirty.pop(id(character), None)
+        self._attempts.pop(id(character), None)
+
+    async def forget(self, character: Character):
+        """Stop writing the character for good, because it's being deleted.
+        Waits for any save already in progress, so it can't land after the
+        deletion."""
+        self.discard(character)
+        if character.id is not None:
+            self._deleted.add(character.id)
+        if task := self._writing.get(id(character)):
+            await asyncio.wait([task])
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.delay)
+        self._timer = None
+        await self.flush()
+
+    async def flush(self):
+        """Save every pending character now."""
+        pending = list(self._dirty.values())
+        self._dirty.clear()
+        if not pending:
+            return
+
+        self.logger.debug("Flushing %s character(s)", len(pending))
+        tasks = [asyncio.create_task(self._write(character)) for character in pending]
+        for character, task in zip(pending, tasks):
+            self._writing[id(character)] = task
+        try:
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            for character in pending:
+                self._writing.pop(id(character), None)
+
+        for character, result in zip(pending, results):
+            if not isinstance(result, Exception):
+                self._attempts.pop(id(character), None)
+                continue
+
+            attempts = self._attempts.get(id(character), 0) + 1
+            if attempts >= MAX_ATTEMPTS:
+                self.logger.error(
+                    "Unable to save %s after %s attempts; giving up: %s",
+                    character.name,
+                    attempts,
+                    result,
+                )
+                self._attempts.pop(id(character), None)
+            else:
+                # Keep it around so the next flush can try again
+                self.logger.error("Unable to save %s: %s", character.name, result)
+                self._attempts[id(character)] = attempts
+                self.schedule(character)
+
+    async def _write(self, character: Character):
+        if character.id in self._deleted:
+            return
+        self.writes += 1
+        if character.id is None or character.get_saved_state() is None:
+            # Without a saved state, there's nothing to diff against
+            await character.save()
+        else:
+            await character.save_changes()
+
+    def reset(self):
+        """Drop all pending and in-progress state without writing it."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._dirty.clear()
+        self._writing.clear()
+        self._attempts.clear()
+        self._deleted.clear()
+
+    async def close(self):
+        """Cancel the timer and write everything still pending."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        await self.flush()
+
+
+writer = CharacterWriter()
@@ -8,7 +8,7 @@ from dotenv import load_dotenv
 from motor.motor_asyncio import AsyncIOMotorClient
 
 from botch.core.characters import Character, cofd, wod
-from botch.core.rolls import Roll
+from botch.core.rolls import Roll, RollStats
 from botch.interface.models import CommandRecord
 from botch.models import Guild, User
 
@@ -24,6 +24,7 @@ DOCUMENT_MODELS: list[type[Document]] = [
     cofd.Vampire,
     cofd.Mortal,
     Roll,
+    RollStats,
     Guild,
     User,
     CommandRecord,
@@ -36,4 +37,23 @@ async def init():
 
     client = AsyncIOMotorClient(os.environ["MONGO_URL"])
     db = client[os.environ["MONGO_DB"]]
+    await dedupe_users(db)
     await init_beanie(database=db, document_models=DOCUMENT_MODELS)
+
+
+async def dedupe_users(db):
+    """Remove duplicate user records so the unique index on `user` can be
+    built. Concurrent first fetches used to save a record each. The oldest
+    is kept, as it's the one find_one() returned."""
+    pipeline = [
+        {"$sort": {"_id": 1}},
+        {"$group": {"_id": "$user", "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+        {"$match": {"count": {"$gt": 1}}},
+    ]
+    duplicates = []
+    async for group in db[User.Settings.name].aggregate(pipeline):
+        duplicates.extend(group["ids"][1:])
+
+    if duplicates:
+        logger.warning("Removing %s duplicate user records", len(duplicates))
+        await db[User.Settings.name].delete_many({"_id": {"$in": duplicates}})
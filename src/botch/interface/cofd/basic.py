@@ -20,7 +20,7 @@ class BasicCog(BotchCog, name="Basic"):
         self.docs_url = f"{DOCS_URL}/reference/rolls"
 
     @slash_command()
-    @option("pool", description="The dice pool. May be a number or trait + attribute equation")
+    @options.pool("The dice pool. May be a number or trait + attribute equation")
     @option(
         "use_wp",
         description="Use WP on the roll. Can also add + WP to your pool",
@@ -85,6 +85,48 @@ class BasicCog(BotchCog, name="Basic"):
             owner=owner,
         )
 
+    @slash_command()
+    @option(
+        "dice",
+        description="The number of dice",
+        min_value=1,
+        max_value=botchcord.odds.MAX_DICE,
+    )
+    @option("use_wp", description="Use WP on the roll", default=False)
+    @option("again", description="The number at which dice explode", choices=[10, 9, 8], default=10)
+    @option("rote", description="Whether to apply the Rote quality", default=False)
+    @option(
+        "advanced",
+        description="Whether it is a Blessed or Blighted Action",
+        choices=["Blessed", "Blighted"],
+        required=False,
+    )
+    @option("specialty", description="Whether a specialty applies", default=False)
+    @option("autos", description="Add automatic successes", choices=list(range(11)), default=0)
+    async def odds(
+        self,
+        ctx: AppCtx,
+        dice: int,
+        use_wp: bool,
+        again: int,
+        rote: bool,
+        advanced: str,
+        specialty: bool,
+        autos: int,
+    ):
+        """What are your chances? Shows the odds of success for a roll."""
+        await botchcord.odds.show_odds(
+            ctx,
+            dice,
+            again,
+            specialty,
+            use_wp,
+            autos,
+            rote=rote,
+            blessed=advanced == "Blessed",
+            blighted=advanced == "Blighted",
+        )
+
     @slash_command()
     async def chance(self, ctx: AppCtx):
         """Roll a chance die."""
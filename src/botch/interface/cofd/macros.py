@@ -34,7 +34,7 @@ class MacrosCog(BotchCog, name="Macros"):
 
     @macro.command(name="create")
     @option("name", description="The new macro's name")
-    @option("pool", description="The dice pool for the macro to use")
+    @options.pool("The dice pool for the macro to use")
     @option("again", description="The number to explode at", choices=[10, 9, 8], default=10)
     @option("rote", description="Whether to always apply the Rote quality", default=False)
     @option(
@@ -1,3 +1,3 @@
-from botch.interface.models.commandrecord import CommandRecord
+from botch.interface.models.commandrecord import CommandRecord, command_sink
 
-__all__ = ("CommandRecord",)
+__all__ = ("CommandRecord", "command_sink")
@@ -7,6 +7,9 @@ from beanie import Document
 from discord import ApplicationContext
 from pydantic import Field
 
+from botch.config import COMMAND_LOG_BATCH_SIZE, COMMAND_LOG_INTERVAL, COMMAND_LOG_MAX_PENDING
+from botch.core.utils.batch import BatchInserter
+
 
 class CommandRecord(Document):
     """A database record for a user slash command. This is essentially the same
@@ -35,3 +38,20 @@ class CommandRecord(Document):
 
     class Settings:
         name = "command_log"
+
+
+class CommandSink(BatchInserter[CommandRecord]):
+    """Command records are nice to have, but they should never slow down or
+    compete with a command, so they're inserted in large, infrequent batches.
+    If the database can't keep up, the oldest records are dropped."""
+
+    def __init__(
+        self,
+        batch_size=COMMAND_LOG_BATCH_SIZE,
+        interval=COMMAND_LOG_INTERVAL,
+        max_pending=COMMAND_LOG_MAX_PENDING,
+    ):
+        super().__init__(CommandRecord, batch_size, interval, max_pending, drop_oldest=True)
+
+
+command_sink = CommandSink()
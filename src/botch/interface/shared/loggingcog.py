@@ -7,7 +7,7 @@ from discord.ext import commands
 
 from botch.bot import BotchBot
 from botch.interface import BotchCog
-from botch.interface.models import CommandRecord
+from botch.interface.models import CommandRecord, command_sink
 
 
 class LoggingCog(BotchCog):
@@ -47,8 +47,8 @@ class LoggingCog(BotchCog):
             ", ".join(options),
         )
 
-        record = CommandRecord.from_context(ctx)
-        await record.save()
+        # Never waits; the record is inserted later in a batch
+        await command_sink.put(CommandRecord.from_context(ctx))
 
 
 def setup(bot: BotchBot):
@@ -8,7 +8,7 @@ from botch import botchcord
 from botch.bot import AppCtx, BotchBot
 from botch.botchcord import options
 from botch.config import DOCS_URL
-from botch.core.rolls import Roll
+from botch.core.rolls import RollStats
 from botch.interface import BotchCog
 
 
@@ -21,7 +21,7 @@ class BasicCog(BotchCog, name="Basic"):
         self.docs_url = f"{DOCS_URL}/reference/rolls"
 
     @slash_command()
-    @option("pool", description="The dice pool. May be a number or trait + attribute equation")
+    @options.pool("The dice pool. May be a number or trait + attribute equation")
     @options.promoted_choice("difficulty", "The roll's difficulty", start=2, end=10, first=6)
     @option(
         "use_wp",
@@ -68,11 +68,34 @@ class BasicCog(BotchCog, name="Basic"):
             owner=owner,
         )
 
+    @slash_command()
+    @option(
+        "dice",
+        description="The number of dice",
+        min_value=1,
+        max_value=botchcord.odds.MAX_DICE,
+    )
+    @options.promoted_choice("difficulty", "The roll's difficulty", start=2, end=10, first=6)
+    @option("use_wp", description="Use WP on the roll", default=False)
+    @option("specialty", description="Whether a specialty applies", default=False)
+    @option("autos", description="Add automatic successes", choices=list(range(11)), default=0)
+    async def odds(
+        self,
+        ctx: AppCtx,
+        dice: int,
+        difficulty: int,
+        use_wp: bool,
+        specialty: bool,
+        autos: int,
+    ):
+        """What are your chances? Shows the odds of success and botching for a roll."""
+        await botchcord.odds.show_odds(ctx, dice, difficulty, specialty, use_wp, autos)
+
     @slash_command(contexts={InteractionContextType.guild})
     async def botches(self, ctx: AppCtx):
         """How many botches have you rolled?"""
-        rolls = await Roll.find(dict(guild=ctx.guild.id, user=ctx.user.id, botched=True)).to_list()
-        count = len(rolls)
+        stats = await RollStats.fetch(ctx.guild.id, ctx.user.id)
+        count = stats.botches
 
         if count == 1:
             await ctx.respond(f"You've got **{count}** botch on this server 😆")
@@ -33,7 +33,7 @@ class MacrosCog(BotchCog, name="Macros"):
 
     @macro.command(name="create")
     @option("name", description="The new macro's name")
-    @option("pool", description="The dice pool for the macro to use")
+    @options.pool("The dice pool for the macro to use")
     @options.promoted_choice(
         "difficulty", "The macro's default difficulty", start=2, end=10, first=6
     )
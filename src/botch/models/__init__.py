@@ -1,6 +1,7 @@
 """Discord models."""
 
 from botch.models.guild import Guild, GuildCache
+from botch.models.settings import SettingsCache
 from botch.models.user import User, UserStore
 
-__all__ = ("Guild", "GuildCache", "User", "UserStore")
+__all__ = ("Guild", "GuildCache", "SettingsCache", "User", "UserStore")
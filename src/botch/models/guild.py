@@ -6,7 +6,11 @@ from typing import Annotated, Literal, Optional, overload
 
 import discord
 from beanie import Document, Indexed
+from beanie.exceptions import RevisionIdWasChanged
+from beanie.operators import In
+from cachetools import TTLCache
 from pydantic import BaseModel, Field
+from pymongo.errors import DuplicateKeyError
 
 
 class GuildSettings(BaseModel):
@@ -45,10 +49,12 @@ class Guild(Document):
 
 
 class GuildCache:
-    """A cache that manages Guilds."""
+    """A cache that manages Guilds. Guilds without a record are remembered
+    for `miss_ttl` seconds, so repeated lookups don't each hit the database."""
 
-    def __init__(self):
+    def __init__(self, miss_ttl=600):
         self._cache: dict[int, Guild] = {}
+        self._missing: TTLCache[int, bool] = TTLCache(maxsize=10_000, ttl=miss_ttl)
         self.logger = logging.getLogger("GUILD CACHE")
 
     async def _create(self, discord_guild: discord.Guild) -> Guild:
@@ -59,14 +65,47 @@ class GuildCache:
             discord_guild.id,
         )
         guild = Guild(guild=discord_guild.id, name=discord_guild.name)
-        await guild.save()
+        try:
+            await guild.save()
+        except (DuplicateKeyError, RevisionIdWasChanged):
+            # Created since we cached the miss; use that record instead.
+            # (Beanie's save() reports the duplicate key as a revision change.)
+            existing = await Guild.find_one(Guild.guild == discord_guild.id)
+            if existing is None:
+                raise
+            guild = existing
 
         self._cache[guild.guild] = guild
+        self._missing.pop(guild.guild, None)
         return guild
 
     def clear(self):
         """Reset the cache."""
         self._cache = {}
+        self._missing.clear()
+
+    async def warm(self, discord_guilds: list[discord.Guild]) -> int:
+        """Load the records for all the given guilds in a single query.
+        Guilds without a record are cached as missing.
+
+        Returns the number of records loaded."""
+        ids = [g.id for g in discord_guilds if g.id not in self._cache]
+        if not ids:
+            return 0
+
+        guilds = await Guild.find(In(Guild.guild, ids)).to_list()
+        for guild in guilds:
+            self._cache[guild.guild] = guild
+
+        found = {guild.guild for guild in guilds}
+        for guild_id in ids:
+            if guild_id not in found:
+                self._missing[guild_id] = True
+
+        self.logger.info(
+            "Warmed %s guild(s); %s without records", len(guilds), len(ids) - len(guilds)
+        )
+        return len(guilds)
 
     @overload
     async def fetch(self, discord_guild: discord.Guild) -> Guild | None: ...
@@ -82,9 +121,11 @@ class GuildCache:
         database. If that fails, return None."""
         if guild := self._cache.get(discord_guild.id):
             return guild
-        if guild := await Guild.find_one(Guild.guild == discord_guild.id):
-            self._cache[discord_guild.id] = guild
-            return guild
+        if discord_guild.id not in self._missing:
+            if guild := await Guild.find_one(Guild.guild == discord_guild.id):
+                self._cache[discord_guild.id] = guild
+                return guild
+            self._missing[discord_guild.id] = True
 
         if create:
             guild = await self._create(discord_guild)
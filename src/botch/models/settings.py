@@ -0,0 +1,53 @@
+"""Resolved settings cache."""
+
+from typing import Optional
+
+from cachetools import TTLCache
+
+SettingsKey = tuple[Optional[int], Optional[int], int]  # Guild, channel, user
+
+
+class SettingsCache:
+    """Caches the accessibility decision for each (guild, channel, user), so
+    that rendering a roll or display costs a single dict lookup instead of
+    permission checks plus guild and user fetches.
+
+    Entries must be invalidated when any of their inputs change: the user's
+    or guild's settings, or the @everyone permissions in the guild or
+    channel. The TTL is a backstop for changes we aren't told about."""
+
+    def __init__(self, maxsize=10_000, ttl=600):
+        self._cache: TTLCache[SettingsKey, bool] = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def get(self, key: SettingsKey) -> bool | None:
+        """The cached accessibility decision, if any."""
+        return self._cache.get(key)
+
+    def set(self, key: SettingsKey, accessibility: bool):
+        """Cache an accessibility decision."""
+        self._cache[key] = accessibility
+
+    def invalidate(
+        self,
+        *,
+        guild: Optional[int] = None,
+        channel: Optional[int] = None,
+        user: Optional[int] = None,
+    ):
+        """Drop every entry matching all of the given criteria."""
+        stale = [
+            key
+            for key in self._cache
+            if (guild is None or key[0] == guild)
+            and (channel is None or key[1] == channel)
+            and (user is None or key[2] == user)
+        ]
+        for key in stale:
+            self._cache.pop(key, None)
+
+    def clear(self):
+        """Drop everything."""
+        self._cache.clear()
@@ -1,12 +1,17 @@
 """Non-PII user, aka player, data."""
 
+import asyncio
 import logging
 from datetime import UTC, datetime, timedelta
 from typing import ClassVar, Optional
 
+import pymongo
 from beanie import Document
+from cachetools import LRUCache
 from pydantic import BaseModel, Field
 
+from botch.config import USER_CACHE_SIZE
+
 
 class UserSettings(BaseModel):
     """Various user settings that follow across guilds."""
@@ -45,46 +50,64 @@ class User(Document):
 
     class Settings:
         name = "users"
+        indexes = [
+            pymongo.IndexModel([("user", pymongo.ASCENDING)], unique=True),
+            [("left_premium", pymongo.ASCENDING)],
+        ]
 
 
 class UserStore:
-    """A cache for managing users."""
+    """A cache for managing users. Users are loaded on demand and the least
+    recently used are dropped once `maxsize` are held."""
 
-    def __init__(self):
-        self._cache: dict[int, User] = {}
+    def __init__(self, maxsize=USER_CACHE_SIZE):
+        self._cache: LRUCache[int, User] = LRUCache(maxsize=maxsize)
+        self._loading: dict[int, asyncio.Task[User]] = {}
         self.logger = logging.getLogger("USER CACHE")
-        self._populated = False
 
-    async def _populate(self):
-        """Pre-populate the cache with all user objects."""
-        if not self._populated:
-            users = await User.find().to_list()
-            self._cache = {u.user: u for u in users}
-            self._populated = True
+    def __len__(self) -> int:
+        return len(self._cache)
 
     def clear(self):
         """Clear the cache."""
-        self._cache = {}
-        self._populated = False
+        self._cache.clear()
 
     async def fetch_purgeable(self) -> list[User]:
-        """Users with purgeable images due to dropping premium."""
-        await self._populate()
-        return [u for u in self._cache.values() if u.should_purge]
+        """Users with purgeable images due to dropping premium. Users already
+        in the cache are returned as their cached instances; others are not
+        added to the cache."""
+        cutoff = datetime.now(UTC) - timedelta(days=User.PURGE_INTERVAL)
+        users = await User.find(User.left_premium < cutoff).to_list()
+        users = [self._cache.get(u.user, u) for u in users]
+
+        return [u for u in users if u.should_purge]
 
     async def fetch(self, user_id) -> User:
         """Fetch a user. If it doesn't exist, create it. Created user is not
         persisted in the database."""
-        await self._populate()
         if user := self._cache.get(user_id):
             return user
 
-        user = User(user=user_id)
-        self._cache[user_id] = user
+        # Concurrent misses share one load, so they all get the same instance
+        if (load := self._loading.get(user_id)) is None:
+            load = asyncio.create_task(self._load(user_id))
+            self._loading[user_id] = load
+
+        # Shielded so that one cancelled caller doesn't cancel everyone's load
+        return await asyncio.shield(load)
 
-        # We don't save the user on creation, because most users never change
-        # settings, and there's no benefit to keeping their records.
-        return user
+    async def _load(self, user_id: int) -> User:
+        """Load the user into the cache."""
+        try:
+            if (user := await User.find_one(User.user == user_id)) is None:
+                user = User(user=user_id)
+            self._cache[user_id] = user
+
+            # We don't save the user on creation, because most users never
+            # change settings, and there's no benefit to keeping their records.
+            return user
+        finally:
+            del self._loading[user_id]
 
 
 # Unlike the guild cache, we keep a singleton here because the premium
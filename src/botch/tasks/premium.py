@@ -1,21 +1,58 @@
 """Premium data culling tasks."""
 
+import asyncio
 import logging
+import random
 from datetime import UTC, time
+from time import monotonic
 
 from discord.ext import tasks
+from pydantic import BaseModel, Field
 
+from botch.config import PURGE_ATTEMPTS, PURGE_CONCURRENCY, PURGE_RATE
 from botch.core import cache
 from botch.core.characters import Character
+from botch.core.utils.ratelimit import TokenBucket
 from botch.models import User
 from botch.models.user import cache as user_store
 
+logger = logging.getLogger("TASK")
+
+RETRY_DELAY = 1.0  # Seconds; doubled on each attempt, then jittered
+
 
 @tasks.loop(time=time(12, 0, tzinfo=UTC))
 async def purge():
     """Cull inactive characters and guilds."""
     result = await purge_expired_images()
-    logging.getLogger("TASK").info(result)
+    logger.info(result)
+
+
+class PurgeProgress(BaseModel):
+    """Running totals for a purge."""
+
+    total: int  # Characters to purge
+    done: int = 0
+    images: int = 0
+    failed: int = 0
+    retries: int = 0
+    started: float = Field(default_factory=monotonic)
+
+    @property
+    def elapsed(self) -> float:
+        return monotonic() - self.started
+
+    @property
+    def rate(self) -> float:
+        """Characters purged per second."""
+        return self.done / max(self.elapsed, 1e-9)
+
+    def __str__(self) -> str:
+        return (
+            f"{self.done}/{self.total} characters, {self.images} image(s), "
+            f"{self.failed} failed, {self.retries} retries "
+            f"({self.rate:.1f} characters/s)"
+        )
 
 
 async def purge_expired_images() -> str:
@@ -23,11 +60,18 @@ async def purge_expired_images() -> str:
 
     Returns a description of what was purged."""
     purgeable = await fetch_purgeable_users()
-    total_purged = 0
+    chars = await fetch_purgeable_characters(purgeable)
+    progress, failed = await purge_characters(chars)
+    failed_users = {char.user for char in failed}
+
     for user in purgeable:
-        total_purged += await purge_images(user)
+        # Users with failures stay purgeable so the next run can try again
+        if user.user not in failed_users:
+            user.left_premium = None
+            await user.save()
 
-    return f"Purged {total_purged} image(s) across {len(purgeable)} user(s)."
+    logger.info("Purge finished: %s", progress)
+    return f"Purged {progress.images} image(s) across {len(purgeable)} user(s)."
 
 
 async def fetch_purgeable_users() -> list[User]:
@@ -35,24 +79,23 @@ async def fetch_purgeable_users() -> list[User]:
     return await user_store.fetch_purgeable()
 
 
-async def fetch_purgeable_characters(user: User) -> list[Character]:
-    """Fetch characters whose users dropped premium a while ago."""
-    chars = await Character.find(Character.user == user.user).to_list()
-    guilds = {c.guild for c in chars}
+async def fetch_purgeable_characters(users: list[User]) -> list[Character]:
+    """Fetch the users' characters that have images, in a single query.
 
-    # This could be a lot more efficient if the cache maintained a list of
-    # characters per user instead of characters per user per guild. Maybe we
-    # will make that change in the future; for now, however, we need to make
-    # sure we are working with the characters from the cache rather than the
-    # newly fetched characters, so we re-fetch them. The impact of this
-    # operation should be minimal, since it happens asynchronously in the
-    # background.
-    user_chars: list[Character] = []
-    for guild in guilds:
-        chars = await cache.fetchall(guild, user.user)
-        user_chars.extend(chars)
+    Characters that are live in the cache are swapped in for the fetched
+    copies, so the purge modifies the same instances the bot is using. We
+    don't go through the cache for the query itself, because that would load
+    (and possibly evict) every purgeable user's characters."""
+    if not users:
+        return []
 
-    return [c for c in user_chars if c.profile.images]
+    chars = await Character.find(
+        {"user": {"$in": [user.user for user in users]}, "profile.images.0": {"$exists": True}},
+        with_children=True,
+    ).to_list()
+
+    # A cached instance may have had its images removed since the query
+    return [c for c in cache.reconcile(chars) if c.profile.images]
 
 
 async def purge_images(user: User) -> int:
@@ -61,12 +104,55 @@ async def purge_images(user: User) -> int:
     Args:
         user (User): The user whose images to purge.
 
-    Returns the number of characters purged."""
-    chars = await fetch_purgeable_characters(user)
-    total_purged = 0
-    for char in chars:
-        total_purged += len(char.profile.images)
-        await char.delete_all_images()
-
-    user.left_premium = None
-    return total_purged
+    Returns the number of images purged."""
+    chars = await fetch_purgeable_characters([user])
+    progress, failed = await purge_characters(chars)
+
+    if not failed:
+        user.left_premium = None
+        await user.save()
+    return progress.images
+
+
+async def purge_characters(
+    chars: list[Character],
+    concurrency=PURGE_CONCURRENCY,
+    rate=PURGE_RATE,
+    attempts=PURGE_ATTEMPTS,
+) -> tuple[PurgeProgress, list[Character]]:
+    """Delete the characters' images, up to `concurrency` at a time and no
+    more than `rate` API calls per second. Failures are retried with
+    exponential backoff and jitter.
+
+    Returns the purge's progress and the characters that couldn't be purged."""
+    progress = PurgeProgress(total=len(chars))
+    bucket = TokenBucket(rate)
+    semaphore = asyncio.Semaphore(concurrency)
+    report_every = max(len(chars) // 10, 1)
+    failed: list[Character] = []
+
+    async def purge_one(char: Character):
+        async with semaphore:
+            images = len(char.profile.images)
+            for attempt in range(attempts):
+                await bucket.acquire()
+                try:
+                    await char.delete_all_images()
+                    progress.images += images
+                    break
+                except Exception as err:
+                    if attempt + 1 == attempts:
+                        logger.error("Unable to purge %s (%s): %s", char.name, char.id, err)
+                        progress.failed += 1
+                        failed.append(char)
+                        break
+
+                    progress.retries += 1
+                    await asyncio.sleep(random.uniform(0, RETRY_DELAY * 2**attempt))
+
+            progress.done += 1
+            if progress.done % report_every == 0:
+                logger.info("Purge progress: %s", progress)
+
+    await asyncio.gather(*(purge_one(char) for char in chars))
+    return progress, failed
@@ -179,7 +179,7 @@ async def test_health_adjuster(idx: int, expected: str, char: Character):
 )
 async def test_willpower_adjuster(
     mock_update_display: AsyncMock,
-    mock_char_save: AsyncMock,
+    mock_char_schedule: Mock,
     idx: int,
     count: int,
     expected: str,
@@ -198,7 +198,7 @@ async def test_willpower_adjuster(
     assert mock_update_display.await_count == count
     assert inter.response.edit_message.await_count == count
     inter.response.edit_message.assert_has_awaits([call(view=toggler)] * count)
-    assert mock_char_save.await_count == count
+    assert mock_char_schedule.call_count == count
 
 
 @pytest.mark.parametrize(
@@ -220,7 +220,7 @@ async def test_willpower_adjuster(
 )
 async def test_grounding_adjuster(
     mock_update_display: AsyncMock,
-    mock_char_save: AsyncMock,
+    mock_char_schedule: Mock,
     idx: int,
     count: int,
     expected: int,
@@ -240,7 +240,7 @@ async def test_grounding_adjuster(
     assert mock_update_display.await_count == count
     assert inter.response.edit_message.await_count == count
     inter.response.edit_message.assert_has_awaits([call(view=toggler)] * count)
-    assert mock_char_save.await_count == count
+    assert mock_char_schedule.call_count == count
 
 
 async def test_grounding_adjuster_allows_path_change(
@@ -264,7 +264,7 @@ async def test_grounding_adjuster_allows_path_change(
 async def test_grounding_adjuster_change_path(
     modal_mock: MagicMock,
     mock_update_display: AsyncMock,
-    mock_char_save: AsyncMock,
+    mock_char_schedule: Mock,
     toggler: Toggler,
     new_path: str,
 ):
@@ -297,7 +297,7 @@ async def test_grounding_adjuster_change_path(
 
     assert inter.response.edit_message.await_count == 1
     mock_update_display.assert_awaited_once()
-    mock_char_save.assert_awaited_once()
+    mock_char_schedule.assert_called_once()
 
 
 @pytest.mark.parametrize(
@@ -329,7 +329,7 @@ async def test_grounding_adjuster_change_path(
 )
 async def test_wod_vamp_adjuster(
     mock_update_display: AsyncMock,
-    mock_char_save: AsyncMock,
+    mock_char_schedule: Mock,
     idx: int,
     count: int,
     expected: int | tuple[int, ...],
@@ -363,7 +363,7 @@ async def test_wod_vamp_adjuster(
     assert mock_update_display.await_count == count
     assert inter.response.edit_message.await_count == count
     inter.response.edit_message.assert_has_awaits([call(view=toggler)] * count)
-    assert mock_char_save.await_count == count
+    assert mock_char_schedule.call_count == count
 
 
 @pytest.mark.parametrize(
@@ -394,7 +394,7 @@ async def test_wod_vamp_adjuster(
 )
 async def test_cofd_vamp_adjuster(
     mock_update_display: AsyncMock,
-    mock_char_save: AsyncMock,
+    mock_char_schedule: Mock,
     ctx: AppCtx,
     cvamp: cofd.Vampire,
     idx: int,
@@ -428,7 +428,7 @@ async def test_cofd_vamp_adjuster(
     assert mock_update_display.await_count == count
     assert inter.response.edit_message.await_count == count
     inter.response.edit_message.assert_has_awaits([call(view=toggler)] * count)
-    assert mock_char_save.await_count == count
+    assert mock_char_schedule.call_count == count
 
 
 @pytest.mark.parametrize(
@@ -442,7 +442,7 @@ async def test_cofd_vamp_adjuster(
 )
 async def test_mummy_sekhem_adjuster(
     mock_update_display: AsyncMock,
-    mock_char_save: AsyncMock,
+    mock_char_schedule: Mock,
     mummy_toggler: Toggler,
     idx: int,
     count: int,
@@ -460,7 +460,7 @@ async def test_mummy_sekhem_adjuster(
     assert mummy_toggler.character.sekhem == expected
     assert mock_update_display.await_count == count
     assert inter.response.edit_message.await_count == count
-    assert mock_char_save.await_count == count
+    assert mock_char_schedule.call_count == count
 
 
 @pytest.mark.parametrize(
@@ -580,7 +580,7 @@ async def test_mummy_pillar_button_states(
     ],
 )
 async def test_mummy_pillar_adjuster(
-    mock_char_save: AsyncMock,
+    mock_char_schedule: Mock,
     mummy_toggler: Toggler,
     pillar_name: str,
     ida: int,
@@ -612,7 +612,7 @@ async def test_mummy_pillar_adjuster(
     else:
         assert pillar.temporary == expected
 
-    mock_char_save.assert_awaited()
+    mock_char_schedule.assert_called()
 
 
 @pytest.mark.parametrize(
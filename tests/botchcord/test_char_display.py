@@ -143,10 +143,15 @@ def test_alt_title(bot_mock, wod_vamp):
 )
 def test_emoji_track(track: str, expected: str):
     bot = Mock()
-    bot.find_emoji = lambda e: e
+    bot.find_emoji = Mock(side_effect=lambda e: e)
+    bot.render_cache = {}
     emoji = emojify_track(bot, track)
     assert emoji == expected
 
+    # Second rendering comes from the cache
+    assert emojify_track(bot, track) == expected
+    assert bot.find_emoji.call_count == len(track)
+
 
 @patch("botch.botchcord.settings.use_emojis")
 @patch("botch.bot.BotchBot.find_emoji")
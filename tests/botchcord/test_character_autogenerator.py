@@ -5,7 +5,6 @@ from typing import Any
 from unittest.mock import Mock
 
 import pytest
-from cachetools import TTLCache
 from discord import OptionChoice
 
 from botch.botchcord.options import _available_characters as generate
@@ -17,9 +16,9 @@ from tests.characters import gen_char
 @pytest.fixture(autouse=True)
 def clear_cache():
     """Clear the cache after every test."""
-    cache._cache = TTLCache(maxsize=100, ttl=1800)
+    cache.clear()
     yield
-    cache._cache = TTLCache(maxsize=100, ttl=1800)
+    cache.clear()
 
 
 @pytest.fixture(autouse=True)
@@ -122,3 +121,49 @@ async def test_admin_lookup(ctx: Mock, chars: list[Character]):
     options = await generate(ctx, False)
     assert len(options) == len(chars)
     assert frozenset(char.name for char in chars) == frozenset(name for name in options)
+
+
+@pytest.mark.parametrize("ctx", ["owner"], indirect=True)
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        ("", ["Billy", "Jimmy", "Sally", "Tommy"]),
+        ("s", ["Sally"]),
+        ("my", ["Jimmy", "Tommy"]),  # Fuzzy
+        ("x", []),
+    ],
+)
+async def test_ranked_lookup(ctx: Mock, value: str, expected: list[str]):
+    ctx.value = value
+    assert await generate(ctx, False) == expected
+
+
+@pytest.mark.parametrize("ctx", ["owner"], indirect=True)
+async def test_many_characters(ctx: Mock):
+    for i in range(40):
+        await cache.register(gen_char(GameLine.WOD, Splat.MORTAL, name=f"SPC {i:02}"))
+
+    options = await generate(ctx, False)
+    assert len(options) == 25
+    assert options[:4] == ["Billy", "Jimmy", "Sally", "SPC 00"]
+
+    # Prefix matches come first, then fuzzy ones
+    ctx.value = "spc 3"
+    options = await generate(ctx, False)
+    assert options[:10] == [f"SPC {i}" for i in range(30, 40)]
+    assert "SPC 03" in options[10:]
+
+
+@pytest.mark.parametrize("ctx", ["owner"], indirect=True)
+async def test_index_tracks_changes(ctx: Mock, chars: list[Character]):
+    ctx.value = "z"
+    assert await generate(ctx, False) == []
+
+    await cache.register(gen_char(GameLine.WOD, Splat.MORTAL, name="Zed"))
+    assert await generate(ctx, False) == ["Zed"]
+
+    billy = await cache.fetchone(0, 0, "Billy")
+    await cache.rename(billy, "Zach")
+    assert await generate(ctx, False) == ["Zach", "Zed"]
+    ctx.value = "b"
+    assert await generate(ctx, False) == []
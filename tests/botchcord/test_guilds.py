@@ -3,6 +3,7 @@
 from typing import AsyncGenerator
 from unittest.mock import AsyncMock, Mock, patch
 
+import discord
 import pytest
 
 from botch.bot import BotchBot
@@ -107,3 +108,48 @@ async def test_cache_invalidation(bot: BotchBot, guild: Mock):
     cached = await bot.guild_cache.fetch(guild)
     assert cached is not None
     assert cached.name == guild.name
+
+
+async def test_cache_negative(bot: BotchBot, guild: Mock):
+    with patch.object(Guild, "find_one", wraps=Guild.find_one) as find_one:
+        assert await bot.guild_cache.fetch(guild) is None
+        assert await bot.guild_cache.fetch(guild) is None
+        find_one.assert_called_once()
+
+        # Creating it replaces the negative entry
+        created = await bot.guild_cache.fetch(guild, create=True)
+        find_one.reset_mock()
+        assert await bot.guild_cache.fetch(guild) is created
+        find_one.assert_not_called()
+
+
+async def test_create_after_stale_miss(bot: BotchBot, guild: Mock):
+    assert await bot.guild_cache.fetch(guild) is None
+
+    # Another process creates the record while the miss is cached
+    existing = Guild(guild=guild.id, name="Elsewhere")
+    await existing.save()
+
+    created = await bot.guild_cache.fetch(guild, create=True)
+    assert created.id == existing.id
+    assert await Guild.find(Guild.guild == guild.id).count() == 1
+    assert await bot.guild_cache.fetch(guild) is created
+
+
+async def test_cache_warm(bot: BotchBot):
+    discord_guilds = []
+    for guild_id in range(5):
+        discord_guild = Mock(spec=discord.Guild)
+        discord_guild.configure_mock(id=guild_id, name=f"Guild {guild_id}")
+        discord_guilds.append(discord_guild)
+        if guild_id % 2 == 0:
+            await Guild(guild=guild_id, name=discord_guild.name).save()
+
+    assert await bot.guild_cache.warm(discord_guilds) == 3
+    with patch.object(Guild, "find_one", wraps=Guild.find_one) as find_one:
+        for discord_guild in discord_guilds:
+            found = await bot.guild_cache.fetch(discord_guild)
+            assert (found is not None) == (discord_guild.id % 2 == 0)
+        find_one.assert_not_called()
+
+    assert await bot.guild_cache.warm(discord_guilds) == 0, "Already cached"
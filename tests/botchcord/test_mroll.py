@@ -61,26 +61,26 @@ async def test_mroll(
     )
 
 
-@patch("botch.botchcord.roll.Roll.save", new_callable=AsyncMock)
+@patch("botch.botchcord.roll.roll_sink.put", new_callable=AsyncMock)
 async def test_mroll_no_mock(
-    mock_roll_save: AsyncMock, mock_respond: AsyncMock, ctx: AppCtx, char: Character
+    mock_roll_put: AsyncMock, mock_respond: AsyncMock, ctx: AppCtx, char: Character
 ):
     await char.save()
     macro = char.macros[0]
     await mroll(ctx, macro.name, None, False, False, None, char)  # type: ignore
     mock_respond.assert_awaited_once_with(embed=ANY)
-    mock_roll_save.assert_awaited_once()
+    mock_roll_put.assert_awaited_once()
 
 
-@patch("botch.botchcord.roll.Roll.save", new_callable=AsyncMock)
-async def test_mroll_specs(mock_roll_save: AsyncMock, ctx: AppCtx, char: Character, mock_respond):
+@patch("botch.botchcord.roll.roll_sink.put", new_callable=AsyncMock)
+async def test_mroll_specs(mock_roll_put: AsyncMock, ctx: AppCtx, char: Character, mock_respond):
     char.add_subtraits("Brawl", ["Grappling"])
     macro = create_macro(char, "specs", "str+b.g", 6, None)
     char.add_macro(macro)
     await mroll(ctx, macro.name, False, False, None, None, char)  # type: ignore
 
     mock_respond.assert_awaited_once_with(embed=ANY)
-    mock_roll_save.assert_awaited_once()  # This is our proof it rolled
+    mock_roll_put.assert_awaited_once()  # This is our proof it rolled
 
 
 async def test_mroll_missing_trait(ctx: AppCtx, char: Character, mock_send_error):
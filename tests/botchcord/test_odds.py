@@ -0,0 +1,47 @@
+"""Odds command tests."""
+
+import pytest
+
+from botch.bot import AppCtx
+from botch.botchcord.odds import build_embed, percent, show_odds
+from botch.core.characters import GameLine
+from botch.core.rolls.odds import odds
+
+
+@pytest.mark.parametrize(
+    "chance,expected",
+    [(0, "0.0%"), (0.0004, "<0.1%"), (0.5, "50.0%"), (0.9996, ">99.9%"), (1, "100.0%")],
+)
+def test_percent(chance: float, expected: str):
+    assert percent(chance) == expected
+
+
+def test_wod_embed(ctx: AppCtx):
+    result = odds(GameLine.WOD, 7, 8, specialty=True, autos=1)
+    embed = build_embed(ctx, result, 7, 8, True, False, 1)
+
+    assert embed.title == "7 dice at difficulty 8 • Specialty • +1 auto"
+    assert [f.name for f in embed.fields] == ["Success", "Botch", "Exceptional", "Average"]
+    assert embed.fields[0].value == percent(result.success)
+    assert embed.footer.text == "Exact odds."
+
+
+def test_cofd_embed(ctx: AppCtx):
+    result = odds(GameLine.COFD, 1, 8, wp=True, blessed=True, rote=True)
+    embed = build_embed(ctx, result, 1, 8, False, True, 0, rote=True, blessed=True)
+
+    assert embed.title == "1 die, 8-again • WP • Blessed • Rote"
+    assert [f.name for f in embed.fields] == ["Success", "Exceptional", "Average"]
+    assert embed.fields[0].value == percent(result.success)
+    assert embed.fields[2].value == f"{result.mean:.2f} successes"
+    assert embed.footer.text.startswith("Estimated from")
+
+    # WP adds three dice, which a single die can't match
+    assert result.success > odds(GameLine.COFD, 1, 8, blessed=True, rote=True).success
+
+
+async def test_show_odds(ctx: AppCtx):
+    await show_odds(ctx, 5, 6, False, False, 0)
+    ctx.interaction.respond.assert_awaited_once()
+    embed = ctx.interaction.respond.call_args.kwargs["embed"]
+    assert embed.title.startswith("5 dice")
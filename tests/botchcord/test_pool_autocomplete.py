@@ -0,0 +1,81 @@
+"""Pool autocomplete tests."""
+
+from unittest.mock import Mock
+
+import pytest
+
+from botch.botchcord.options import _pool_completions as complete
+from botch.core.cache import cache
+from botch.core.characters import Character, GameLine, Splat
+from tests.characters import gen_char
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+async def chars() -> list[Character]:
+    alice = gen_char(GameLine.WOD, Splat.MORTAL, name="Alice")
+    alice.add_trait("Brawl", 3)
+    alice.add_subtraits("Brawl", "Throws")
+    bob = gen_char(GameLine.WOD, Splat.MORTAL, name="Bob")
+    bob.add_trait("Brawn", 2)
+    spc = gen_char(GameLine.WOD, Splat.MORTAL, name="Goon", user=300)
+    spc.add_trait("Bribery", 2)
+
+    for char in (alice, bob, spc):
+        await char.insert()
+    return [alice, bob, spc]
+
+
+@pytest.fixture
+def ctx() -> Mock:
+    ctx = Mock()
+    ctx.interaction.user.id = 0
+    ctx.interaction.user.guild_permissions.administrator = False
+    ctx.interaction.guild.id = 0
+    ctx.bot.user.id = 300
+    ctx.options = {}
+    ctx.value = "Strength + br"
+    return ctx
+
+
+async def test_all_characters(ctx: Mock):
+    assert await complete(ctx) == [
+        "Strength + Brawl",
+        "Strength + Brawl.Throws",
+        "Strength + Brawn",
+    ]
+
+
+async def test_selected_character(ctx: Mock):
+    ctx.options = {"character": "bob"}
+    assert await complete(ctx) == ["Strength + Brawn"]
+
+    ctx.options = {"character": "nobody"}
+    assert await complete(ctx) == []
+
+
+async def test_admin_spc(ctx: Mock):
+    ctx.options = {"character": "Goon"}
+    assert await complete(ctx) == []
+
+    ctx.interaction.user.guild_permissions.administrator = True
+    assert await complete(ctx) == ["Strength + Bribery"]
+
+
+async def test_other_owner(ctx: Mock):
+    ctx.options = {"owner": "300"}
+    assert await complete(ctx) == []
+
+    ctx.interaction.user.guild_permissions.administrator = True
+    assert await complete(ctx) == ["Strength + Bribery"]
+
+
+async def test_empty_value(ctx: Mock):
+    ctx.value = ""
+    assert await complete(ctx) == []
@@ -12,7 +12,7 @@ from discord.ui import Button
 
 from botch.bot import AppCtx
 from botch.botchcord import settings
-from botch.models import Guild, User
+from botch.models import Guild, SettingsCache, User
 
 
 class A11yParams(NamedTuple):
@@ -160,3 +160,63 @@ async def test_settings_control_states(
             assert (
                 guild_a11y_btn.style == ButtonStyle.primary if a11y.guild else ButtonStyle.secondary
             )
+
+
+async def test_accessibility_cached(ctx: AppCtx):
+    with (
+        patch.object(ctx.bot.guild_cache, "fetch", wraps=ctx.bot.guild_cache.fetch) as guild_fetch,
+        patch.object(ctx.bot.user_store, "fetch", wraps=ctx.bot.user_store.fetch) as user_fetch,
+    ):
+        for _ in range(3):
+            assert await settings.accessibility(ctx) is False
+        guild_fetch.assert_awaited_once()
+        user_fetch.assert_awaited_once()
+
+
+async def test_toggle_invalidates(ctx: AppCtx):
+    ctx.bot.user_store.clear()
+    assert await settings.accessibility(ctx) is False
+
+    view = settings.SettingsView(ctx)
+    with patch("botch.models.user.User.save", new_callable=AsyncMock):
+        await view.toggle_user_a11y(AsyncMock())
+    assert await settings.accessibility(ctx) is True
+
+    with patch("botch.models.user.User.save", new_callable=AsyncMock):
+        await view.toggle_user_a11y(AsyncMock())
+    assert await settings.accessibility(ctx) is False
+
+
+async def test_guild_update_invalidates(ctx: AppCtx):
+    await settings.accessibility(ctx)
+    assert len(ctx.bot.settings_cache) == 1
+
+    await ctx.bot.on_guild_update(ctx.guild, ctx.guild)
+    assert len(ctx.bot.settings_cache) == 0
+
+
+@pytest.mark.parametrize("category,remaining", [(False, 2), (True, 0)])
+async def test_channel_update_invalidates(ctx: AppCtx, category: bool, remaining: int):
+    cache = ctx.bot.settings_cache
+    for key in [(1, 10, 100), (1, 11, 100), (1, 12, 100)]:
+        cache.set(key, True)
+
+    channel = Mock(spec=discord.CategoryChannel if category else discord.TextChannel)
+    channel.id = 10
+    channel.guild.id = 1
+    await ctx.bot.on_guild_channel_update(channel, channel)
+    assert len(cache) == remaining
+
+
+def test_settings_cache_invalidation():
+    cache = SettingsCache()
+    for key in [(1, 10, 100), (1, 11, 100), (1, 10, 101), (2, 20, 100), (None, 5, 100)]:
+        cache.set(key, True)
+
+    cache.invalidate(guild=1, channel=10)
+    assert cache.get((1, 10, 100)) is None
+    assert cache.get((1, 10, 101)) is None
+    assert cache.get((1, 11, 100)) is True
+
+    cache.invalidate(user=100)
+    assert len(cache) == 0
@@ -2,7 +2,7 @@
 
 import importlib
 from functools import partial
-from unittest.mock import ANY, AsyncMock, Mock, patch
+from unittest.mock import ANY, AsyncMock, Mock
 
 import discord
 import pytest
@@ -286,12 +286,11 @@ def test_build_assignment_embed(bot_mock, skilled: Character):
     assert embed.author.name == skilled.name
 
 
-async def test_assign(ctx, skilled: Character):
-    with patch("botch.core.characters.Character.save", return_value=None):
-        await assign.assign(ctx, skilled, "brawl=2")
+async def test_assign(ctx, skilled: Character, mock_char_schedule: Mock):
+    await assign.assign(ctx, skilled, "brawl=2")
 
-        ctx.respond.assert_called_once_with(embed=ANY, ephemeral=True)
-        skilled.save.assert_called_once()  # pyright: ignore
+    ctx.respond.assert_called_once_with(embed=ANY, ephemeral=True)
+    mock_char_schedule.assert_called_once_with(skilled)
 
 
 def test_parse_duplicates():
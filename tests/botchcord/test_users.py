@@ -1,5 +1,6 @@
 """User cache tests."""
 
+import asyncio
 from datetime import UTC, datetime, timedelta
 from typing import AsyncGenerator
 from unittest.mock import AsyncMock, patch
@@ -56,3 +57,49 @@ async def test_fetch_purgeable(cache: UserStore):
     purgeable_ids = [u.user for u in purgeable if u.should_purge]
     assert len(purgeable) == 2
     assert purgeable_ids == [1, 4]
+
+
+async def test_fetch_is_lazy(cache: UserStore):
+    for user_id in range(3):
+        await User(user=user_id).save()
+
+    await cache.fetch(1)
+    assert len(cache) == 1
+
+
+async def test_lru_eviction():
+    cache = UserStore(maxsize=2)
+    first = await cache.fetch(1)
+    await cache.fetch(2)
+    await cache.fetch(1)  # Now most recently used
+    await cache.fetch(3)
+
+    assert len(cache) == 2
+    assert await cache.fetch(1) is first
+    assert await cache.fetch(2) is not None
+
+
+async def test_fetch_purgeable_uses_cached(cache: UserStore):
+    await User(user=1, left_premium=datetime.now(UTC) - timedelta(days=31)).save()
+    await User(user=2, left_premium=datetime.now(UTC) - timedelta(days=31)).save()
+
+    cached = await cache.fetch(1)
+    purgeable = await cache.fetch_purgeable()
+    assert [u.user for u in purgeable] == [1, 2]
+    assert purgeable[0] is cached
+    assert len(cache) == 1, "Purgeable users shouldn't be cached"
+
+    # Changes made to the cached instance are respected
+    cached.gain_premium()
+    assert [u.user for u in await cache.fetch_purgeable()] == [2]
+
+
+async def test_concurrent_fetches_share_load(cache: UserStore):
+    await User(user=1).save()
+
+    with patch("botch.models.user.User.find_one", wraps=User.find_one) as mock_find:
+        users = await asyncio.gather(*(cache.fetch(1) for _ in range(3)))
+
+    mock_find.assert_called_once()
+    assert all(user is users[0] for user in users)
+    assert not cache._loading
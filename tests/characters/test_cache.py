@@ -1,12 +1,14 @@
 """Test the character cache."""
 
+import asyncio
 import copy
 
 import pytest
+from pydantic import ValidationError
 
 from botch import errors
-from botch.core.cache import CharCache
-from botch.core.characters import Character, GameLine, Splat
+from botch.core.cache import CharCache, UserCharacters, character_weight
+from botch.core.characters import Character, CharacterSummary, GameLine, Splat
 
 
 @pytest.fixture
@@ -145,3 +147,191 @@ async def test_splat_line_filtering(
 async def test_has_character(fcache):
     assert await fcache.has_character(0, 0, "One")
     assert not await fcache.has_character(0, 0, "One Million")
+
+
+async def test_rename(fcache: CharCache):
+    one = await fcache.fetchone(0, 0, "One")
+    await fcache.rename(one, "Zed")
+
+    assert not await fcache.has_character(0, 0, "One")
+    assert await fcache.has_character(0, 0, "zed")
+    assert await fcache.fetchone(0, 0, "ZED") is one
+    assert await fcache.fetchnames(0, 0) == ["Two", "Zed"]
+    assert await fcache.fetchnames(0, 0, line=GameLine.WOD) == ["Zed"]
+
+
+async def test_rename_invalid(fcache: CharCache):
+    one = await fcache.fetchone(0, 0, "One")
+    with pytest.raises(ValidationError):
+        await fcache.rename(one, "")
+
+    assert one.name == "One"
+    assert await fcache.fetchone(0, 0, "one") is one
+    assert await fcache.fetchnames(0, 0) == ["One", "Two"]
+
+
+async def test_buckets_merge_sorted(skilled: Character, fcache: CharCache):
+    for name, guild, splat in [("Alpha", 0, Splat.GHOUL), ("Bravo", 1, Splat.VAMPIRE)]:
+        char = copy.deepcopy(skilled)
+        char.name = name
+        char.guild = guild
+        char.line = GameLine.WOD
+        char.splat = splat
+        await fcache.register(char)
+
+    assert await fcache.fetchnames(0, 0) == ["Alpha", "One", "Two"]
+    assert await fcache.fetchnames(0, 0, line=GameLine.WOD) == ["Alpha", "One"]
+    assert await fcache.fetchnames(1, 0) == ["Bravo"]
+    assert [c.name for c in await fcache.fetchall(None, 0)] == ["Alpha", "Bravo", "One", "Two"]
+    assert [c.name for c in await fcache.fetchall(None, 0, splat=Splat.VAMPIRE)] == [
+        "Bravo",
+        "One",
+    ]
+
+    # Same name in another guild doesn't collide
+    assert not await fcache.has_character(1, 0, "Alpha")
+    with pytest.raises(errors.CharacterNotFound):
+        await fcache.fetchone(0, 0, "One", line=GameLine.COFD)
+
+
+async def test_concurrent_fetches_coalesce(fcache: CharCache):
+    results = await asyncio.gather(
+        fcache.fetchall(0, 0),
+        fcache.fetchone(0, 0, "One"),
+        fcache.has_character(0, 0, "Two"),
+    )
+    assert [c.name for c in results[0]] == ["One", "Two"]
+    assert results[1].name == "One"
+    assert results[2]
+
+    assert fcache.stats.loads == 1
+    assert fcache.stats.coalesced == 2
+
+    await fcache.fetchall(0, 0)
+    assert fcache.stats.loads == 1, "Should have been served from the cache"
+
+
+async def test_register_during_load(skilled: Character, fcache: CharCache):
+    skilled.name = "Three"
+    await asyncio.gather(fcache.fetchall(0, 0), fcache.register(skilled))
+
+    assert await fcache.fetchnames(0, 0) == ["One", "Three", "Two"]
+    assert fcache.stats.loads == 1
+
+
+async def test_hits_and_misses(fcache: CharCache):
+    await fcache.fetchall(0, 0)
+    await fcache.fetchall(0, 0)
+    await fcache.fetchall(0, 1)
+
+    assert fcache.stats.misses == 2
+    assert fcache.stats.hits == 1
+    assert fcache.users == 2
+
+
+async def test_weight_tracks_characters(skilled: Character, fcache: CharCache):
+    await fcache.fetchall(0, 0)
+    before = fcache.weight
+    assert before == 1 + 2 * character_weight(skilled)
+
+    skilled.name = "Three"
+    await fcache.register(skilled)
+    assert fcache.weight == before + character_weight(skilled)
+
+    # remove() hits the image API, so check the entry directly
+    entry = UserCharacters(await fcache.fetchall(0, 0))
+    entry.remove(skilled)
+    assert entry.weight == before
+
+
+async def test_evicts_by_weight(skilled: Character, fcache: CharCache):
+    # Room for user 0's two characters, but not another user's as well
+    weight = 1 + 2 * character_weight(skilled)
+    cache = CharCache(max_weight=weight + 1)
+
+    other = copy.deepcopy(skilled)
+    other.user = 1
+    await other.insert()
+
+    await cache.fetchall(0, 0)
+    assert cache.users == 1
+    await cache.fetchall(0, 1)
+    assert cache.users == 1
+    assert cache.stats.evictions == 1
+
+    await cache.fetchall(0, 0)
+    assert cache.stats.loads == 3, "User 0 should have been evicted"
+
+
+async def test_growing_entry_keeps_others(skilled: Character, fcache: CharCache):
+    # Room for user 0 with a third character plus user 1's one character
+    weight = character_weight(skilled)
+    cache = CharCache(max_weight=2 + 4 * weight)
+
+    other = copy.deepcopy(skilled)
+    other.user = 1
+    await other.insert()
+
+    await cache.fetchall(0, 1)
+    await cache.fetchall(0, 0)
+    skilled.name = "Three"
+    await cache.register(skilled)
+
+    assert cache.users == 2
+    assert cache.stats.evictions == 0
+    assert cache.weight == 2 + 4 * weight
+
+
+async def test_oversized_not_cached(fcache: CharCache):
+    cache = CharCache(max_weight=2)
+    assert len(await cache.fetchall(0, 0)) == 2
+    assert len(await cache.fetchall(0, 0)) == 2
+
+    assert cache.users == 0
+    assert cache.stats.oversized == 2
+    assert cache.stats.loads == 2
+
+
+async def test_reconcile(fcache: CharCache):
+    fetched = await Character.find(Character.user == 0, with_children=True).to_list()
+    assert fcache.reconcile(fetched) == fetched
+    assert fcache.users == 0, "Reconciling shouldn't load users"
+
+    cached = await fcache.fetchall(0, 0)
+    reconciled = fcache.reconcile(fetched)
+    assert [c.name for c in reconciled] == [c.name for c in fetched]
+    assert all(any(r is c for c in cached) for r in reconciled)
+
+
+async def test_summaries_without_full_load(fcache: CharCache):
+    summaries = await fcache.fetchsummaries(0, 0)
+    assert [s.name for s in summaries] == ["One", "Two"]
+    assert [s.splat for s in summaries] == [Splat.VAMPIRE, Splat.MORTAL]
+    assert all(isinstance(s, CharacterSummary) for s in summaries)
+    assert await fcache.fetchnames(0, 0, line=GameLine.COFD) == ["Two"]
+
+    assert fcache.stats.summary_loads == 1, "Summaries should have been cached"
+    assert fcache.stats.loads == 0
+    assert fcache.users == 0
+
+
+async def test_summaries_from_full_entry(fcache: CharCache):
+    chars = await fcache.fetchall(0, 0)
+    summaries = await fcache.fetchsummaries(0, 0)
+
+    assert [s.id for s in summaries] == [c.id for c in chars]
+    assert fcache.stats.summary_loads == 0
+
+
+async def test_summaries_invalidated(skilled: Character):
+    # Too small for full entries, so only the summaries can go stale
+    cache = CharCache(max_weight=2)
+    assert await cache.fetchnames(0, 0) == []
+
+    skilled.name = "Three"
+    await cache.register(skilled)
+    assert await cache.fetchnames(0, 0) == ["Three"]
+
+    await cache.rename(skilled, "Four")
+    assert await cache.fetchnames(0, 0) == ["Four"]
+    assert cache.stats.summary_loads == 3
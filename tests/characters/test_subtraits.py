@@ -1,6 +1,7 @@
 """Specialty test suite."""
 
 import random
+from itertools import product
 
 import pytest
 
@@ -224,6 +225,52 @@ def test_incomplete_duplicate_matching(skill, subtraits):
     assert len(matches) == 6
 
 
+def product_matches(skill: Trait, spec_groups: list[list[str]]) -> list[list[str]]:
+    """The original, unpruned expansion: a full product, deduplicated."""
+    seen = set()
+    matches = []
+    for group in product(*spec_groups):
+        if len(set(group)) == len(group) and frozenset(group) not in seen:
+            seen.add(frozenset(group))
+            matches.append([skill.name] + sorted(group))
+    return matches
+
+
+def test_pruned_expansion_matches_product(skill: Trait):
+    rng = random.Random(0)
+    skill.add_subtraits([f"{a}{b}" for a in "abcdef" for b in "xyz"])
+
+    for _ in range(200):
+        tokens = ["".join(rng.choices("abcdefxyz", k=rng.randint(0, 2))) for _ in range(4)]
+        groups = skill._get_matching_spec_groups(tokens[: rng.randint(2, 4)], skill._starting_comp)
+        assert skill._generate_unique_matches(groups) == product_matches(skill, groups)
+
+
+def test_expansion_memoized(skill: Trait, subtraits: list[str]):
+    skill.add_subtraits(subtraits)
+    first = skill.expanding("BRAWL.k", False)
+    assert first == ["Brawl.Kindred", "Brawl.Kine"]
+    assert len(skill._expansions) == 1
+
+    # Same normalized identifier; callers get their own copies
+    first.clear()
+    assert skill.expanding("brawl.K", False) == ["Brawl.Kindred", "Brawl.Kine"]
+    assert len(skill._expansions) == 1
+
+    skill.add_subtraits("Knives")
+    assert not skill._expansions
+    assert skill.expanding("brawl.k", False) == ["Brawl.Kindred", "Brawl.Kine", "Brawl.Knives"]
+
+    skill.remove_subtraits("Kine")
+    assert skill.expanding("brawl.k", False) == ["Brawl.Kindred", "Brawl.Knives"]
+
+
+def test_many_specialties(skill: Trait):
+    skill.add_subtraits([f"Spec{i:02}" for i in range(50)])
+    assert len(skill.expanding("brawl.spec0.spec1.spec2", False)) == 10**3
+    assert len(skill.expanding("brawl.s.s.s", False)) == 19600  # 50 choose 3
+
+
 @pytest.mark.parametrize(
     "skill,subtraits,should_raise",
     [
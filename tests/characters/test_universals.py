@@ -170,6 +170,24 @@ def test_update_trait(skilled: Character):
         skilled.update_trait("Fake", 2)
 
 
+def test_trait_views_are_read_only(skilled: Character):
+    view = skilled.find_traits("brawl")[0]
+    with pytest.raises(AttributeError):
+        view.rating = 5  # type: ignore
+    with pytest.raises(AttributeError):
+        view.add_subtraits("Kindred")  # type: ignore
+
+    view.subtraits.append("Kine")
+    assert skilled.find_traits("brawl")[0].subtraits == ["Kindred"]
+
+    # Views aren't snapshots: they track changes made through the character
+    skilled.update_trait("Brawl", 5)
+    skilled.add_subtraits("Brawl", "Kine")
+    assert view.rating == 5
+    assert view.subtraits == ["Kindred", "Kine"]
+    assert view.expanding("brawl.kine", False) == ["Brawl.Kine"]
+
+
 def test_remove_trait(character: Character):
     trait = "Foo"
     character.add_trait("Foo", 1)
@@ -184,6 +202,62 @@ def test_remove_trait(character: Character):
         character.remove_trait("Fake")
 
 
+def test_match_traits_tracks_mutations(skilled: Character):
+    assert [t.name for t in skilled.match_traits("st")] == ["Streetwise", "Strength"]
+
+    skilled.add_trait("Stealth", 2)
+    assert [t.name for t in skilled.match_traits("ste")] == ["Stealth"]
+
+    skilled.update_trait("Stealth", 4)
+    assert skilled.match_traits("stea")[0].rating == 4
+
+    skilled.remove_trait("Stealth")
+    assert not skilled.match_traits("stea")
+
+    skilled.add_subtraits("Streetwise", "Drugs")
+    assert skilled.match_traits("stre.dr")[0].name == "Streetwise (Drugs)"
+
+    # Direct list manipulation bypasses the mutators but is still seen
+    stamina = Trait(
+        name="Stamina",
+        rating=2,
+        category=Trait.Category.ATTRIBUTE,
+        subcategory=Trait.Subcategory.PHYSICAL,
+    )
+    skilled.traits.append(stamina)
+    assert [t.name for t in skilled.match_traits("sta")] == ["Stamina"]
+
+
+def test_match_traits_after_traits_replaced(skilled: Character):
+    assert skilled.match_traits("brawl")
+    old = skilled.traits
+    skilled.traits = [t.model_copy() for t in old if t.name != "Brawl"]
+    skilled.traits.append(skilled.traits[0].model_copy(update={"name": "Stealth"}))
+    del old  # Its id may be reused by the new list
+
+    # Same length as before, but a different list, so the indexes rebuild
+    assert not [t for t in skilled.match_traits("brawl") if t.rating]
+    assert skilled.match_traits("stea")
+    assert "Stealth" in skilled.complete_trait("ste")
+
+
+def test_match_traits_innates_are_live(skilled: Character):
+    assert skilled.match_traits("willpower")[0].rating == 6
+
+    skilled.willpower = skilled.willpower[1:]
+    skilled.grounding.path = "Path of Night"
+    assert skilled.match_traits("willpower")[0].rating == 5
+    assert skilled.match_traits("path")[0].name == "Path of Night"
+    assert not skilled.match_traits("humanity")
+
+
+def test_match_traits_returns_selections(skilled: Character):
+    selection = skilled.match_traits("brawl.kin")[0]
+    selection.subtraits.append("Mutated")
+
+    assert skilled.find_traits("brawl")[0].subtraits == ["Kindred"]
+
+
 def test_remove_core_trait(skilled: Character):
     b = "Brawl"
     t = skilled.find_traits("Brawl")
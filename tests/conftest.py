@@ -10,6 +10,7 @@ from mongomock_motor import AsyncMongoMockClient
 from motor.motor_asyncio import AsyncIOMotorClient
 
 from botch.core.characters import Character, GameLine, Splat, Trait
+from botch.core.writer import writer
 from botch.db import DOCUMENT_MODELS
 from tests.characters import gen_char
 
@@ -33,6 +34,13 @@ async def clear_collections():
         await model.delete_all()
 
 
+@pytest.fixture(autouse=True)
+async def clear_writer():
+    """Drop pending character saves so they don't leak between tests."""
+    yield
+    writer.reset()
+
+
 @pytest.fixture(params=list(Splat), scope="function")
 def character(request):
     return gen_char(GameLine.WOD, request.param)
@@ -66,6 +74,7 @@ def bot_mock() -> Mock:
     bot = Mock()
     bot.get_user.return_value = user
     bot.find_emoji = lambda e: e
+    bot.render_cache = {}
 
     return bot
 
@@ -87,6 +96,12 @@ def mock_char_save():
         yield mocked
 
 
+@pytest.fixture
+def mock_char_schedule():
+    with patch.object(writer, "schedule") as mocked:
+        yield mocked
+
+
 @pytest.fixture(scope="session")
 def event_loop():
     """Create an event loop to share between tests."""
@@ -0,0 +1,167 @@
+"""Test buffered bulk insertion."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from pymongo.errors import BulkWriteError
+
+from botch.core.characters import GameLine
+from botch.core.rolls import Roll
+from botch.core.rolls.sink import RollSink
+from botch.interface.models.commandrecord import CommandRecord, CommandSink
+
+
+def gen_roll(num: int) -> Roll:
+    return Roll(line=GameLine.WOD, guild=0, user=num, num_dice=1, target=6, dice=[num % 10 + 1])
+
+
+def gen_record(user: int) -> CommandRecord:
+    return CommandRecord(command="roll", options=None, guild=0, user=user, locale=None, type=1)
+
+
+@pytest.fixture
+def sink() -> RollSink:
+    return RollSink(batch_size=3, interval=0.01, max_pending=5)
+
+
+async def test_flush_by_size(sink: RollSink):
+    with patch.object(Roll, "insert_many", new_callable=AsyncMock) as mock_insert:
+        for i in range(3):
+            await sink.put(gen_roll(i))
+        await asyncio.sleep(0)
+
+        mock_insert.assert_awaited_once()
+        assert len(mock_insert.await_args.args[0]) == 3
+    assert len(sink) == 0
+
+
+async def test_flush_by_time(sink: RollSink):
+    await sink.put(gen_roll(1))
+    assert await Roll.count() == 0
+
+    await asyncio.sleep(0.05)
+    assert len(sink) == 0
+    assert await Roll.count() == 1
+    assert sink.stats.batches == 1
+
+
+async def test_close_flushes(sink: RollSink):
+    sink.interval = 60
+    for i in range(2):
+        await sink.put(gen_roll(i))
+
+    await sink.close()
+    assert await Roll.count() == 2
+    assert sink.stats.inserted == 2
+
+
+async def test_insert_event_applied(sink: RollSink):
+    roll = gen_roll(1)
+    assert roll.specialties == []
+    await sink.put(roll)
+    await sink.close()
+
+    stored = await Roll.find_one()
+    assert stored is not None
+    assert stored.specialties is None
+
+
+async def test_backpressure(sink: RollSink):
+    sink.interval = 60
+    with patch.object(Roll, "insert_many", new_callable=AsyncMock) as mock_insert:
+        mock_insert.side_effect = ConnectionError
+        for i in range(5):
+            await sink.put(gen_roll(i))
+        await asyncio.sleep(0)
+        assert len(sink) == 5, "Failed batches should be re-queued"
+        assert sink.stats.failures == 1
+
+        # The queue is full, so the next put has to wait for room
+        mock_insert.side_effect = None
+        await sink.put(gen_roll(5))
+
+    assert sink.stats.stalls == 1
+    assert sink.stats.inserted == 5
+    assert len(sink) == 1
+    await sink.close()
+
+
+async def test_backpressure_bounded(sink: RollSink):
+    sink.interval = 0.01
+    sink.max_wait = 0.05
+    with patch.object(Roll, "insert_many", new_callable=AsyncMock) as mock_insert:
+        mock_insert.side_effect = ConnectionError
+        for i in range(6):
+            await asyncio.wait_for(sink.put(gen_roll(i)), 1)
+
+    assert sink.stats.stalls == 1
+    assert sink.stats.dropped == 1
+    assert [roll.user for roll in sink._queue] == [0, 1, 2, 3, 4]
+    await sink.close()
+
+
+async def test_partial_failure_requeues_failures(sink: RollSink):
+    sink.interval = 60
+    rolls = [gen_roll(i) for i in range(3)]
+    error = BulkWriteError({"writeErrors": [{"index": 1, "code": 121, "errmsg": "Invalid"}]})
+    with patch.object(Roll, "insert_many", new_callable=AsyncMock) as mock_insert:
+        mock_insert.side_effect = error
+        for roll in rolls:
+            await sink.put(roll)
+        await asyncio.sleep(0)
+
+        assert mock_insert.await_args.kwargs == {"ordered": False}
+
+    assert sink.stats.inserted == 2
+    assert sink.stats.failures == 1
+    assert list(sink._queue) == [rolls[1]]
+    await sink.close()
+
+
+async def test_retry_skips_inserted(sink: RollSink):
+    sink.interval = 60
+    rolls = [gen_roll(i) for i in range(3)]
+    for roll in rolls:
+        await sink.put(roll)
+        assert roll.id is not None
+
+    # An earlier attempt inserted the first roll before failing
+    await Roll.insert_many(rolls[:1])
+    await sink.close()
+
+    assert await Roll.count() == 3
+    assert sink.stats.inserted == 3
+    assert len(sink) == 0
+
+
+async def test_drop_oldest(sink: RollSink):
+    sink.interval = 60
+    sink.drop_oldest = True
+    with patch.object(Roll, "insert_many", new_callable=AsyncMock) as mock_insert:
+        mock_insert.side_effect = ConnectionError
+        for i in range(6):
+            await sink.put(gen_roll(i))
+        await asyncio.sleep(0)
+
+    assert len(sink) == 5
+    assert sink.stats.dropped == 1
+    assert [roll.user for roll in sink._queue] == [1, 2, 3, 4, 5]
+    await sink.close()
+
+
+async def test_command_sink_never_waits():
+    sink = CommandSink(batch_size=2, interval=60, max_pending=3)
+    with patch.object(CommandRecord, "insert_many", new_callable=AsyncMock) as mock_insert:
+        mock_insert.side_effect = ConnectionError
+        for user in range(10):
+            await sink.put(gen_record(user))
+            assert sink.depth <= 3
+        await asyncio.sleep(0)
+
+    assert sink.stats.stalls == 0
+    assert sink.stats.dropped == 7
+    assert [record.user for record in sink._queue] == [7, 8, 9]
+
+    await sink.close()
+    assert await CommandRecord.count() == 3
@@ -3,6 +3,7 @@
 from typing import Generator
 from unittest.mock import Mock, patch
 
+import numpy as np
 import pytest
 
 from botch.core.characters import GameLine
@@ -11,7 +12,14 @@ from botch.core.rolls.roll import Roll
 
 @pytest.fixture
 def mock_d10() -> Generator[Mock, None, None]:
-    with patch("botch.core.rolls.roll.d10") as mock:
+    """Dice are rolled in batches, but the mock supplies them one at a time in
+    the order they're drawn: the whole pool first, then each explosion wave."""
+    mock = Mock()
+
+    def draw(count: int) -> np.ndarray:
+        return np.array([mock() for _ in range(count)])
+
+    with patch("botch.core.rolls.roll.d10_array", side_effect=draw):
         yield mock
 
 
@@ -115,7 +123,10 @@ def test_blessed_rote(mock_d10: Mock, roll: Roll):
 
 
 def test_complex_rote(mock_d10: Mock, roll: Roll):
-    mock_d10.side_effect = [10, 8, 5, 5, 8, 10, 7, 10, 8, 7, 10, 8, 5, 5, 10, 8, 6]
+    pool = [10, 5, 5, 8, 10, 10, 7, 10]
+    explosions = [8, 7, 8, 8]
+    rote = [5, 5, 10, 6]
+    mock_d10.side_effect = pool + explosions + rote + [8]
     roll.rote = True
     roll.wp = True
     roll.roll()
@@ -166,7 +177,7 @@ def test_dice_readout(
 
 def test_readout_8_again(mock_d10: Mock, roll: Roll):
     dice = [10, 5, 5, 5, 9, 5, 5, 5, 8, 5, 5, 5]
-    mock_d10.side_effect = dice
+    mock_d10.side_effect = [10, 5, 5, 9, 5, 5, 8, 5, 5] + [5, 5, 5]
     roll.target = 8
     roll.wp = True
     roll.add_specs(["spec"])
@@ -176,5 +187,19 @@ def test_readout_8_again(mock_d10: Mock, roll: Roll):
     assert roll.dice_readout == "6 *+ 3X* *+ WP*"
 
 
+@pytest.mark.parametrize("target", [8, 9, 10])
+def test_explosions_follow_their_die(roll: Roll, target: int):
+    roll.target = target
+    roll.num_dice = 40
+    roll.roll()
+
+    # Every exploding die is immediately followed by its extra die, so the
+    # only way to end the roll is on a die that didn't explode
+    assert len(roll.dice) >= 40
+    assert roll.dice[-1] < target
+    chains = sum(die < target for die in roll.dice)
+    assert chains == 40
+
+
 def test_cofd_successes(roll: Roll):
     assert roll._cofd_successes([1, 2, 8]) == 1
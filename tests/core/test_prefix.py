@@ -0,0 +1,76 @@
+"""Prefix index tests."""
+
+import pytest
+
+from botch.core.utils.prefix import NameIndex, PrefixIndex, search_names
+
+
+@pytest.fixture
+def index() -> PrefixIndex[int]:
+    names = ["Strength", "Stamina", "streetwise", "Brawl", "Stealth", "Stamina"]
+    return PrefixIndex((name, i) for i, name in enumerate(names))
+
+
+@pytest.mark.parametrize(
+    "prefix,expected",
+    [
+        ("st", [1, 5, 4, 2, 0]),
+        ("STA", [1, 5]),
+        ("stre", [2, 0]),
+        ("b", [3]),
+        ("", [3, 1, 5, 4, 2, 0]),
+        ("x", []),
+        ("brawler", []),
+    ],
+)
+def test_search(index: PrefixIndex[int], prefix: str, expected: list[int]):
+    assert index.search(prefix) == expected
+
+
+def test_len(index: PrefixIndex[int]):
+    assert len(index) == 6
+    assert len(PrefixIndex([])) == 0
+
+
+@pytest.fixture
+def names() -> NameIndex:
+    return NameIndex(["Nadea Theron", "Theo", "Bob", "Anthea", "the Stranger"])
+
+
+@pytest.mark.parametrize(
+    "query,expected",
+    [
+        ("the", ["the Stranger", "Theo", "Nadea Theron", "Anthea"]),
+        ("THEO", ["Theo", "Nadea Theron"]),
+        ("str", ["the Stranger"]),
+        ("nt", ["Anthea", "Nadea Theron"]),  # Fuzzy; tighter matches first
+        ("", ["Anthea", "Bob", "Nadea Theron", "the Stranger", "Theo"]),
+        ("xyz", []),
+    ],
+)
+def test_ranked_search(names: NameIndex, query: str, expected: list[str]):
+    assert names.search(query) == expected
+
+
+def test_search_limit(names: NameIndex):
+    assert names.search("the", limit=2) == ["the Stranger", "Theo"]
+    assert names.search("", limit=1) == ["Anthea"]
+
+
+def test_add_and_remove(names: NameIndex):
+    names.add("Theodora Vance")
+    assert "Theodora Vance" in names
+    assert names.search("va") == ["Theodora Vance"]
+
+    names.remove("Nadea Theron")
+    names.remove("Not Present")
+    assert "Nadea Theron" not in names
+    assert len(names) == 5
+    assert "Nadea Theron" not in names.search("ther")
+
+
+def test_search_names_merges():
+    players = NameIndex(["Alice", "Zed Alpha"])
+    spcs = NameIndex(["Alfred", "Bob"])
+    assert search_names([players, spcs], "al") == ["Alfred", "Alice", "Zed Alpha"]
+    assert search_names([players, spcs], "al", limit=2) == ["Alfred", "Alice"]
@@ -0,0 +1,19 @@
+"""Test rate limiting."""
+
+import asyncio
+from time import monotonic
+
+from botch.core.utils.ratelimit import TokenBucket
+
+
+async def test_burst_then_rate():
+    bucket = TokenBucket(rate=50, capacity=5)
+
+    start = monotonic()
+    for _ in range(5):
+        await bucket.acquire()
+    assert monotonic() - start < 0.05, "Bursts shouldn't wait"
+
+    start = monotonic()
+    await asyncio.gather(*(bucket.acquire() for _ in range(5)))
+    assert monotonic() - start >= 0.08, "Should be limited to ~50/s"
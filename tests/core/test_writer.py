@@ -0,0 +1,121 @@
+"""Test write-behind character saves."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from botch.core.characters import Character, Damage, Tracker
+from botch.core.writer import MAX_ATTEMPTS, CharacterWriter
+
+
+@pytest.fixture
+def writer() -> CharacterWriter:
+    return CharacterWriter(delay=0.01)
+
+
+async def test_coalesces_saves(writer: CharacterWriter, skilled: Character):
+    await skilled.insert()
+
+    for _ in range(5):
+        skilled.increment_damage(Tracker.HEALTH, Damage.BASHING)
+        writer.schedule(skilled)
+
+    assert len(writer) == 1
+    assert writer.coalesced == 4
+
+    await asyncio.sleep(0.05)
+    assert len(writer) == 0
+    assert writer.writes == 1
+
+    fetched = await Character.get(skilled.id, with_children=True)
+    assert fetched is not None
+    assert fetched.health == skilled.health
+
+
+async def test_writes_only_changes(writer: CharacterWriter, skilled: Character):
+    await skilled.insert()
+    skilled.willpower = "//....."
+
+    with patch.object(Character, "save", new_callable=AsyncMock) as mock_save:
+        writer.schedule(skilled)
+        await writer.flush()
+        mock_save.assert_not_awaited()
+
+    fetched = await Character.get(skilled.id, with_children=True)
+    assert fetched is not None
+    assert fetched.willpower == "//....."
+
+
+async def test_close_flushes(writer: CharacterWriter, skilled: Character):
+    writer.delay = 60
+    writer.schedule(skilled)
+    await writer.close()
+
+    assert len(writer) == 0
+    assert skilled.id is not None, "Unsaved characters get inserted"
+
+
+async def test_discard(writer: CharacterWriter, skilled: Character):
+    writer.schedule(skilled)
+    assert skilled in writer
+
+    writer.discard(skilled)
+    await writer.close()
+
+    assert writer.writes == 0
+    assert skilled.id is None
+
+
+async def test_failed_writes_retry(writer: CharacterWriter, skilled: Character):
+    writer.delay = 60
+    with patch.object(Character, "save", new_callable=AsyncMock) as mock_save:
+        mock_save.side_effect = ConnectionError
+        writer.schedule(skilled)
+        await writer.flush()
+
+        assert skilled in writer, "Should be retried"
+
+        mock_save.side_effect = None
+        await writer.close()
+        assert skilled not in writer
+
+
+async def test_failed_writes_give_up(writer: CharacterWriter, skilled: Character):
+    writer.delay = 60
+    with patch.object(Character, "save", new_callable=AsyncMock) as mock_save:
+        mock_save.side_effect = ConnectionError
+        writer.schedule(skilled)
+        for _ in range(MAX_ATTEMPTS):
+            assert skilled in writer
+            await writer.flush()
+
+    assert skilled not in writer
+    assert mock_save.await_count == MAX_ATTEMPTS
+    await writer.close()
+
+
+async def test_forget_waits_and_blocks_writes(writer: CharacterWriter, skilled: Character):
+    await skilled.insert()
+    writer.delay = 60
+    skilled.willpower = "//....."
+
+    async def slow_save(*args, **kwargs):
+        await asyncio.sleep(0.02)
+
+    with patch.object(
+        Character, "save_changes", new_callable=AsyncMock, side_effect=slow_save
+    ) as mock_save:
+        writer.schedule(skilled)
+        flushing = asyncio.create_task(writer.flush())
+        await asyncio.sleep(0.005)
+        assert mock_save.await_count == 1, "The save should be in progress"
+
+        await writer.forget(skilled)
+        assert flushing.done(), "forget() should wait for the in-progress save"
+
+        # A stale reference can't bring it back
+        writer.schedule(skilled)
+        assert skilled not in writer
+        await writer.close()
+        assert mock_save.await_count == 1
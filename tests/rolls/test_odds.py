@@ -0,0 +1,122 @@
+"""Roll odds tests."""
+
+from math import comb
+
+import numpy as np
+import pytest
+
+from botch.core.characters import GameLine
+from botch.core.rolls import roll as roll_module
+from botch.core.rolls.odds import odds, sample
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(0)
+
+
+@pytest.mark.parametrize(
+    "line,dice,target,kwargs",
+    [
+        (GameLine.WOD, 1, 6, {}),
+        (GameLine.WOD, 7, 8, {}),
+        (GameLine.WOD, 5, 10, {}),
+        (GameLine.WOD, 5, 2, {"specialty": True}),
+        (GameLine.WOD, 6, 7, {"specialty": True, "wp": True, "autos": 2}),
+        (GameLine.COFD, 1, 10, {}),
+        (GameLine.COFD, 5, 8, {"rote": True}),
+        (GameLine.COFD, 4, 9, {"wp": True, "specialty": True, "autos": 1}),
+    ],
+)
+def test_exact_matches_sampled(line: GameLine, dice: int, target: int, kwargs: dict, rng):
+    exact = odds(line, dice, target, **kwargs)
+    sampled = sample(line, dice, target, 100_000, rng=rng, **kwargs)
+
+    assert exact.exact
+    assert not sampled.exact
+    assert sum(exact.distribution.values()) == pytest.approx(1)
+    assert sampled.success == pytest.approx(exact.success, abs=0.01)
+    assert sampled.botch == pytest.approx(exact.botch, abs=0.01)
+    assert sampled.mean == pytest.approx(exact.mean, abs=0.03)
+
+
+def test_single_wod_die():
+    result = odds(GameLine.WOD, 1, 6)
+    assert result.distribution == pytest.approx({-1: 0.1, 0: 0.4, 1: 0.5})
+    assert result.success == pytest.approx(0.5)
+    assert result.botch == pytest.approx(0.1)
+    assert result.failure == pytest.approx(0.4)
+
+
+def test_wod_botch_chance():
+    # A botch requires no successes and at least one 1
+    dice = 5
+    expected = 0.5**dice - 0.4**dice
+    assert odds(GameLine.WOD, dice, 6).botch == pytest.approx(expected)
+
+
+def test_wp_prevents_botches():
+    result = odds(GameLine.WOD, 3, 9, wp=True)
+    assert result.botch == 0
+    assert result.success == pytest.approx(1)
+
+
+def test_wod_ignores_cofd_options():
+    assert odds(GameLine.WOD, 4, 6, rote=True, blessed=True) is odds(GameLine.WOD, 4, 6)
+
+
+def test_cofd_ten_again():
+    # Each die averages 0.3 successes per roll, 1/0.9 rolls per die
+    result = odds(GameLine.COFD, 1, 10)
+    assert result.success == pytest.approx(0.3)
+    assert result.mean == pytest.approx(1 / 3)
+    assert result.botch == 0
+
+
+def test_cofd_no_explosions():
+    # Without explosions, CofD is a binomial with p = 0.3. 11-again can't
+    # be chosen in the bot, but it isolates the explosion logic.
+    result = odds(GameLine.COFD, 4, 11)
+    for k in range(5):
+        assert result.distribution[k] == pytest.approx(comb(4, k) * 0.3**k * 0.7 ** (4 - k))
+
+
+def test_cofd_modifiers_order(rng):
+    plain = odds(GameLine.COFD, 6, 10)
+    rote = odds(GameLine.COFD, 6, 10, rote=True)
+    blessed = sample(GameLine.COFD, 6, 10, 50_000, blessed=True, rng=rng)
+    blighted = sample(GameLine.COFD, 6, 10, 50_000, blighted=True, rng=rng)
+
+    assert blighted.success < plain.success < blessed.success
+    assert plain.success < rote.success
+
+
+def test_sample_uses_roll_generator(monkeypatch):
+    results = []
+    for _ in range(2):
+        monkeypatch.setattr(roll_module, "_rng", np.random.default_rng(7))
+        results.append(sample(GameLine.COFD, 6, 10, 1000, blessed=True))
+
+    assert results[0] == results[1]
+
+
+def test_advanced_actions_are_sampled():
+    result = odds(GameLine.COFD, 3, 10, blessed=True)
+    assert not result.exact
+    assert result.trials
+
+
+def test_odds_cached():
+    assert odds(GameLine.COFD, 5, 9) is odds(GameLine.COFD, 5, 9)
+
+
+def test_at_least_and_exceptional():
+    result = odds(GameLine.COFD, 8, 10)
+    assert result.at_least(0) == pytest.approx(1)
+    assert result.at_least(5) == result.exceptional
+    assert result.at_least(1) >= result.at_least(2) >= result.at_least(3)
+
+
+def test_no_dice():
+    with pytest.raises(ValueError):
+        odds(GameLine.WOD, 0, 6)
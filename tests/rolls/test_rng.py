@@ -1,8 +1,14 @@
 """Miscellaneous roll tests."""
 
+from collections import Counter
+
+import numpy as np
 import pytest
 
-from botch.core.rolls.roll import d10
+from botch.core.characters import GameLine
+from botch.core.rolls import roll as roll_module
+from botch.core.rolls.odds import _odds, chi_square, chi_square_critical, odds
+from botch.core.rolls.roll import Roll, d10
 
 
 def test_single_d10():
@@ -17,3 +23,95 @@ def test_multiple_d10s(count: int):
     dice = d10(count)
     assert len(dice) == count
     assert all(1 <= d <= 10 for d in dice)
+
+
+# Statistical checks. These use a seeded generator so they're deterministic,
+# but the seed isn't special: at a 0.1% significance level, any seed should
+# pass nearly every time.
+
+ROLLS = 5000
+
+
+@pytest.fixture
+def seeded(monkeypatch):
+    monkeypatch.setattr(roll_module, "_rng", np.random.default_rng(2024))
+    # Sampled odds are cached, and may have been drawn from the unseeded generator
+    _odds.cache_clear()
+    yield
+    _odds.cache_clear()
+
+
+def assert_fits(observed: Counter[int], expected: dict[int, float]):
+    statistic, df = chi_square(observed, expected)
+    assert statistic < chi_square_critical(df), f"chi-square {statistic:.1f} on {df} df"
+
+
+def test_d10_uniform(seeded):
+    observed = Counter(d10(100_000))
+    assert_fits(observed, {face: 0.1 for face in range(1, 11)})
+
+
+@pytest.mark.parametrize(
+    "line,target,kwargs",
+    [
+        (GameLine.WOD, 6, {}),
+        (GameLine.WOD, 8, {"specialties": ["Spec"]}),
+        (GameLine.WOD, 4, {"wp": True, "autos": 1}),
+        (GameLine.WOD, 10, {}),
+        (GameLine.COFD, 10, {}),
+        (GameLine.COFD, 9, {}),
+        (GameLine.COFD, 8, {}),
+        (GameLine.COFD, 10, {"rote": True}),
+        (GameLine.COFD, 8, {"rote": True, "wp": True}),
+        (GameLine.COFD, 10, {"specialties": ["Spec"], "autos": 2}),
+        (GameLine.COFD, 10, {"blessed": True}),
+        (GameLine.COFD, 9, {"blighted": True, "rote": True}),
+    ],
+)
+def test_roll_distribution(line: GameLine, target: int, kwargs: dict, seeded):
+    observed = Counter(
+        Roll(line=line, guild=0, user=0, num_dice=5, target=target, **kwargs).roll().successes
+        for _ in range(ROLLS)
+    )
+    expected = odds(
+        line,
+        5,
+        target,
+        specialty=bool(kwargs.get("specialties")),
+        wp=kwargs.get("wp", False),
+        autos=kwargs.get("autos", 0),
+        rote=kwargs.get("rote", False),
+        blessed=kwargs.get("blessed", False),
+        blighted=kwargs.get("blighted", False),
+    )
+    assert_fits(observed, expected.distribution)
+
+
+@pytest.mark.parametrize("again", [10, 9, 8])
+def test_explosion_chains(again: int, seeded):
+    rolls = [
+        Roll(line=GameLine.COFD, guild=0, user=0, num_dice=1, target=again).roll()
+        for _ in range(ROLLS)
+    ]
+    for roll in rolls:
+        # Every die but the last exploded
+        assert all(die >= again for die in roll.dice[:-1])
+        assert roll.dice[-1] < again
+
+    # Chain lengths are geometric
+    explodes = (11 - again) / 10
+    observed = Counter(len(roll.dice) for roll in rolls)
+    expected = {n: explodes ** (n - 1) * (1 - explodes) for n in range(1, 40)}
+    assert_fits(observed, expected)
+
+
+def test_chi_square_rejects_bias():
+    observed = Counter({face: 1000 for face in range(1, 11)})
+    observed[1] += 200
+    statistic, df = chi_square(observed, {face: 0.1 for face in range(1, 11)})
+    assert statistic > chi_square_critical(df)
+
+
+def test_chi_square_rejects_impossible():
+    statistic, _ = chi_square(Counter({1: 10, 2: 1}), {1: 1.0})
+    assert statistic == float("inf")
@@ -4,7 +4,7 @@ import pytest
 
 from botch import errors
 from botch.core.characters import Character, GameLine, Splat
-from botch.core.rolls.parse import RollParser
+from botch.core.rolls.parse import RollParser, complete_pool, tokenize
 from tests.characters import gen_char
 
 
@@ -49,6 +49,22 @@ def test_roll_prep(syntax: str, expected: list[str | int]):
         assert parsed == expected
 
 
+def test_tokenize_memoized():
+    tokenize.cache_clear()
+
+    first = RollParser("Dexterity + Brawl", None).tokenize()
+    second = RollParser("  Dexterity  +   Brawl ", None).tokenize()
+    assert first == second == ["Dexterity", "+", "Brawl"]
+
+    info = tokenize.cache_info()
+    assert info.misses == 1
+    assert info.hits == 1
+
+    # Callers get their own list
+    first.append(3)
+    assert RollParser("Dexterity + Brawl", None).tokenize() == ["Dexterity", "+", "Brawl"]
+
+
 @pytest.mark.parametrize(
     "syntax,needs_character",
     [
@@ -153,3 +169,56 @@ def test_can_parse():
     assert RollParser.can_roll(a, "stren+br")
     assert RollParser.can_roll(a, "a")  # ambiguous traits are allowed
     assert not RollParser.can_roll(a, "stren+fake")
+
+
+@pytest.mark.parametrize(
+    "syntax,expected",
+    [
+        ("st", ["Streetwise", "Strength"]),
+        ("Intelligence + b", ["Intelligence + Brawl", "Intelligence + Brawl.Kindred"]),
+        ("3  +   brawl.", ["3 + Brawl.Kindred"]),
+        ("Strength + bra.", ["Strength + Brawl.Kindred"]),
+        ("Strength + bra.ki", ["Strength + Brawl.Kindred"]),
+        ("Strength + bra.x", []),
+        ("-bra", ["- Brawl", "- Brawl.Kindred"]),
+        ("Strength + Brawl - f", ["Strength + Brawl - Fighting"]),
+        ("Strength + w", ["Strength + WP", "Strength + Willpower"]),
+        ("Strength + ", []),
+        ("Strength + 3", []),
+        ("Strength 3 + b", []),
+        ("xyz", []),
+    ],
+)
+def test_complete_pool(skilled: Character, syntax: str, expected: list[str]):
+    assert complete_pool(syntax, [skilled]) == expected
+
+
+def test_complete_pool_merges_characters(skilled: Character):
+    other = gen_char(GameLine.WOD, Splat.MORTAL)
+    other.add_trait("Stamina", 2)
+    other.add_trait("Strength", 3)
+
+    assert complete_pool("st", [skilled, other]) == ["Streetwise", "Strength", "Stamina"]
+    assert complete_pool("st", [skilled, other], limit=1) == ["Streetwise"]
+
+
+def test_complete_pool_abbreviated_specialties(skilled: Character):
+    skilled.add_subtraits("Brawl", ["Throws", "Grappling"])
+
+    assert complete_pool("Str + bra.th", [skilled]) == ["Str + Brawl.Throws"]
+    assert complete_pool("Str + bra.", [skilled]) == [
+        "Str + Brawl.Grappling",
+        "Str + Brawl.Kindred",
+        "Str + Brawl.Throws",
+    ]
+    assert complete_pool("Str + bra.th.k", [skilled]) == ["Str + Brawl.Kindred.Throws"]
+
+
+def test_complete_trait_tracks_changes(skilled: Character):
+    assert skilled.complete_trait("brawl.") == ["Brawl.Kindred"]
+
+    skilled.add_subtraits("Brawl", "Throws")
+    assert skilled.complete_trait("brawl.") == ["Brawl.Kindred", "Brawl.Throws"]
+
+    skilled.remove_trait("Fighting")
+    assert skilled.complete_trait("fi") == []
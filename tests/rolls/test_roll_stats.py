@@ -0,0 +1,154 @@
+"""Test precomputed roll statistics."""
+
+from unittest.mock import patch
+
+import pytest
+from beanie import PydanticObjectId
+
+from botch.core.characters import GameLine
+from botch.core.rolls import Roll, RollStats
+from botch.core.rolls.sink import RollSink
+
+
+def gen_roll(dice: list[int], line=GameLine.WOD, guild=0, user=0) -> Roll:
+    target = 6 if line == GameLine.WOD else 10
+    roll = Roll(line=line, guild=guild, user=user, num_dice=len(dice), target=target, dice=dice)
+    roll.successes  # Store num_successes, as the embed does
+    return roll
+
+
+@pytest.fixture
+def rolls() -> list[Roll]:
+    return [
+        gen_roll([1, 2, 3]),  # Botch
+        gen_roll([1, 5]),  # Botch
+        gen_roll([6, 7, 8, 9]),  # Exceptional
+        gen_roll([6, 2]),  # Marginal
+        gen_roll([8, 8, 8, 8, 8], line=GameLine.COFD),  # Exceptional
+        gen_roll([8, 8, 8, 8], line=GameLine.COFD),  # Success
+        gen_roll([1, 2, 3], guild=1),  # Other guild
+    ]
+
+
+def assert_counts(stats: RollStats, rolls: int, successes: int, botches: int, exceptional: int):
+    assert stats.rolls == rolls
+    assert stats.successes == successes
+    assert stats.botches == botches
+    assert stats.exceptional == exceptional
+
+
+async def test_record(rolls: list[Roll]):
+    await RollStats.record(rolls[:3])
+    await RollStats.record(rolls[3:])
+
+    stats = await RollStats.find_one(RollStats.guild == 0, RollStats.user == 0)
+    assert stats is not None
+    assert not stats.backfilled
+    assert_counts(stats, 6, 14, 2, 2)
+
+
+async def test_rebuild_matches_record(rolls: list[Roll]):
+    await Roll.insert_many(rolls)
+    stats = await RollStats.rebuild(0, 0)
+    assert stats.backfilled
+    assert_counts(stats, 6, 14, 2, 2)
+
+    other = await RollStats.rebuild(1, 0)
+    assert_counts(other, 1, 0, 1, 0)
+
+
+async def test_fetch_backfills_once(rolls: list[Roll]):
+    await Roll.insert_many(rolls[:2])
+    sink = RollSink(batch_size=10, interval=60)
+    for roll in rolls[2:4]:
+        await sink.put(roll)
+    await sink.close()
+
+    # Counters created by the sink only know about the sink's rolls
+    partial = await RollStats.find_one(RollStats.guild == 0, RollStats.user == 0)
+    assert partial is not None
+    assert_counts(partial, 2, 5, 0, 1)
+
+    stats = await RollStats.fetch(0, 0)
+    assert_counts(stats, 4, 5, 2, 1)
+
+    # Now backfilled, so new rolls are simply added
+    await RollStats.record([gen_roll([1, 2, 3])])
+    stats = await RollStats.fetch(0, 0)
+    assert stats.backfilled
+    assert_counts(stats, 5, 5, 3, 1)
+
+
+async def test_record_skips_backfilled_rolls(rolls: list[Roll]):
+    for roll in rolls:
+        roll.id = PydanticObjectId()
+    await Roll.insert_many(rolls)
+    await RollStats.rebuild(0, 0)
+
+    # Rolls the rebuild counted are skipped; later ones are added
+    late = gen_roll([6, 6])
+    late.id = PydanticObjectId()
+    await RollStats.record(rolls[:2] + [late])
+    stats = await RollStats.fetch(0, 0)
+    assert_counts(stats, 7, 16, 2, 2)
+
+
+async def test_rebuild_retries_after_concurrent_record(rolls: list[Roll]):
+    await RollStats.record(rolls[:1])
+    aggregate = RollStats._aggregate
+    calls = 0
+
+    async def racing(guild: int, user: int):
+        nonlocal calls
+        calls += 1
+        results = await aggregate(guild, user)
+        if calls == 1:
+            # A roll lands and is recorded while the aggregation runs
+            await Roll.insert_many(rolls[1:2])
+            await RollStats.record(rolls[1:2])
+        return results
+
+    await Roll.insert_many(rolls[:1])
+    with patch.object(RollStats, "_aggregate", side_effect=racing):
+        stats = await RollStats.fetch(0, 0)
+
+    assert calls == 2
+    assert_counts(stats, 2, 0, 2, 0)
+    stored = await RollStats.fetch(0, 0)
+    assert_counts(stored, 2, 0, 2, 0)
+
+
+async def test_rebuild_recounts_legacy_cofd():
+    roll = gen_roll([8, 9, 10, 1], line=GameLine.COFD)
+    await Roll.insert_many([roll])
+    await Roll.get_motor_collection().update_many({}, {"$set": {"num_successes": 0}})
+
+    stats = await RollStats.rebuild(0, 0)
+    assert_counts(stats, 1, 3, 0, 0)
+
+
+async def test_sink_failure_invalidates(rolls: list[Roll]):
+    await Roll.insert_many(rolls[:2])
+    await RollStats.rebuild(0, 0)
+
+    sink = RollSink(batch_size=10, interval=60)
+    with patch.object(RollStats, "record", side_effect=RuntimeError("down")):
+        await sink.put(rolls[2])
+        await sink.close()
+
+    stats = await RollStats.find_one(RollStats.guild == 0, RollStats.user == 0)
+    assert stats is not None
+    assert not stats.backfilled
+    assert_counts(await RollStats.fetch(0, 0), 3, 4, 2, 1)
+
+
+async def test_fetch_no_rolls():
+    stats = await RollStats.fetch(0, 0)
+    assert_counts(stats, 0, 0, 0, 0)
+
+
+async def test_ignored_rolls(rolls: list[Roll]):
+    for roll in rolls:
+        roll.use_in_stats = False
+    await RollStats.record(rolls)
+    assert await RollStats.count() == 0
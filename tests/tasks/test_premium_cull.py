@@ -67,8 +67,7 @@ def clear_cache():
     yield
 
     # tasks.premium uses the user cache singleton. Some tests modify the users
-    # in the cache, so we need to reset the cache after each test. We can
-    # easily do this by tricking it into thinking it hasn't yet populated.
+    # in the cache, so we need to reset the cache after each test.
     premium.user_store.clear()
 
 
@@ -123,11 +122,7 @@ def test_drop_premium(user: User):
 
 async def test_fetch_purgeable_characters():
     users = await premium.fetch_purgeable_users()
-    chars = []
-    for user in users:
-        purgeable = await premium.fetch_purgeable_characters(user)
-        assert all(c.user == user.user for c in purgeable)
-        chars.extend(purgeable)
+    chars = await premium.fetch_purgeable_characters(users)
 
     assert len(chars) == 4
     assert all(len(c.profile.images) > 0 for c in chars)
@@ -137,6 +132,19 @@ async def test_fetch_purgeable_characters():
     assert {c.name for c in chars} == {"A", "E", "F", "H"}
 
 
+async def test_fetch_purgeable_uses_cached(mock_characters: list[Character]):
+    users = await premium.fetch_purgeable_users()
+    chars = await premium.fetch_purgeable_characters(users)
+
+    cached = {id(c) for c in mock_characters}
+    assert all(id(c) in cached for c in chars)
+
+    # A cached character whose images were removed since is skipped
+    mock_characters[0].profile.images.clear()
+    chars = await premium.fetch_purgeable_characters(users)
+    assert {c.name for c in chars} == {"E", "F", "H"}
+
+
 async def test_fetch_purge_images(mock_api: AsyncMock, mock_save: AsyncMock):
     users = await premium.fetch_purgeable_users()
     for user in users:
@@ -152,6 +160,9 @@ async def test_fetch_purge_images(mock_api: AsyncMock, mock_save: AsyncMock):
     assert mock_api.await_count == 4
     assert mock_save.await_count == 4
 
+    # The purge is persisted, so the next run doesn't pick them up again
+    assert not await premium.fetch_purgeable_users()
+
 
 async def test_purge_expired():
     purge_info = await premium.purge_expired_images()
@@ -240,3 +251,36 @@ async def test_on_member_update_gain_premium(
 def test_shared_singleton_user_store():
     bot = BotchBot()
     assert bot.user_store == premium.user_store
+
+
+@patch("botch.tasks.premium.RETRY_DELAY", 0)
+async def test_purge_retries(mock_api: AsyncMock):
+    mock_api.side_effect = [ConnectionError, None, None, None, None]
+    purge_info = await premium.purge_expired_images()
+
+    assert purge_info == "Purged 7 image(s) across 2 user(s)."
+    assert mock_api.await_count == 5
+    assert not await premium.fetch_purgeable_users()
+    mock_api.side_effect = None  # The fixture teardown also hits the API
+
+
+@patch("botch.tasks.premium.RETRY_DELAY", 0)
+async def test_purge_gives_up(mock_api: AsyncMock):
+    async def fail_user_4(char: Character):
+        if char.user == 4:
+            raise ConnectionError
+
+    mock_api.side_effect = fail_user_4
+    users = await premium.fetch_purgeable_users()
+    chars = await premium.fetch_purgeable_characters(users)
+    progress, failed = await premium.purge_characters(chars, attempts=2)
+
+    assert {c.name for c in failed} == {"E", "F"}
+    assert progress.done == 4
+    assert progress.failed == 2
+    assert progress.retries == 2
+    assert progress.images == 5
+
+    await premium.purge_expired_images()
+    assert [u.user for u in await premium.fetch_purgeable_users()] == [4]
+    mock_api.side_effect = None  # The fixture teardown also hits the API
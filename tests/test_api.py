@@ -4,6 +4,8 @@ import os
 from unittest.mock import AsyncMock, Mock, mock_open, patch
 
 import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
 
 from botch import api
 from botch.config import FC_BUCKET
@@ -75,3 +77,48 @@ async def test_upload_logs():
         assert result is True
         assert mock_post.call_count == 2
         mock_unlink.assert_called_once_with("./logs/log1.txt")
+
+
+@pytest.fixture
+async def stub_api():
+    """A local stand-in for the Botch API that records each request's client
+    port, so we can tell whether connections are being reused."""
+    ports = []
+
+    async def handler(request: web.Request) -> web.Response:
+        ports.append(request.transport.get_extra_info("peername")[1])
+        assert request.headers["Authorization"] == "test_token"
+        return web.json_response(f"{request.method} {request.path}")
+
+    app = web.Application()
+    app.router.add_route("*", "/{tail:.*}", handler)
+
+    server = TestServer(app)
+    await server.start_server()
+    await api.close_session()
+    with patch("botch.api.BASE_API", str(server.make_url("/"))):
+        yield ports
+    await api.close_session()
+    await server.close()
+
+
+async def test_session_reused(stub_api: list[int], character: Mock):
+    first = await api._delete(path="/faceclaim/delete/bucket/key")
+    second = await api.upload_faceclaim(character, "https://example.com/image.png")
+
+    assert first == "DELETE /faceclaim/delete/bucket/key"
+    assert second == "POST /faceclaim/upload"
+    assert len(stub_api) == 2
+    assert stub_api[0] == stub_api[1], "Second request should reuse the connection"
+
+
+async def test_session_lifecycle(stub_api: list[int]):
+    session = await api.open_session()
+    assert await api.open_session() is session
+
+    await api.close_session()
+    assert session.closed
+
+    # Requests after closing lazily open a new session
+    await api._delete(path="/anything")
+    assert await api.open_session() is not session
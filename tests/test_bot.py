@@ -45,6 +45,21 @@ async def test_on_ready(mock_id, bot):
     assert config.BOT_ID == 3
 
 
+async def test_close_survives_failures(bot: BotchBot):
+    with (
+        patch("botch.bot.writer.close", side_effect=RuntimeError("db down")),
+        patch("botch.bot.roll_sink.close", new_callable=AsyncMock) as roll_close,
+        patch("botch.bot.command_sink.close", side_effect=RuntimeError("db down")),
+        patch("botch.bot.api.close_session", new_callable=AsyncMock) as api_close,
+        patch("discord.Bot.close", new_callable=AsyncMock) as super_close,
+    ):
+        await bot.close()
+
+    roll_close.assert_awaited_once()
+    api_close.assert_awaited_once()
+    super_close.assert_awaited_once()
+
+
 @pytest.mark.parametrize(
     "emoji_name, count, expected",
     [
@@ -124,3 +139,36 @@ def test_cmd_mention(mock_get_cmd: Mock, bot: BotchBot, cmd: str, exists: bool):
         assert mention is not None
     else:
         assert mention is None
+
+
+async def test_emoji_table(bot: BotchBot):
+    def gen_emoji(name: str, rendered: str) -> MagicMock:
+        emoji = MagicMock()
+        emoji.name = name
+        emoji.__str__.return_value = rendered  # type:ignore
+        return emoji
+
+    emoji_guild = MagicMock(id=config.EMOJI_GUILD)
+    emoji_guild.emojis = [gen_emoji("smile", "😊"), gen_emoji("smile", "🙃")]
+
+    with patch.object(bot, "get_guild", return_value=emoji_guild) as get_guild:
+        assert bot.find_emoji("smile") == "😊\u200b", "First match wins"
+        assert bot.find_emoji("smile", 2) == ["😊\u200b"] * 2
+        get_guild.assert_called_once()
+
+        # The table only changes when the emoji guild's emojis do
+        emoji_guild.emojis = [gen_emoji("frown", "☹️")]
+        await bot.on_guild_emojis_update(MagicMock(id=config.EMOJI_GUILD + 1), [], [])
+        assert bot.find_emoji("smile") == "😊\u200b"
+
+        await bot.on_guild_emojis_update(emoji_guild, [], [])
+        assert bot.find_emoji("frown") == "☹️\u200b"
+        with pytest.raises(errors.EmojiNotFound):
+            bot.find_emoji("smile")
+
+
+def test_emoji_guild_unavailable(bot: BotchBot):
+    with patch.object(bot, "get_guild", return_value=None):
+        with pytest.raises(errors.EmojiNotFound):
+            bot.find_emoji("smile")
+    assert bot._emojis is None, "Should retry once the guild is available"
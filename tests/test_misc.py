@@ -32,6 +32,18 @@ async def test_db_init():
             )
 
 
+async def test_dedupe_users():
+    database = mongomock_motor.AsyncMongoMockClient()["dedupe"]
+    users = database["users"]
+    await users.insert_many([{"user": 1}, {"user": 2}, {"user": 1}, {"user": 1}])
+    oldest = await users.find_one({"user": 1})
+
+    await db.dedupe_users(database)
+    remaining = await users.find({}).to_list(length=None)
+    assert sorted(u["user"] for u in remaining) == [1, 2]
+    assert oldest in remaining
+
+
 @pytest.mark.parametrize(
     "sample,expected",
     [
@@ -95,6 +107,35 @@ def test_debug_guilds():
     assert config.DEBUG_GUILDS == [1, 2, 3]
 
 
+@pytest.mark.parametrize(
+    "name,default",
+    [
+        ("CHAR_CACHE_MAX_WEIGHT", 100_000),
+        ("CHAR_CACHE_TTL", 1800),
+        ("CHAR_SAVE_DELAY", 2),
+        ("ROLL_BATCH_SIZE", 100),
+        ("ROLL_BATCH_INTERVAL", 5),
+        ("ROLL_MAX_PENDING", 1000),
+        ("COMMAND_LOG_BATCH_SIZE", 250),
+        ("COMMAND_LOG_INTERVAL", 15),
+        ("COMMAND_LOG_MAX_PENDING", 5000),
+        ("PURGE_CONCURRENCY", 8),
+        ("PURGE_RATE", 10),
+        ("PURGE_ATTEMPTS", 3),
+        ("USER_CACHE_SIZE", 10_000),
+        ("ODDS_TRIALS", 100_000),
+        ("CHAR_SUMMARY_CACHE_SIZE", 10_000),
+        ("BOTCH_API_URL", "https://api.botch.lol/"),
+        ("API_POOL_SIZE", 20),
+    ],
+)
+def test_blank_env_uses_default(name: str, default: int | float | str):
+    # .env.template leaves these blank, which dotenv loads as ""
+    with mock.patch.dict(os.environ, {name: ""}):
+        importlib.reload(config)
+        assert getattr(config, name) == default
+
+
 def test_command_record():
     ctx = mock.Mock()
 